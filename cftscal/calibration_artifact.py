@@ -0,0 +1,213 @@
+'''
+Calibrations resolved once by the launcher and handed to the experiment.
+
+Calibrations reach a ``psi-main`` experiment as strings in its environment
+(``Calibration.to_string()``, see e.g. ``InputSettings.get_env_vars``), from
+which the experiment used to rebuild each one by re-reading its data files.
+Instead, ``CalibrationSettings._run_cal`` now loads every calibration
+referenced by the environment up front (`compile_calibrations`) and writes
+the resulting curves to one ``.npz`` artifact (`write_calibration_artifact`)
+whose path is passed on in ``CFTS_CALIBRATION_ARTIFACT``.  The paradigms
+resolve calibration strings through `load_calibration`, which serves them
+from the artifact and only falls back to loading from disk for anything the
+artifact doesn't hold.  Once the run finishes the artifact is kept in the
+run directory as `ARTIFACT_FILENAME`, recording exactly which curves the
+run used.
+
+The artifact only holds calibrations it reproduces exactly: plain
+``FlatCalibration`` and ``InterpCalibration`` instances whose reference and
+attrs are JSON.  Anything else is left to be loaded from disk as before.
+'''
+import logging
+log = logging.getLogger(__name__)
+
+import importlib
+import json
+import os
+import zipfile
+
+import numpy as np
+from psiaudio.calibration import FlatCalibration, InterpCalibration
+
+
+#: Environment variable holding the path of the artifact for this run.
+ARTIFACT_ENV = 'CFTS_CALIBRATION_ARTIFACT'
+
+#: Name the artifact is saved under in the run directory.
+ARTIFACT_FILENAME = 'calibrations.npz'
+
+VERSION = 2
+
+#: Artifacts already read by this process, keyed by path.
+_ARTIFACTS = {}
+
+
+def _calibration_from_string(string):
+    # Same resolution as CalibrationManager.from_string, restricted to
+    # cftscal's own Calibration classes so arbitrary environment values
+    # never trigger imports.
+    from cftscal.objects import Calibration
+    qualname = string.split('::', 1)[0]
+    if not qualname.startswith('cftscal.'):
+        return None
+    module_name, class_name = qualname.rsplit('.', 1)
+    try:
+        klass = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError):
+        return None
+    if not (isinstance(klass, type) and issubclass(klass, Calibration)):
+        return None
+    return klass.from_string(string)
+
+
+def _recorded_frequency(calibration):
+    '''
+    Return the frequencies the InterpCalibration ``calibration`` was built
+    from, in their original order, or None if they can't be recovered.
+    '''
+    # ``frequency`` is rounded to 0.01 Hz, but get_sens interpolates the
+    # frequencies as given, which interp1d keeps (sorted) as ``x``.
+    interp = getattr(calibration, '_interp', None)
+    if interp is None:
+        return None
+    order = np.argsort(calibration.frequency, kind='stable')
+    if not (np.array_equal(np.round(interp.x, 2), calibration.frequency[order])
+            and np.array_equal(interp.y, calibration.sensitivity[order],
+                               equal_nan=True)):
+        return None
+    frequency = np.empty(len(order), dtype=calibration.frequency.dtype)
+    frequency[order] = interp.x
+    return frequency
+
+
+def _storable(calibration):
+    '''
+    Return True if the artifact reproduces ``calibration`` exactly.
+    '''
+    # Subclasses may carry state (or behaviour) the artifact doesn't know
+    # about, so only the plain classes are stored.
+    if type(calibration) not in (FlatCalibration, InterpCalibration):
+        return False
+    meta = [calibration.reference, calibration.attrs]
+    try:
+        if json.loads(json.dumps(meta)) != meta:
+            return False
+    except (TypeError, ValueError):
+        return False
+    if isinstance(calibration, InterpCalibration):
+        return _recorded_frequency(calibration) is not None
+    return True
+
+
+def compile_calibrations(env):
+    '''
+    Load every calibration referenced by a value in ``env``.
+
+    Returns a dict mapping each calibration string to its loaded psiaudio
+    calibration.  Strings that fail to load are left out (and logged), so
+    the experiment hits, and reports, the same error it always did.  So are
+    calibrations the artifact can't reproduce exactly, which the experiment
+    loads from disk instead.
+    '''
+    compiled = {}
+    for value in env.values():
+        if not isinstance(value, str) or value in compiled:
+            continue
+        try:
+            calibration = _calibration_from_string(value)
+            if calibration is None:
+                continue
+            loaded = calibration.load()
+        except Exception:
+            log.exception('Could not pre-load calibration %s', value)
+            continue
+        if _storable(loaded):
+            compiled[value] = loaded
+        else:
+            log.info('Calibration %s will be loaded by the experiment', value)
+    return compiled
+
+
+def write_calibration_artifact(filename, calibrations):
+    '''
+    Save ``calibrations`` (as returned by `compile_calibrations`) to the
+    ``.npz`` file ``filename``.
+
+    Raises ValueError if one of them can't be reproduced exactly.
+    '''
+    index = {}
+    arrays = {}
+    for i, (string, cal) in enumerate(calibrations.items()):
+        if not _storable(cal):
+            raise ValueError(f'Cannot store calibration {string} exactly')
+        key = f'c{i}'
+        entry = {
+            'key': key,
+            'fixed_gain': float(cal.fixed_gain),
+            'reference': cal.reference,
+            'attrs': cal.attrs,
+        }
+        if isinstance(cal, InterpCalibration):
+            entry['type'] = 'interp'
+            arrays[f'{key}_frequency'] = _recorded_frequency(cal)
+            arrays[f'{key}_sensitivity'] = cal.sensitivity
+            if cal.phase is not None:
+                arrays[f'{key}_phase'] = cal.phase
+        else:
+            entry['type'] = 'flat'
+            entry['sensitivity'] = float(cal.sensitivity)
+        index[string] = entry
+    header = {'version': VERSION, 'calibrations': index}
+    with open(filename, 'wb') as fh:
+        np.savez(fh, header=np.array(json.dumps(header)), **arrays)
+
+
+def read_calibration_artifact(filename):
+    '''
+    Return the calibrations saved in the artifact ``filename`` as a dict
+    mapping calibration strings to psiaudio calibrations.
+    '''
+    with np.load(filename, allow_pickle=False) as data:
+        header = json.loads(str(data['header']))
+        if header.get('version') != VERSION:
+            raise ValueError(f'Unsupported calibration artifact {filename}')
+        calibrations = {}
+        for string, entry in header['calibrations'].items():
+            key = entry['key']
+            kwargs = {
+                'fixed_gain': entry['fixed_gain'],
+                'reference': entry['reference'],
+                'attrs': entry['attrs'],
+            }
+            if entry['type'] == 'interp':
+                phase_key = f'{key}_phase'
+                calibrations[string] = InterpCalibration(
+                    data[f'{key}_frequency'], data[f'{key}_sensitivity'],
+                    phase=data[phase_key] if phase_key in data else None,
+                    **kwargs,
+                )
+            else:
+                calibrations[string] = FlatCalibration(
+                    entry['sensitivity'], **kwargs,
+                )
+    return calibrations
+
+
+def load_calibration(manager, string):
+    '''
+    Return the loaded calibration for the calibration string ``string``.
+
+    Served from this run's artifact (see `ARTIFACT_ENV`) when it has the
+    calibration, otherwise loaded via ``manager.from_string(string)``.
+    '''
+    path = os.environ.get(ARTIFACT_ENV)
+    if path:
+        if path not in _ARTIFACTS:
+            try:
+                _ARTIFACTS[path] = read_calibration_artifact(path)
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                log.exception('Could not read calibration artifact %s', path)
+                _ARTIFACTS[path] = {}
+        if string in _ARTIFACTS[path]:
+            return _ARTIFACTS[path][string]
+    return manager.from_string(string).load()
@@ -0,0 +1,72 @@
+'''
+Summary values shown in the calibration tree, precomputed from a
+calibration's data files.
+
+Columns such as a speaker's maximum frequency or a microphone's sensitivity
+come from the calibration's data files (``golay_sens.csv``,
+``microphone_sensitivity.json``, ``amplifier_gain.json``), so rendering a
+tree of calibrations would otherwise read every one of those files.
+`compute_summary` extracts them once so they can be stored in the
+``summary`` block of ``metadata.json`` -- at record time by
+``CalibrationSettings._run_cal`` and for existing calibrations by
+:mod:`cftscal.migrate_metadata` -- where the calibration classes in
+:mod:`cftscal.objects` look for them first.
+
+Like :mod:`cftscal.object_manifest`, kept free of the calibration stack so
+the migration scripts can use it.
+'''
+import json
+from pathlib import Path
+
+import pandas as pd
+
+
+GOLAY_INDEX = ['n_bits', 'output_gain', 'frequency']
+
+
+def _golay_summary(cal_dir):
+    sens_file = cal_dir / 'golay_sens.csv'
+    if not sens_file.exists():
+        return {}
+    index = pd.read_csv(sens_file, usecols=GOLAY_INDEX)
+    return {
+        'n_bits': int(index['n_bits'].max()),
+        'output_gain': float(index['output_gain'].max()),
+        'max_frequency': float(index['frequency'].max()),
+    }
+
+
+def _microphone_summary(cal_dir):
+    sens_file = cal_dir / 'microphone_sensitivity.json'
+    if not sens_file.exists():
+        return {}
+    cal = json.loads(sens_file.read_text())
+    return {'sens': float(cal['mic sens overall (mV/Pa)'])}
+
+
+def _amplifier_summary(cal_dir):
+    gain_file = cal_dir / 'amplifier_gain.json'
+    if not gain_file.exists():
+        return {}
+    gain = json.loads(gain_file.read_text())
+    return {'measured_gain': float(gain['gain mean (linear)'])}
+
+
+SUMMARIZERS = [_golay_summary, _microphone_summary, _amplifier_summary]
+
+
+def compute_summary(cal_dir):
+    '''
+    Return the summary values that can be derived from the data files in
+    ``cal_dir``, as a JSON-serializable dict.  Values whose data file is
+    missing or unreadable are left out, so this never raises on account
+    of the calibration's contents.
+    '''
+    cal_dir = Path(cal_dir)
+    summary = {}
+    for summarize in SUMMARIZERS:
+        try:
+            summary.update(summarize(cal_dir))
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    return summary
@@ -25,6 +25,11 @@ calibrations are already recorded under.  This only happens *after* the
 metadata has actually been written, since the directory name is the only
 place that information exists for a not-yet-migrated calibration.
 
+Finally, the per-object ``_calibrations.json`` manifest (see
+:mod:`cftscal.object_manifest`) of every object directory the script visited
+is rebuilt, so loaders see the migrated metadata and calibration trees
+recorded before manifests existed get one.
+
 Run with::
 
     python -m cftscal.migrate_metadata
@@ -38,6 +43,11 @@ import json
 from pathlib import Path
 import re
 
+from cftscal.calibration_summary import compute_summary
+from cftscal.object_manifest import (
+    rebuild_object_manifest, update_object_manifest,
+)
+
 import yaml
 
 
@@ -508,6 +518,22 @@ def _enrich_device_from_folder(field):
     return enrich
 
 
+def _enrich_summary(cal_dir, metadata, overwrite=False):
+    '''
+    Backfill the ``summary`` block (values the tree shows, precomputed from
+    the calibration's data files -- see :mod:`cftscal.calibration_summary`)
+    that new recordings get at record time.  Recomputed under
+    ``overwrite`` (e.g. after a data file was regenerated); otherwise only
+    filled in where missing.
+    '''
+    if 'summary' in metadata and not overwrite:
+        return {}
+    summary = compute_summary(cal_dir)
+    if not summary or summary == metadata.get('summary'):
+        return {}
+    return {'summary': summary}
+
+
 # Subfolder -> function(cal_dir, metadata) -> dict of fields to merge in.
 # Runs on every calibration folder migrate() visits (not just ones with a
 # legacy name still to parse), since io.json/final.preferences are present
@@ -518,14 +544,18 @@ ENRICHERS = {
         _enrich_inear_from_preferences,
         _enrich_channels_from_io(output_field='starship_channel'),
     ),
-    'microphone': _enrich_channels_from_io(
-        input_field='input_channel', input_prefer_keys=_REFERENCE_MIC_KEYS,
-        gain_field='gain'),
+    'microphone': _compose(
+        _enrich_channels_from_io(
+            input_field='input_channel', input_prefer_keys=_REFERENCE_MIC_KEYS,
+            gain_field='gain'),
+        _enrich_summary,
+    ),
     'speaker': _compose(
         _enrich_channels_from_io(
             input_field='microphone_channel', input_prefer_keys=_REFERENCE_MIC_KEYS,
             output_field='output_channel', gain_field='gain'),
         _enrich_device_from_folder('speaker'),
+        _enrich_summary,
     ),
     'starship': _compose(
         _enrich_channels_from_io(
@@ -538,9 +568,13 @@ ENRICHERS = {
         _enrich_channels_from_io(input_field='input_channel'),
         _fix_input_amplifier_total_gain,
         _enrich_device_from_folder('sensor_id'),
+        _enrich_summary,
     ),
     'input-recording': _enrich_input_recording_from_io,
-    'microphone_generic': _enrich_device_from_folder('sensor_id'),
+    'microphone_generic': _compose(
+        _enrich_device_from_folder('sensor_id'),
+        _enrich_summary,
+    ),
 }
 
 
@@ -622,11 +656,13 @@ def migrate(root, dry_run=False, overwrite=False):
         'wrote': 0, 'enriched': 0, 'skipped_exists': 0, 'skipped_error': 0,
         'renamed': 0, 'rename_conflicts': 0,
     }
+    object_dirs = set()
     for subfolder, parser in PARSERS.items():
         base = root / subfolder
         marker_key = MARKER_KEYS[subfolder]
         enricher = ENRICHERS.get(subfolder)
         for cal_dir in _iter_calibration_folders(base):
+            object_dirs.add(cal_dir.parent)
             meta_file = cal_dir / METADATA_FILENAME
             existing = {}
             if meta_file.exists():
@@ -743,11 +779,19 @@ def migrate(root, dry_run=False, overwrite=False):
                 cal_dir.rename(new_path)
                 print(f'{moved_verb} {cal_dir} -> {new_path}')
                 counts['renamed'] += 1
+                object_dirs.add(new_path.parent)
                 # Clean up the now-vestigial old coupler/ear folder once
-                # its last calibration has moved out of it.
-                if (reparent_key is not None and old_parent.exists()
-                        and not any(old_parent.iterdir())):
-                    old_parent.rmdir()
+                # its last calibration has moved out of it (dropping the
+                # calibration from its manifest first, which removes the
+                # manifest along with the last entry).
+                if reparent_key is not None:
+                    update_object_manifest(old_parent, remove=[cal_dir.name])
+                    if old_parent.exists() and not any(old_parent.iterdir()):
+                        old_parent.rmdir()
+
+    if not dry_run:
+        for object_dir in sorted(object_dirs):
+            rebuild_object_manifest(object_dir)
     return counts
 
 
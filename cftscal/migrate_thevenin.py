@@ -34,6 +34,8 @@ import argparse
 import json
 from pathlib import Path
 
+from cftscal.object_manifest import update_object_manifest
+
 
 THEVENIN_COUPLER_PREFIX = 'TH-'
 
@@ -107,6 +109,8 @@ def move_thevenin_calibrations(root, dry_run=False):
             new_path.parent.mkdir(parents=True, exist_ok=True)
             cal_dir.rename(new_path)
             print(f'MOVED {cal_dir} -> {new_path}')
+            update_object_manifest(new_path.parent, add=[new_path.name])
+            update_object_manifest(old_parent, remove=[cal_dir.name])
             # Clean up the now-vestigial old starship folder once its
             # last Thevenin calibration has moved out of it.
             if old_parent.exists() and not any(old_parent.iterdir()):
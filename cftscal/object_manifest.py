@@ -0,0 +1,172 @@
+'''
+Per-object aggregate of calibration metadata.
+
+Every calibration directory carries its own ``metadata.json`` sidecar (see
+``CFTSFileCalibration`` in :mod:`cftscal.objects`), so listing an object
+with a few hundred calibrations means a few hundred file opens -- each one a
+round trip when the calibration tree lives on a network share.  To avoid
+that, each object directory also holds a ``_calibrations.json`` manifest
+mapping the name of every calibration directory in it to a copy of that
+calibration's metadata, so a loader can read one file per object instead.
+
+The individual sidecars remain the source of truth.  The manifest is kept in
+step by everything in cftscal that writes, moves, renames or deletes a
+calibration (``CalibrationSettings._run_cal``, the calibration tree's
+drag/drop and context-menu actions, and the migration scripts).  Each entry
+also records the mtime and size of the sidecar it was copied from, and
+readers fall back to the individual sidecar for any calibration the manifest
+doesn't list or whose sidecar has changed since (e.g. edited by hand or by a
+script that doesn't know about manifests).  Checking costs a ``stat`` per
+calibration, still far cheaper than opening and parsing every sidecar.  A
+missing or unreadable manifest is simply rebuilt the next time a
+calibration is added to that object.
+
+Deliberately free of heavy imports so the migration scripts can use it
+without pulling in the calibration stack.
+'''
+import json
+import os
+from pathlib import Path
+import tempfile
+
+
+#: Name of the manifest file kept directly in each object directory.
+OBJECT_MANIFEST = '_calibrations.json'
+
+METADATA_FILENAME = 'metadata.json'
+
+VERSION = 2
+
+
+def _read_entry(cal_dir):
+    '''
+    Return the manifest entry of ``cal_dir``: its metadata and the stamp of
+    the sidecar it was read from, or None if the sidecar can't be read.
+    '''
+    sidecar = cal_dir / METADATA_FILENAME
+    try:
+        # Stat first: if the sidecar changes in between, the entry is merely
+        # considered stale.
+        stat = sidecar.stat()
+        metadata = json.loads(sidecar.read_text())
+    except (OSError, ValueError):
+        return None
+    return {
+        'metadata': metadata,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+    }
+
+
+def _is_current(cal_dir, entry):
+    try:
+        stat = (cal_dir / METADATA_FILENAME).stat()
+    except OSError:
+        return False
+    return entry.get('mtime_ns') == stat.st_mtime_ns \
+        and entry.get('size') == stat.st_size
+
+
+def _load(object_dir):
+    try:
+        data = json.loads((object_dir / OBJECT_MANIFEST).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != VERSION:
+        return None
+    return data.get('calibrations', {})
+
+
+def _save(object_dir, entries):
+    '''
+    Atomically replace the manifest with ``entries``, or remove it if
+    ``entries`` is empty (so an object directory whose calibrations have all
+    been moved out is empty again and can be deleted).
+    '''
+    manifest_file = object_dir / OBJECT_MANIFEST
+    if not entries:
+        manifest_file.unlink(missing_ok=True)
+        return
+    data = {'version': VERSION, 'calibrations': entries}
+    # A temporary file of our own, as several processes may be updating the
+    # same manifest on a shared calibration root.
+    fd, tmp_file = tempfile.mkstemp(dir=object_dir, prefix=OBJECT_MANIFEST,
+                                    suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as fh:
+            fh.write(json.dumps(data, sort_keys=True))
+        os.chmod(tmp_file, 0o644)
+        os.replace(tmp_file, manifest_file)
+    except BaseException:
+        Path(tmp_file).unlink(missing_ok=True)
+        raise
+
+
+def read_object_manifest(object_dir):
+    '''
+    Return the manifest of ``object_dir`` as a dict mapping calibration
+    directory names to their metadata.  Calibrations whose ``metadata.json``
+    changed since it was copied into the manifest are left out, so callers
+    read those from the sidecar.  Returns an empty dict if there is no
+    usable manifest.
+    '''
+    object_dir = Path(object_dir)
+    return {
+        name: entry['metadata']
+        for name, entry in (_load(object_dir) or {}).items()
+        if _is_current(object_dir / name, entry)
+    }
+
+
+def rebuild_object_manifest(object_dir):
+    '''
+    Regenerate the manifest of ``object_dir`` from the ``metadata.json`` of
+    every calibration directory currently in it.
+    '''
+    object_dir = Path(object_dir)
+    if not object_dir.is_dir():
+        return
+    entries = {}
+    for cal_dir in object_dir.iterdir():
+        if cal_dir.is_dir():
+            entry = _read_entry(cal_dir)
+            if entry is not None:
+                entries[cal_dir.name] = entry
+    _save(object_dir, entries)
+
+
+def update_object_manifest(object_dir, add=(), remove=()):
+    '''
+    Bring the manifest of ``object_dir`` up to date after calibrations were
+    added to or removed from it.
+
+    Parameters
+    ----------
+    object_dir : Path
+        The object directory holding the calibrations.
+    add : iterable of str
+        Names of calibration directories in ``object_dir`` that were added
+        or whose ``metadata.json`` changed.  Their metadata is (re-)read
+        from their sidecars.  If the object has no usable manifest yet, one
+        is built from scratch instead.
+    remove : iterable of str
+        Names of calibration directories no longer in ``object_dir``.
+    '''
+    object_dir = Path(object_dir)
+    if not object_dir.is_dir():
+        return
+    add = list(add)
+    entries = _load(object_dir)
+    if entries is None:
+        if add:
+            rebuild_object_manifest(object_dir)
+        return
+    for name in remove:
+        entries.pop(name, None)
+    for name in add:
+        entry = _read_entry(object_dir / name)
+        if entry is None:
+            entries.pop(name, None)
+        else:
+            entries[name] = entry
+    _save(object_dir, entries)
@@ -6,13 +6,20 @@ multiple calibration systems (e.g., the EPL CFTS vs cftscal), each
 registered. Each `CalibrationLoader` will provide a list of calibrations for
 that object that were done with that calibration system.
 '''
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import datetime as dt
-from functools import cached_property, total_ordering
+import fnmatch
+from functools import cached_property, lru_cache, total_ordering, wraps
 import importlib
 import json
 import os
 from pathlib import Path
 import re
+import threading
+import time
+from types import MappingProxyType
+import weakref
 
 import numpy as np
 import pandas as pd
@@ -24,6 +31,9 @@ from psidata.api import Recording
 from cftsdata.api import InearCalibration, MicrophoneCalibration
 
 from . import CAL_ROOT
+from .object_manifest import read_object_manifest
+from .psd_cache import read_average_psd, recording_stamp
+from .sens_cache import read_sens_csv
 
 
 #: Marker file (see CalibratedObject.set_current_calibration) written
@@ -32,6 +42,28 @@ from . import CAL_ROOT
 #: is pinned as "current".
 _CURRENT_MARKER = 'current.json'
 
+#: Stands for "not known yet" where None is a meaningful value.
+_UNKNOWN = object()
+
+
+def read_pinned_name(obj_dir):
+    '''
+    Return the directory name of the calibration pinned as "current" in
+    the object directory ``obj_dir`` (see
+    `CalibratedObject.set_current_calibration`), or None if there is no
+    readable marker.
+    '''
+    try:
+        return json.loads((Path(obj_dir) / _CURRENT_MARKER).read_text())['current']
+    except (OSError, KeyError, TypeError, json.JSONDecodeError):
+        return None
+
+
+#: Folder directly under CAL_ROOT (alongside the per-loader subfolders, so
+#: writing to it never touches a directory mtime the index itself tracks)
+#: holding each CFTSBaseLoader's persistent CalibrationIndex.
+_INDEX_FOLDER = '.index'
+
 
 @total_ordering
 class Calibration:
@@ -75,6 +107,296 @@ class Calibration:
         return f'{self.__class__.__module__}.{self.__class__.__name__}'
 
 
+class CalibrationCache:
+    '''
+    Least-recently-used cache of the psiaudio calibration objects returned
+    by ``Calibration.load()`` (see `cached_load`), bounded by the memory
+    their arrays take up.
+
+    Entries are shared between every caller that loads the same
+    calibration, so callers must treat what ``load()`` returns as
+    read-only.
+
+    Attributes
+    ----------
+    max_bytes : int
+        Ceiling on the estimated size of all cached entries.  The least
+        recently used entries are evicted to stay under it.  Set to 0 to
+        disable caching.
+    hits, misses : int
+        Number of lookups served from, and missed by, the cache.
+    '''
+
+    def __init__(self, max_bytes=256 * 2**20):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _estimate_nbytes(value):
+        # The arrays (frequency, sensitivity, and the copies interp1d keeps)
+        # are what matter; everything else is counted as a flat overhead.
+        nbytes = 1024
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return nbytes + int(np.sum(value.memory_usage(index=True)))
+        if getattr(value, 'nbytes', None) is not None:
+            # Arrays, and anything else that knows its own size.
+            return nbytes + int(value.nbytes)
+        for attr in getattr(value, '__dict__', {}).values():
+            if isinstance(attr, np.ndarray):
+                nbytes += attr.nbytes
+            for inner in getattr(attr, '__dict__', {}).values():
+                if isinstance(inner, np.ndarray):
+                    nbytes += inner.nbytes
+        return nbytes
+
+    def get_or_load(self, key, load):
+        '''
+        Return the value cached under ``key``, calling ``load()`` to create
+        (and cache) it if there is none.
+        '''
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+        value = load()
+        nbytes = self._estimate_nbytes(value)
+        with self._lock:
+            if nbytes > self.max_bytes:
+                return value
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = value, nbytes
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+        return value
+
+    def get(self, key, default=None):
+        '''
+        Return the value cached under ``key`` without loading it.
+        '''
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def evict(self, match):
+        '''
+        Remove every entry whose key satisfies ``match(key)``.
+        '''
+        with self._lock:
+            for key in [k for k in self._entries if match(k)]:
+                self.nbytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+#: Process-wide cache behind every `cached_load`-decorated ``load()``.
+load_cache = CalibrationCache()
+
+#: Process-wide cache of in-ear average PSDs (see
+#: `CFTSInEarCalibration.get_average_psd`).
+psd_cache = CalibrationCache()
+
+
+def _mtime_ns(path):
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def cached_load(*data_files):
+    '''
+    Decorate the ``load()`` method of a `FileCalibration` so its result is
+    served from `load_cache`.
+
+    Entries are keyed by the calibration's ``to_string()`` and the mtimes
+    of ``data_files`` (names relative to the calibration's ``filename``;
+    with none given, ``filename`` itself), so rewriting the data a
+    calibration was loaded from makes the next ``load()`` read it afresh.
+    '''
+    def decorator(load):
+        @wraps(load)
+        def wrapper(self):
+            if data_files:
+                paths = [self.filename / name for name in data_files]
+            else:
+                paths = [self.filename]
+            key = (self.to_string(), tuple(_mtime_ns(p) for p in paths))
+            return load_cache.get_or_load(key, lambda: load(self))
+        return wrapper
+    return decorator
+
+
+#: Worker threads used to read ``metadata.json`` sidecars in bulk (see
+#: prefetch_metadata).  Reading a sidecar off a network share is dominated
+#: by round-trip latency, not CPU, so this is sized for overlapping I/O.
+PREFETCH_WORKERS = 16
+
+
+def prefetch_metadata(calibrations, max_workers=PREFETCH_WORKERS):
+    '''
+    Populate ``metadata`` on every `CFTSFileCalibration` in
+    ``calibrations`` that hasn't loaded it yet, reading concurrently on a
+    thread pool.
+
+    Metadata comes from each object directory's manifest (see
+    :mod:`cftscal.object_manifest`) -- one file per object -- falling back to
+    the individual ``metadata.json`` of any calibration the manifest doesn't
+    list, or lists from an older version of its sidecar.  Anything that isn't a
+    `CFTSFileCalibration` is skipped, as are sidecars that can't be read or
+    parsed -- those are left for the lazy ``metadata`` property to report when
+    (if) something actually needs them.
+    '''
+    pending = [
+        cal for cal in calibrations
+        if isinstance(cal, CFTSFileCalibration) and 'metadata' not in vars(cal)
+    ]
+    if not pending:
+        return
+
+    def _read(cal):
+        try:
+            return json.loads((cal.filename / cal.METADATA_FILENAME).read_text())
+        except (OSError, ValueError):
+            return None
+
+    by_object = {}
+    for cal in pending:
+        by_object.setdefault(cal.filename.parent, []).append(cal)
+
+    # cached_property stores its value in the instance dict, so assigning
+    # metadata directly is the same as having read it.
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+        missing = []
+        manifests = pool.map(read_object_manifest, by_object)
+        for cals, manifest in zip(by_object.values(), manifests):
+            for cal in cals:
+                metadata = manifest.get(cal.filename.name)
+                if metadata is None:
+                    missing.append(cal)
+                else:
+                    cal.metadata = metadata
+        for cal, metadata in zip(missing, pool.map(_read, missing)):
+            if metadata is not None:
+                cal.metadata = metadata
+
+
+def _interpolate_rows(x, y, frequencies, f_min, f_max):
+    '''
+    Linearly interpolate every row of ``y`` (sampled at ``x``, sorted) onto
+    ``frequencies`` in one vectorized step, the way
+    ``InterpCalibration.get_sens`` does: extrapolated out to ``f_min`` and
+    ``f_max``, NaN beyond them.
+    '''
+    result = np.full((len(y), len(frequencies)), np.nan)
+    valid = (frequencies >= f_min) & (frequencies <= f_max)
+    f = frequencies[valid]
+    if len(x) < 2:
+        # A single point only covers its own frequency.
+        result[:, valid] = y
+        return result
+    # Like interp1d, the interval ending at a repeated frequency ends on its
+    # first value and the one starting there starts on its last.  The only
+    # empty interval is a repeat of the lowest frequency (where interp1d
+    # divides by zero), which takes the first value.
+    i = np.clip(np.searchsorted(x, f), 1, len(x) - 1)
+    x0, x1 = x[i - 1], x[i]
+    width = x1 - x0
+    w = np.divide(f - x0, width, out=np.zeros_like(f), where=width > 0)
+    result[:, valid] = y[:, i - 1] * (1 - w) + y[:, i] * w
+    return result
+
+
+def _sens_curve(obj):
+    '''
+    Return ``(frequency, sensitivity)`` that ``obj.get_sens`` interpolates,
+    sorted by frequency.
+    '''
+    # InterpCalibration.frequency is rounded to 0.01 Hz and only sets the
+    # calibrated range; get_sens interpolates the frequencies as recorded,
+    # which interp1d keeps (sorted) as ``x`` and ``y``.
+    interp = getattr(obj, '_interp', None)
+    if interp is None:
+        order = np.argsort(obj.frequency, kind='stable')
+        return obj.frequency[order].astype(float), obj.sensitivity[order]
+    return np.asarray(interp.x, dtype=float), np.asarray(interp.y)
+
+
+def stack_calibrations(calibrations, frequencies, max_workers=PREFETCH_WORKERS):
+    '''
+    Load ``calibrations`` and return their sensitivity curves on a shared
+    frequency grid.
+
+    Calibrations are loaded concurrently on a thread pool (through
+    `load_cache`, so already-loaded ones cost nothing).  Curves recorded on
+    the same frequency grid -- normally all of an object's calibrations --
+    are then interpolated together in one vectorized step.
+
+    Parameters
+    ----------
+    calibrations : sequence of Calibration
+        Calibrations whose ``load()`` returns a psiaudio calibration.
+    frequencies : array_like
+        Frequencies (Hz) to evaluate every curve at.
+    max_workers : int
+        Upper bound on the number of loader threads.
+
+    Returns
+    -------
+    ndarray
+        Array of shape ``(len(calibrations), len(frequencies))`` holding
+        each calibration's sensitivity as ``get_sens`` reports it, and NaN
+        wherever ``get_sens`` would refuse the frequency as uncalibrated.
+        A curve covers the (0.01 Hz rounded) range it was recorded over; a
+        flat calibration covers every frequency.
+    '''
+    calibrations = list(calibrations)
+    frequencies = np.asarray(frequencies, dtype=float)
+    result = np.full((len(calibrations), len(frequencies)), np.nan)
+    if not calibrations:
+        return result
+    workers = min(max_workers, len(calibrations))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        loaded = list(pool.map(lambda cal: cal.load(), calibrations))
+
+    by_grid = {}
+    for row, (cal, obj) in enumerate(zip(calibrations, loaded)):
+        if isinstance(obj, FlatCalibration):
+            result[row] = obj.get_sens(frequencies)
+        elif isinstance(obj, InterpCalibration):
+            x, y = _sens_curve(obj)
+            # get_sens casts the requested frequencies to the curve's dtype.
+            key = x.tobytes(), obj.frequency.dtype.str
+            grid = by_grid.setdefault(key, (x, obj.frequency, [], []))
+            grid[2].append(row)
+            grid[3].append(y - obj.fixed_gain)
+        else:
+            raise ValueError(f'{cal!r} does not load a calibration curve')
+    for x, rounded, rows, y in by_grid.values():
+        requested = frequencies.astype(rounded.dtype).astype(float)
+        result[rows] = _interpolate_rows(x, np.stack(y), requested,
+                                         rounded.min(), rounded.max())
+    return result
+
+
 class FileCalibration(Calibration):
 
     def __init__(self, name, filename):
@@ -114,6 +436,19 @@ class CFTSFileCalibration(FileCalibration):
             )
         return json.loads(meta_file.read_text())
 
+    @cached_property
+    def summary(self):
+        '''
+        Values precomputed from the calibration's data files into the
+        ``summary`` block of its metadata (see
+        :mod:`cftscal.calibration_summary`), so properties can skip reading
+        those files.  Empty if there is no summary (or no metadata).
+        '''
+        try:
+            return self.metadata.get('summary', {})
+        except (OSError, ValueError):
+            return {}
+
     @cached_property
     def datetime(self):
         return dt.datetime.fromisoformat(self.metadata['datetime'])
@@ -142,11 +477,17 @@ class CalibratedObject:
         calibrations across every folder that has a directory of this name;
         this is the mode used by ``CalibrationManager.get_object`` so
         experiment-side lookups by name remain backwards compatible.
+    pinned_name : {str, None}, optional
+        Directory name of the pinned calibration (None if nothing is
+        pinned), when the caller already knows it from a walk of the tree
+        (see `CalibrationManager.list_objects_and_calibrations`).  If
+        omitted, the marker file is read whenever it's needed.
     '''
-    def __init__(self, name, loaders, folder=None):
+    def __init__(self, name, loaders, folder=None, pinned_name=_UNKNOWN):
         self.name = name
         self.loaders = loaders
         self.folder = folder
+        self._pinned_name = pinned_name
 
     @property
     def path(self):
@@ -167,6 +508,18 @@ class CalibratedObject:
             )
         return calibrations
 
+    def load_all(self, frequencies):
+        '''
+        Return ``(calibrations, sens)``: every calibration of this object,
+        oldest first, and their curves on ``frequencies`` as a
+        calibration x frequency array (see `stack_calibrations`).
+        '''
+        calibrations = self.list_calibrations()
+        # Sorting reads every calibration's datetime.
+        prefetch_metadata(calibrations)
+        calibrations = sorted(calibrations)
+        return calibrations, stack_calibrations(calibrations, frequencies)
+
     def _object_dir(self):
         '''
         The on-disk directory for this object, or None if there isn't one
@@ -187,7 +540,7 @@ class CalibratedObject:
                         else loader.base_path / self.name)
         return None
 
-    def get_pinned_calibration(self):
+    def get_pinned_calibration(self, calibrations=None):
         '''
         Return the calibration explicitly pinned as "current" via
         `set_current_calibration()`, or None if nothing is pinned (or the
@@ -196,18 +549,24 @@ class CalibratedObject:
         Distinct from `get_current_calibration()`'s hard failure when
         nothing is pinned, so callers (the tree view) can tell "nothing
         pinned" from "this is it" without a try/except.
+
+        Parameters
+        ----------
+        calibrations : list of Calibration, optional
+            This object's calibrations, if the caller already has them
+            (e.g. the tree's `ObjectGroup`), so they aren't listed again.
         '''
         obj_dir = self._object_dir()
         if obj_dir is None:
             return None
-        marker = obj_dir / _CURRENT_MARKER
-        if not marker.exists():
-            return None
-        try:
-            pinned_name = json.loads(marker.read_text())['current']
-        except (OSError, KeyError, json.JSONDecodeError):
+        pinned_name = self._pinned_name
+        if pinned_name is _UNKNOWN:
+            pinned_name = read_pinned_name(obj_dir)
+        if pinned_name is None:
             return None
-        for cal in self.list_calibrations():
+        if calibrations is None:
+            calibrations = self.list_calibrations()
+        for cal in calibrations:
             if cal.filename.name == pinned_name:
                 return cal
         return None
@@ -221,13 +580,20 @@ class CalibratedObject:
                 f'on-disk location for it.'
             )
         marker = obj_dir / _CURRENT_MARKER
-        marker.write_text(json.dumps({'current': calibration.filename.name}))
+        # Write through a rename so the object directory's mtime changes
+        # even when a marker is already there, which is what tells the
+        # loaders' CalibrationIndex to read it again.
+        tmp_file = marker.with_name(f'.tmp-{marker.name}')
+        tmp_file.write_text(json.dumps({'current': calibration.filename.name}))
+        os.replace(tmp_file, marker)
+        self._pinned_name = calibration.filename.name
 
     def clear_current_calibration(self):
         '''Un-pin whatever calibration is currently pinned, if any.'''
         obj_dir = self._object_dir()
         if obj_dir is not None:
             (obj_dir / _CURRENT_MARKER).unlink(missing_ok=True)
+            self._pinned_name = None
 
     def get_current_calibration(self):
         '''
@@ -299,11 +665,18 @@ class CalibrationLoader:
         '''
         raise NotImplementedError
 
-    def list_all_calibrations(self):
+    def list_all_calibrations(self, prefetch=False, snapshot=None):
         '''
         Yield ``(folder, name, calibration)`` for every calibration known to
         this loader.
 
+        ``snapshot``, if provided, is a `snapshot` the caller already took;
+        loaders that support snapshots list its calibrations instead of taking
+        a new one.  If ``prefetch`` is True, every calibration's metadata is
+        read in bulk (see `prefetch_metadata`) before the first one is yielded,
+        so callers can read metadata-backed properties without doing any
+        further file I/O.
+
         The default implementation is ``list_objects()`` plus one
         ``list_calibrations()`` call per object -- correct for any loader,
         but wasteful for one that re-scans disk on every call (as
@@ -313,15 +686,60 @@ class CalibrationLoader:
         looping ``list_objects()``/``list_calibrations()`` themselves --
         ``CFTSBaseLoader`` overrides it to do a single disk walk.
         '''
-        for folder, name in self.list_objects():
-            for cal in self.list_calibrations(name, folder=folder):
-                yield folder, name, cal
+        result = [
+            (folder, name, cal)
+            for folder, name in self.list_objects()
+            for cal in self.list_calibrations(name, folder=folder)
+        ]
+        if prefetch:
+            prefetch_metadata(cal for _, _, cal in result)
+        yield from result
+
+    def snapshot(self):
+        '''
+        Return an object whose identity stays the same for as long as this
+        loader's objects and calibrations do (see `LoaderSnapshot`), so
+        callers can cache what they derive from it.  None (the default)
+        means the loader can't tell, and callers must re-query it.
+        '''
+        return None
+
+    def invalidate(self, path=None):
+        '''
+        Discard any cached view of the calibrations stored at ``path`` (or
+        of everything, if None).  The default implementation caches nothing.
+        '''
+        pass
 
     @property
     def label(self):
         return self.__class__.__name__
 
 
+#: Process-wide loader instances, keyed by loader class (see get_loader).
+_LOADER_REGISTRY = {}
+
+
+def get_loader(loader_class):
+    '''
+    Return the process-wide instance of ``loader_class``, creating it on
+    first use.
+
+    Each loader class stands for one ``subfolder``/``cal_class`` pair, so
+    every manager that registers it shares one loader -- and with it one
+    cached snapshot of that subfolder's tree.  E.g. the four managers that
+    list measurement microphones (``measurement_microphone_manager``,
+    ``microphone_manager``, ``input_manager`` and the input recording
+    plugin's pickers going through them) walk ``microphone/`` once between
+    them rather than once each.
+    '''
+    try:
+        return _LOADER_REGISTRY[loader_class]
+    except KeyError:
+        loader = _LOADER_REGISTRY[loader_class] = loader_class()
+        return loader
+
+
 class CalibrationManager:
 
     P_NAME = re.compile(r'^(.*)\((.*)\)$')
@@ -329,10 +747,13 @@ class CalibrationManager:
     def __init__(self, object_class):
         self.loaders = []
         self.object_class = object_class
+        # See _get_object_map.
+        self._object_map = None
+        self._object_map_key = None
 
     def register(self, name):
         module, klass = name.rsplit('.', 1)
-        loader = getattr(importlib.import_module(module), klass)()
+        loader = get_loader(getattr(importlib.import_module(module), klass))
         self.loaders.append(loader)
 
     @staticmethod
@@ -366,19 +787,45 @@ class CalibrationManager:
             than running with no calibration.
         '''
         folder, name = self._parse_path(path)
-        loaders = []
-        for loader in self.loaders:
-            for f, n in loader.list_objects():
-                if f == folder and n == name:
-                    loaders.append(loader)
-                    break
+        loaders = self._get_object_map().get((folder, name))
         if not loaders:
             raise LookupError(
                 f'No calibrated object at path {path!r}. It may have been '
                 f'moved or deleted — check the calibration selected for '
                 f'this input/output in your plugin settings.'
             )
-        return self.object_class(name, loaders, folder=folder)
+        return self.object_class(name, list(loaders), folder=folder)
+
+    def _get_object_map(self):
+        '''
+        Return a dict mapping ``(folder, name)`` to the loaders that know
+        about that object, in registration order.
+
+        The map is built from the loaders' snapshots and kept until one of
+        them hands out a new snapshot (or the list of loaders changes), so
+        resolving an object is a dict lookup rather than a scan of every
+        loader's tree.  Loaders that don't provide snapshots are re-queried
+        on every call.
+        '''
+        snapshots = tuple(loader.snapshot() for loader in self.loaders)
+        # Neither loaders nor snapshots define __eq__, so this compares
+        # identities.
+        key = (tuple(self.loaders), snapshots)
+        if self._object_map is not None and None not in snapshots \
+                and key == self._object_map_key:
+            return self._object_map
+
+        keyed = {}
+        for loader, snapshot in zip(self.loaders, snapshots):
+            if snapshot is not None:
+                objects = sorted(snapshot.objects)
+            else:
+                objects = loader.list_objects()
+            for folder, name in objects:
+                keyed.setdefault((folder, name), []).append(loader)
+        self._object_map = keyed
+        self._object_map_key = key
+        return keyed
 
     def list_objects(self):
         # One CalibratedObject per (folder, name) so groups in different
@@ -386,20 +833,26 @@ class CalibrationManager:
         # If several loaders report the same (folder, name) — e.g. an EPL
         # loader and a CFTS loader both know about a starship — they share
         # a single CalibratedObject whose list_calibrations aggregates both.
-        keyed = {}
-        for loader in self.loaders:
-            for folder, name in loader.list_objects():
-                keyed.setdefault((folder, name), []).append(loader)
         return [
-            self.object_class(name, loaders, folder=folder)
-            for (folder, name), loaders in keyed.items()
+            self.object_class(name, list(loaders), folder=folder)
+            for (folder, name), loaders in self._get_object_map().items()
         ]
 
-    def list_objects_and_calibrations(self):
+    def snapshots(self):
+        '''
+        Return the current snapshot of each registered loader (None for
+        loaders that don't provide them), in registration order.
+        '''
+        return [loader.snapshot() for loader in self.loaders]
+
+    def list_objects_and_calibrations(self, prefetch=False, snapshots=None):
         '''
         Like ``list_objects()``, but paired with each object's own
         calibrations, computed via one ``list_all_calibrations()`` walk per
-        loader.
+        loader.  ``prefetch`` is passed on to ``list_all_calibrations()``.
+        ``snapshots``, as returned by `snapshots`, lets callers that need
+        other parts of the same snapshots (e.g. the tree's folders) take
+        them just once.
 
         ``list_objects()`` followed by a per-object
         ``CalibratedObject.list_calibrations()`` loop (the ``ObjectGroup``
@@ -410,22 +863,63 @@ class CalibrationManager:
         need every object's calibrations at once (e.g. populating the
         calibration tree).
 
+        Returns
+        -------
+        list of (CalibratedObject, list of Calibration)
+        '''
+        if snapshots is None:
+            snapshots = self.snapshots()
+        return self.group_calibrations(
+            (loader, snapshot,
+             loader.list_all_calibrations(prefetch=prefetch, snapshot=snapshot))
+            for loader, snapshot in zip(self.loaders, snapshots)
+        )
+
+    def list_loader_calibrations(self, loader, prefetch=False):
+        '''
+        Return ``(snapshot, calibrations)`` for ``loader`` alone: its
+        current snapshot (or None) and the ``(folder, name, calibration)``
+        listed from it.  For callers that walk each loader in a worker
+        thread of its own and combine the results with `group_calibrations`
+        (see ``ObjectCollection.load``).
+        '''
+        snapshot = loader.snapshot()
+        calibrations = loader.list_all_calibrations(prefetch=prefetch,
+                                                    snapshot=snapshot)
+        return snapshot, list(calibrations)
+
+    def group_calibrations(self, listings):
+        '''
+        Pair every object with its calibrations, given ``(loader, snapshot,
+        calibrations)`` for some or all of the registered loaders, in
+        registration order (see `list_loader_calibrations`).
+
         Returns
         -------
         list of (CalibratedObject, list of Calibration)
         '''
         keyed = {}
         cals = {}
-        for loader in self.loaders:
+        pins = {}
+        for loader, snapshot, calibrations in listings:
             seen = set()
-            for folder, name, cal in loader.list_all_calibrations():
+            for folder, name, cal in calibrations:
                 key = (folder, name)
                 cals.setdefault(key, []).append(cal)
                 if key not in seen:
                     seen.add(key)
                     keyed.setdefault(key, []).append(loader)
+            # The pin recorded by the same walk, so the tree doesn't read
+            # every object's marker (and list its calibrations again) to
+            # find it.  Like CalibratedObject._object_dir, the first loader
+            # that knows about pins has the say.
+            if snapshot is not None and snapshot.pins is not None:
+                for key in seen:
+                    pins.setdefault(key, snapshot.pins.get(key))
         return [
-            (self.object_class(name, loaders, folder=folder), cals[folder, name])
+            (self.object_class(name, loaders, folder=folder,
+                               pinned_name=pins.get((folder, name), _UNKNOWN)),
+             cals[folder, name])
             for (folder, name), loaders in keyed.items()
         ]
 
@@ -462,19 +956,478 @@ class CalibrationManager:
         klass = getattr(module, class_name)
         return klass.from_string(string)
 
+    def load_many(self, calibrations, frequencies):
+        '''
+        Return the curves of ``calibrations`` on ``frequencies`` as a
+        calibration x frequency array (see `stack_calibrations`).
+        '''
+        return stack_calibrations(calibrations, frequencies)
+
+    def invalidate(self, path=None):
+        '''
+        Discard the registered loaders' cached view of the calibrations
+        stored at ``path`` (see `CFTSBaseLoader.invalidate`).
+        '''
+        for loader in self.loaders:
+            loader.invalidate(path)
+        self._object_map = None
+
     def get_property(self, prop_name):
         values = set()
         for loader in self.loaders:
-            for folder, name, cal in loader.list_all_calibrations():
+            # Properties are almost always metadata-backed.
+            for folder, name, cal in loader.list_all_calibrations(prefetch=True):
                 values.add(getattr(cal, prop_name))
         return values
 
 
+def _scan_dir(path):
+    '''
+    Return ``(dirs, cals)``: the sorted names of the non-calibration and
+    calibration subdirectories of ``path``.
+
+    Uses ``os.scandir`` so the directory/file distinction comes from the
+    ``DirEntry`` type info the listing already returned; the only extra
+    filesystem call per subdirectory is the check for its
+    ``metadata.json``.
+    '''
+    dirs, cals = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            if os.path.isfile(os.path.join(entry.path, 'metadata.json')):
+                cals.append(entry.name)
+            else:
+                dirs.append(entry.name)
+    return sorted(dirs), sorted(cals)
+
+
+def walk_calibration_tree(base_path, list_dir=None):
+    '''
+    Walk a calibration storage tree top-down, never descending into
+    calibration directories.
+
+    Calibration directories (those holding a ``metadata.json``) are leaves:
+    their data payload (zarr/bcolz chunk trees, CSVs, epoch arrays) can't
+    hold anything the tree structure cares about, so the cost of a walk
+    scales with the number of calibrations rather than with the number of
+    files they contain.
+
+    Parameters
+    ----------
+    base_path : Path
+        Root of the tree.
+    list_dir : callable, optional
+        Called with a directory's posix-style path relative to
+        ``base_path`` (``''`` for the root); returns its ``(dirs, cals)``
+        listing or raises OSError if it can't be listed.  Defaults to
+        listing the directory with ``os.scandir``.
+
+    Yields
+    ------
+    rel : str
+        Posix-style path of the directory relative to ``base_path``.
+    dirs : list of str
+        Names of its non-calibration subdirectories.  As with ``os.walk``,
+        removing names from this list in place prunes the walk.
+    cals : list of str
+        Names of its calibration subdirectories.
+    '''
+    base_path = Path(base_path)
+    if list_dir is None:
+        list_dir = lambda rel: _scan_dir(base_path / rel if rel else base_path)
+    pending = ['']
+    while pending:
+        rel = pending.pop()
+        try:
+            dirs, cals = list_dir(rel)
+        except OSError:
+            continue
+        dirs = list(dirs)
+        yield rel, dirs, cals
+        pending.extend(reversed([f'{rel}/{d}' if rel else d for d in dirs]))
+
+
+def classify_calibration_tree(walk):
+    '''
+    Sort the directories of a calibration tree by role.
+
+    Parameters
+    ----------
+    walk : iterable
+        A `walk_calibration_tree` walk (it is pruned in place, so pass the
+        generator itself).
+
+    Returns
+    -------
+    folders : list of str
+        Organizational folders, in walk order: every directory other than
+        the root that holds no calibrations, excluding anything inside an
+        object directory.  Includes empty folders.
+    targets : list of str
+        Sorted paths of the folders a new calibration can be filed under,
+        including ``''`` for the root: object directories, whose group the
+        calibration joins, and organizational folders without subfolders,
+        which become objects on their first calibration.  Filing into an
+        organizational folder that has subfolders would make it both at
+        once.
+    '''
+    folders, targets = [], ['']
+    for rel, dirs, cals in walk:
+        if not rel:
+            continue
+        if cals:
+            # Object directory -- don't recurse; anything beneath it
+            # belongs to its calibrations.
+            targets.append(rel)
+            dirs[:] = []
+            continue
+        folders.append(rel)
+        if not dirs:
+            targets.append(rel)
+    return folders, sorted(targets)
+
+
+class CalibrationIndex:
+    '''
+    Persistent, incrementally-refreshed record of a loader's storage tree.
+
+    For every non-calibration directory under ``base_path`` (the root, the
+    organizational folders and the object directories) the index stores the
+    directory's mtime along with the names of its subdirectories, split into
+    calibration directories (those holding a ``metadata.json``) and everything
+    else, plus, for object directories, the calibration pinned by their
+    ``current.json`` marker.  A directory's mtime changes whenever an entry is
+    added to, removed from or renamed within it, so on refresh a directory
+    whose mtime still matches is not listed again -- only directories that
+    actually changed since the last scan are.  Calibration directories are
+    leaves: their (often large) contents are never listed at all.
+
+    The index is saved as compact JSON under ``CAL_ROOT/.index/`` so a
+    fresh process starts from the previous process's scan rather than from
+    nothing.  The file is purely a cache; if it's missing, unreadable or
+    written by an incompatible version it's silently rebuilt.
+
+    Parameters
+    ----------
+    base_path : Path
+        Root of the storage tree being indexed.
+    index_file : Path
+        Where to persist the index.
+    '''
+    VERSION = 2
+
+    #: Directories modified within this many seconds of being listed are
+    #: recorded without an mtime so the next refresh lists them again.
+    #: Filesystem timestamps are coarse (a few ms on Linux, 2 s on FAT and
+    #: some SMB shares), so a change landing in the same tick as the
+    #: listing would otherwise leave the mtime unchanged and go unnoticed.
+    MTIME_SLOP = 2
+
+    def __init__(self, base_path, index_file):
+        self.base_path = Path(base_path)
+        self.index_file = Path(index_file)
+        self._entries = None
+        self._seen = set()
+        self._changed = False
+        self._full = False
+        self._dirty = False
+
+    def _load(self):
+        try:
+            data = json.loads(self.index_file.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != self.VERSION \
+                or data.get('base_path') != str(self.base_path):
+            return {}
+        return data.get('dirs', {})
+
+    def save(self):
+        '''
+        Write the index to disk if it changed since it was last saved.
+        Failures (e.g. a read-only share) are ignored -- the index is only
+        a cache.
+        '''
+        if not self._dirty:
+            return
+        data = {
+            'version': self.VERSION,
+            'base_path': str(self.base_path),
+            'dirs': self._entries,
+        }
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_name(self.index_file.name + '.tmp')
+            tmp_file.write_text(json.dumps(data, separators=(',', ':')))
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            return
+        self._dirty = False
+
+    @staticmethod
+    def _list_dir(path):
+        return _scan_dir(path)
+
+    def _listing(self, rel):
+        '''
+        Return the ``(dirs, cals)`` listing of the directory at ``rel``
+        (posix-style, relative to ``base_path``), re-listing it only if its
+        mtime no longer matches the index.  Raises OSError if the directory
+        can't be listed (e.g. it no longer exists).
+        '''
+        path = self.base_path / rel if rel else self.base_path
+        mtime = path.stat().st_mtime_ns
+        self._seen.add(rel)
+        entry = self._entries.get(rel)
+        if entry is not None and entry['mtime'] == mtime and not self._full:
+            return entry['dirs'], entry['cals']
+        if rel and os.path.isfile(path / 'metadata.json'):
+            # The walk only reaches directories their parent listed as
+            # plain ones.  psi creates a run's directory when the run starts
+            # but only writes its metadata.json when it ends, which changes
+            # the directory's own mtime and not its parent's.
+            self._promote(rel)
+            return [], []
+        dirs, cals = self._list_dir(path)
+        pin = read_pinned_name(path) if cals else None
+        if entry is None or entry['dirs'] != dirs or entry['cals'] != cals \
+                or entry.get('pin') != pin:
+            self._changed = True
+        if time.time_ns() - mtime < self.MTIME_SLOP * 1e9:
+            mtime = None
+        self._entries[rel] = {'mtime': mtime, 'dirs': dirs, 'cals': cals}
+        if pin is not None:
+            self._entries[rel]['pin'] = pin
+        self._dirty = True
+        return dirs, cals
+
+    def _promote(self, rel):
+        '''
+        Move the directory at ``rel`` from its parent's plain directories to
+        its calibrations.
+        '''
+        parent, _, name = rel.rpartition('/')
+        entry = self._entries[parent]
+        entry['dirs'] = [d for d in entry['dirs'] if d != name]
+        entry['cals'] = sorted(entry['cals'] + [name])
+        pin = read_pinned_name(self.base_path / parent if parent
+                               else self.base_path)
+        entry.pop('pin', None)
+        if pin is not None:
+            entry['pin'] = pin
+        self._entries.pop(rel, None)
+        self._seen.discard(rel)
+        self._changed = True
+        self._dirty = True
+
+    def refresh(self, full=False):
+        '''
+        Bring the index up to date with the tree on disk.
+
+        Parameters
+        ----------
+        full : bool
+            If True, re-list every directory regardless of its mtime.
+
+        Returns
+        -------
+        bool
+            True if any directory's contents changed since the last refresh.
+        '''
+        if self._entries is None:
+            self._entries = self._load()
+        self._seen = set()
+        self._changed = False
+        self._full = full
+        for _ in walk_calibration_tree(self.base_path, self._listing):
+            pass
+
+        # Forget directories that have since been removed or renamed.
+        for rel in set(self._entries) - self._seen:
+            del self._entries[rel]
+            self._dirty = True
+            self._changed = True
+        self.save()
+        return self._changed
+
+    def objects(self):
+        '''
+        Every calibrated object recorded in the index as of the last
+        `refresh`.
+
+        Returns
+        -------
+        dict
+            Maps ``(folder, name)`` to a list of the object's calibration
+            directories (see ``CFTSBaseLoader._walk_objects``).
+        '''
+        objects = {}
+        for rel in sorted(self._entries or {}):
+            cals = self._entries[rel]['cals']
+            # Calibration directories sitting directly in base_path have no
+            # object directory, so they don't form an object.
+            if cals and rel:
+                folder, _, name = rel.rpartition('/')
+                object_dir = self.base_path / rel
+                objects[folder, name] = [object_dir / c for c in cals]
+        return objects
+
+    def dirs(self):
+        '''
+        The index entry of every directory as of the last `refresh`: maps
+        its posix-style path to a dict of its ``mtime``, ``dirs`` and
+        ``cals`` (and the ``pin`` of object directories that have one).
+        Treat as read-only.
+        '''
+        return self._entries or {}
+
+    def pins(self):
+        '''
+        The pinned calibration of every object that has one, as of the last
+        `refresh`.
+
+        Returns
+        -------
+        dict
+            Maps ``(folder, name)`` to the directory name of the object's
+            pinned calibration.
+        '''
+        pins = {}
+        for rel, entry in (self._entries or {}).items():
+            if rel and 'pin' in entry:
+                folder, _, name = rel.rpartition('/')
+                pins[folder, name] = entry['pin']
+        return pins
+
+    def forget(self, rel):
+        '''
+        Drop the directory at ``rel`` and all of its ancestors from the
+        index so the next `refresh` lists them again whatever their mtimes
+        say.
+        '''
+        if self._entries is None:
+            return
+        parts = rel.split('/') if rel else []
+        for i in range(len(parts) + 1):
+            self._entries.pop('/'.join(parts[:i]), None)
+
+
+class LoaderSnapshot:
+    '''
+    Immutable result of one walk of a `CFTSBaseLoader`'s storage tree.
+
+    A loader hands out the same snapshot instance for as long as nothing in
+    its tree has changed, so anything derived from a snapshot can be cached
+    against the snapshot's identity.  Everything the calibration tree needs
+    comes from the one walk: the objects and their calibrations, the pins,
+    and the organizational folders (so views don't walk the tree again to
+    find empty ones).
+
+    Attributes
+    ----------
+    objects : Mapping
+        Read-only map of ``(folder, name)`` to a tuple of the object's
+        calibration directories.
+    pins : {Mapping, None}
+        Read-only map of ``(folder, name)`` to the directory name of the
+        object's pinned calibration, for objects that have one.  None if
+        the loader doesn't track pins.
+    folders : {tuple, None}
+        Organizational folders, and ``targets`` the folders a new
+        calibration can be filed under (see `classify_calibration_tree`).
+        None if the snapshot wasn't built from a directory listing.
+    targets : {tuple, None}
+        See ``folders``.
+    mtimes : {Mapping, None}
+        Read-only map of the posix-style path of every directory listed to
+        its mtime (in ns; None if it was too recent to trust).
+    '''
+    __slots__ = ('objects', 'pins', 'folders', 'targets', 'mtimes')
+
+    def __init__(self, objects, pins=None, dirs=None):
+        self.objects = MappingProxyType({
+            key: tuple(cal_dirs) for key, cal_dirs in objects.items()
+        })
+        self.pins = None if pins is None else MappingProxyType(dict(pins))
+        if dirs is None:
+            self.folders = self.targets = self.mtimes = None
+            return
+
+        def list_dir(rel):
+            if rel not in dirs:
+                raise OSError(f'{rel} was not listed')
+            return dirs[rel]['dirs'], dirs[rel]['cals']
+
+        folders, targets = classify_calibration_tree(
+            walk_calibration_tree('', list_dir)
+        )
+        self.folders = tuple(folders)
+        self.targets = tuple(targets)
+        self.mtimes = MappingProxyType({
+            rel: entry['mtime'] for rel, entry in dirs.items()
+        })
+
+
+#: Every CFTSBaseLoader constructed in this process (see invalidate_loaders).
+_LOADERS = weakref.WeakSet()
+
+
+def invalidate_loaders(path=None):
+    '''
+    Tell every loader that the tree changed on disk at ``path``.
+
+    Call this after writing to, moving within or deleting from a
+    calibration tree so the change shows up on the loaders' very next walk
+    even if it landed within the resolution of the directory mtimes their
+    snapshots are checked against.  Passing None makes every loader re-list
+    its whole tree on its next walk.
+    '''
+    for loader in list(_LOADERS):
+        loader.invalidate(path)
+
+
 class CFTSBaseLoader(CalibrationLoader):
 
+    #: Seconds after which the next walk re-lists every directory rather than
+    #: trusting their mtimes -- a backstop for changes an mtime can't reveal
+    #: (a ``metadata.json`` removed from inside a calibration directory, or a
+    #: file server whose clock is off from ours by more than
+    #: ``CalibrationIndex.MTIME_SLOP``).
+    snapshot_ttl = 300
+
+    #: Lazily created by `snapshot` (subclasses used in tests set
+    #: ``base_path`` directly and never run ``__init__``).
+    _index = None
+    _snapshot = None
+    _last_full_scan = None
+    _force_full_scan = False
+
+    #: Serializes `snapshot`, which the calibration trees call from worker
+    #: threads.  Replaced by one per instance in ``__init__``.
+    _lock = threading.RLock()
+
+    #: Paths `invalidate` was called with, forgotten by the next `snapshot`
+    #: so that `invalidate` never waits for a walk in progress.  Guarded by
+    #: ``_forget_lock`` (likewise replaced in ``__init__``).
+    _forgotten = ()
+    _forget_lock = threading.Lock()
+
     def __init__(self):
         self.base_path = CAL_ROOT / self.subfolder
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._forget_lock = threading.Lock()
+        _LOADERS.add(self)
+
+    @property
+    def index_file(self):
+        '''
+        Location of this loader's persistent `CalibrationIndex`, under
+        ``CAL_ROOT/.index/`` -- i.e. next to, not inside, ``base_path``.
+        '''
+        return self.base_path.parent / _INDEX_FOLDER / f'{self.base_path.name}.json'
 
     def list_names(self):
         for path in self.base_path.iterdir():
@@ -497,19 +1450,80 @@ class CFTSBaseLoader(CalibrationLoader):
         # (some callers, e.g. the settings dropdowns, only need the names).
         return sorted({name for _, name in self._walk_objects()})
 
-    def list_all_calibrations(self):
-        # Override: one disk walk instead of the base class's
-        # list_objects() + one list_calibrations() (i.e. one more walk)
-        # per object.  _walk_objects() rglobs every metadata.json under
-        # base_path, so re-running it once per object is O(n_objects)
-        # full-tree rescans -- on a real calibration tree (hundreds of
-        # recordings) that's the difference between a sub-second call and
-        # a multi-minute one. See the inear plugin freeze this fixed:
-        # InEarSettings.refresh_available() -> get_available_ears() ->
-        # inear_manager.get_property('ear') was doing exactly that.
-        for (folder, name), cal_dirs in self._walk_objects().items():
-            for cal_dir in cal_dirs:
-                yield folder, name, self.cal_class(name, cal_dir)
+    def list_all_calibrations(self, prefetch=False, snapshot=None):
+        # Override: one snapshot lookup instead of the base class's
+        # list_objects() + one list_calibrations() per object.  Before
+        # snapshots, _walk_objects() rescanned the tree on every call, so
+        # going through list_calibrations() once per object was
+        # O(n_objects) full-tree rescans -- on a real calibration tree
+        # (hundreds of recordings) the difference between a sub-second
+        # call and a multi-minute one. See the inear plugin freeze this
+        # fixed: InEarSettings.refresh_available() -> get_available_ears()
+        # -> inear_manager.get_property('ear') was doing exactly that.
+        if snapshot is None:
+            snapshot = self.snapshot()
+        result = [
+            (folder, name, self.cal_class(name, cal_dir))
+            for (folder, name), cal_dirs in snapshot.objects.items()
+            for cal_dir in cal_dirs
+        ]
+        if prefetch:
+            prefetch_metadata(cal for _, _, cal in result)
+        yield from result
+
+    def snapshot(self):
+        '''
+        Return the current `LoaderSnapshot` of this loader's tree.
+
+        The previous snapshot is reused as long as a refresh of the
+        `CalibrationIndex` -- one ``stat`` of the root, each organizational
+        folder and each object directory -- finds nothing changed.  Once
+        ``snapshot_ttl`` seconds have passed since the last full scan (or
+        after `invalidate` is called without a path) the next call re-lists
+        every directory instead.  Safe to call from any thread.
+        '''
+        with self._lock:
+            return self._snapshot_locked()
+
+    def _snapshot_locked(self):
+        if self._index is None or self._index.base_path != self.base_path:
+            self._index = CalibrationIndex(self.base_path, self.index_file)
+            self._snapshot = None
+        with self._forget_lock:
+            forgotten, self._forgotten = self._forgotten, ()
+        for rel in forgotten:
+            self._index.forget(rel)
+        now = time.monotonic()
+        full = self._force_full_scan or (
+            self._last_full_scan is not None
+            and now - self._last_full_scan > self.snapshot_ttl
+        )
+        changed = self._index.refresh(full=full)
+        if full or self._last_full_scan is None:
+            self._last_full_scan = now
+            self._force_full_scan = False
+        if changed or self._snapshot is None:
+            self._snapshot = LoaderSnapshot(self._index.objects(),
+                                            self._index.pins(),
+                                            self._index.dirs())
+        return self._snapshot
+
+    def invalidate(self, path=None):
+        '''
+        Discard cached knowledge of the tree so the next walk sees changes
+        made at ``path`` (a directory anywhere within ``base_path``).  With
+        no ``path`` the next walk re-lists the entire tree.  Paths outside
+        ``base_path`` are ignored.
+        '''
+        if path is None:
+            self._force_full_scan = True
+            return
+        try:
+            rel = Path(path).relative_to(self.base_path).as_posix()
+        except ValueError:
+            return
+        with self._forget_lock:
+            self._forgotten += ('' if rel == '.' else rel,)
 
     def _walk_objects(self):
         '''
@@ -522,25 +1536,18 @@ class CFTSBaseLoader(CalibrationLoader):
         ``folder`` is the posix-style relative path from ``base_path`` to
         the object's parent directory.
 
+        The walk goes through this loader's persistent `CalibrationIndex`,
+        so only directories modified since the previous walk (in this or
+        an earlier process) are actually listed, and returns the loader's
+        memoized `LoaderSnapshot` when nothing changed.
+
         Returns
         -------
-        dict
-            Maps ``(folder, name)`` to a list of the object's calibration
-            directories.
+        Mapping
+            Read-only map of ``(folder, name)`` to a tuple of the object's
+            calibration directories.
         '''
-        objects = {}
-        if not self.base_path.exists():
-            return objects
-        for meta_file in self.base_path.rglob('metadata.json'):
-            cal_dir = meta_file.parent
-            object_dir = cal_dir.parent
-            try:
-                rel = object_dir.parent.relative_to(self.base_path)
-            except ValueError:
-                continue
-            folder = '' if str(rel) == '.' else rel.as_posix()
-            objects.setdefault((folder, object_dir.name), []).append(cal_dir)
-        return objects
+        return self.snapshot().objects
 
 
 ################################################################################
@@ -602,34 +1609,105 @@ class Starship(CalibratedObject):
     pass
 
 
+class EPLHeader:
+    '''
+    What `read_epl_header` learned from the header of an EPL ``.calib`` file.
+
+    Attributes
+    ----------
+    datetime : datetime or None
+        Value of the ``Date:`` line, if there is one.
+    smoothed : bool or None
+        True if a ``[Smoothing]`` section precedes the data, False if it
+        doesn't, None if the file has no data section at all.
+    data_offset : int or None
+        Byte offset of the first line of data (just past the ``Freq(Hz)``
+        column header), or None if there is no data section.
+    '''
+    __slots__ = ('datetime', 'smoothed', 'data_offset')
+
+    def __init__(self, datetime, smoothed, data_offset):
+        self.datetime = datetime
+        self.smoothed = smoothed
+        self.data_offset = data_offset
+
+
+#: Number of parsed EPL headers kept (see `read_epl_header`).
+EPL_HEADER_CACHE_SIZE = 4096
+
+
+def _parse_epl_header(filename):
+    datetime = None
+    smoothed = None
+    offset = 0
+    with open(filename, 'rb') as fh:
+        for line in fh:
+            offset += len(line)
+            if line.startswith(b'Date: ') and datetime is None:
+                datetime = dt.datetime.strptime(
+                    line[6:].decode().strip(), '%m/%d/%Y %I:%M:%S %p'
+                )
+            elif line.startswith(b'[Smoothing]'):
+                smoothed = True
+            elif line.startswith(b'Freq(Hz)'):
+                return EPLHeader(datetime, bool(smoothed), offset)
+    return EPLHeader(datetime, smoothed, None)
+
+
+@lru_cache(maxsize=EPL_HEADER_CACHE_SIZE)
+def _cached_epl_header(filename, mtime_ns, size):
+    return _parse_epl_header(filename)
+
+
+def read_epl_header(filename, stamp=None):
+    '''
+    Return the `EPLHeader` of the EPL ``.calib`` file ``filename``.
+
+    The header is read in a single pass that stops at the start of the
+    data.  The most recently used headers are cached against the file's
+    ``(st_mtime_ns, st_size)`` stamp, so a rewritten file is parsed again.
+    Pass ``stamp`` if it is already known (e.g. from a directory listing) to
+    skip the ``stat``.
+    '''
+    filename = Path(filename)
+    if stamp is None:
+        stat = filename.stat()
+        stamp = stat.st_mtime_ns, stat.st_size
+    return _cached_epl_header(filename, *stamp)
+
+
 class EPLStarshipCalibration(FileCalibration):
     '''
     Wrapper around a probe tube calibration file generated by the EPL CFTS
     calibration program.
     '''
 
+    def __init__(self, name, filename, stamp=None):
+        super().__init__(name, filename)
+        # As listed by EPLStarshipLoader, so the header can be looked up
+        # without another stat (see read_epl_header).
+        self._stamp = stamp
+
     def _get_cmp_key(self, obj):
         if obj is None:
             return (None, None, None, None)
         return obj.name, obj.datetime, obj.smoothed, obj.label
 
     @cached_property
+    def header(self):
+        return read_epl_header(self.filename, self._stamp)
+
+    @property
     def datetime(self):
-        with self.filename.open() as fh:
-            for line in fh:
-                if line.startswith('Date: '):
-                    break
-        return dt.datetime.strptime(line[6:].strip(), '%m/%d/%Y %I:%M:%S %p')
+        if self.header.datetime is None:
+            raise ValueError(f'No date in the header of {self.filename}')
+        return self.header.datetime
 
-    @cached_property
+    @property
     def smoothed(self):
-        with self.filename.open() as fh:
-            for line in fh:
-                if line.startswith('[Smoothing]'):
-                    return True
-                if line.startswith('Freq(Hz)'):
-                    return False
+        return self.header.smoothed
 
+    @cached_load()
     def load(self):
         attrs ={
             'calibration_file': str(self.filename),
@@ -637,10 +1715,13 @@ class EPLStarshipCalibration(FileCalibration):
             'string': self.to_string(),
             'class': self.qualname,
         }
-        with self.filename.open() as fh:
-            for line in fh:
-                if line.startswith('Freq(Hz)'):
-                    break
+        # Check the header is still current -- the file may have been
+        # rewritten since this calibration was listed.
+        offset = read_epl_header(self.filename).data_offset
+        if offset is None:
+            raise ValueError(f'No calibration data in {self.filename}')
+        with self.filename.open('rb') as fh:
+            fh.seek(offset)
             cal = pd.read_csv(fh, sep='\t', header=None)
             return InterpCalibration.from_spl(cal[0], cal[1], attrs=attrs)
 
@@ -653,25 +1734,107 @@ class EPLStarshipLoader(CalibrationLoader):
     '''
     Interface that lists available starships and calibrations generated by the
     EPL CFTS calibration program.
+
+    The EPL program writes every calibration as a flat ``.calib`` file
+    directly in ``base_path``, so one listing of that directory -- redone
+    only when its mtime changes -- is all `snapshot` needs.
     '''
     base_path = Path(r'C:\Data\Probe Tube Calibrations')
 
-    def list_names(self):
-        names = set()
-        for calfile in self.base_path.glob('*_ProbeTube*.calib'):
+    FILE_PATTERN = '*_ProbeTube*.calib'
+
+    #: See `CFTSBaseLoader.snapshot_ttl`.
+    snapshot_ttl = 300
+
+    _snapshot = None
+    _snapshot_key = None
+    _last_scan = None
+    _force_scan = False
+    #: See `CFTSBaseLoader._lock` (the loader registry makes this a single
+    #: instance).
+    _lock = threading.RLock()
+    #: ``{filename: (mtime_ns, size)}`` for every calibration file, sorted by
+    #: name.
+    _files = MappingProxyType({})
+
+    @staticmethod
+    def _object_name(filename):
+        name = filename.stem.rsplit('.', 1)[0].rsplit('_', 1)[0]
+        return f'{name} (EPL)'
+
+    def _scan(self):
+        files = {}
+        try:
+            with os.scandir(self.base_path) as it:
+                for entry in it:
+                    if fnmatch.fnmatch(entry.name, self.FILE_PATTERN) \
+                            and entry.is_file():
+                        stat = entry.stat()
+                        files[Path(entry.path)] = \
+                            stat.st_mtime_ns, stat.st_size
+        except OSError:
+            pass
+        return dict(sorted(files.items()))
+
+    def snapshot(self):
+        '''
+        Return the current `LoaderSnapshot` of ``base_path``, which is
+        re-listed only if its mtime changed (or is too recent to trust, see
+        `CalibrationIndex.MTIME_SLOP`), ``snapshot_ttl`` seconds have
+        passed or `invalidate` was called.  Safe to call from any thread.
+        '''
+        with self._lock:
+            return self._snapshot_locked()
+
+    def _snapshot_locked(self):
+        try:
+            mtime = self.base_path.stat().st_mtime
+        except OSError:
+            mtime = None
+        else:
+            if time.time() - mtime < CalibrationIndex.MTIME_SLOP:
+                mtime = None
+        key = (self.base_path, mtime)
+        now = time.monotonic()
+        if self._snapshot is not None and mtime is not None \
+                and key == self._snapshot_key and not self._force_scan \
+                and now - self._last_scan <= self.snapshot_ttl:
+            return self._snapshot
+
+        files = self._scan()
+        self._snapshot_key = key
+        self._last_scan = now
+        self._force_scan = False
+        if self._snapshot is None or list(files) != list(self._files):
+            objects = {}
+            for filename in files:
+                objects.setdefault(('', self._object_name(filename)), []) \
+                    .append(filename)
+            self._snapshot = LoaderSnapshot(objects)
+        self._files = MappingProxyType(files)
+        return self._snapshot
+
+    def invalidate(self, path=None):
+        if path is None or Path(path) == self.base_path \
+                or self.base_path in Path(path).parents:
+            self._force_scan = True
 
-            name = calfile.stem.rsplit('.', 1)[0].rsplit('_', 1)[0]
-            names.add(f'{name} (EPL)')
-        return names
+    def list_names(self):
+        return {name for _, name in self.snapshot().objects}
 
     def list_calibrations(self, name, folder=None):
         if name.endswith(' (EPL)'):
             name, _ = name.rsplit(' ', 1)
-        calibrations = []
-        for filename in self.base_path.glob(f'{name}_ProbeTube*.calib'):
-            calibration = EPLStarshipCalibration(name, filename)
-            calibrations.append(calibration)
-        return calibrations
+        self.snapshot()
+        # Match files with the same pattern the loader always globbed for,
+        # rather than through the snapshot's grouping (`_object_name` can
+        # split an unusual file name differently).
+        pattern = f'{name}_ProbeTube*.calib'
+        return [
+            EPLStarshipCalibration(name, filename, stamp)
+            for filename, stamp in self._files.items()
+            if fnmatch.fnmatch(filename.name, pattern)
+        ]
 
 
 class CFTSStarshipCalibration(CFTSFileCalibration):
@@ -717,6 +1880,7 @@ class CFTSStarshipCalibration(CFTSFileCalibration):
     def stimulus(self):
         return self.metadata['stimulus']
 
+    @cached_load('golay_sens.csv', 'chirp_sens.csv')
     def load(self):
         if self.stimulus == 'golay':
             return self.load_golay()
@@ -725,7 +1889,7 @@ class CFTSStarshipCalibration(CFTSFileCalibration):
 
     def load_chirp(self):
         index_col = ['hw_ao_chirp_level', 'frequency']
-        sens = pd.read_csv(self.filename / 'chirp_sens.csv', index_col=index_col)
+        sens = read_sens_csv(self.filename / 'chirp_sens.csv', index_col)
         output_gain = float(sens.index.unique('hw_ao_chirp_level').max())
         s = sens.loc[output_gain]
         attrs ={
@@ -739,7 +1903,7 @@ class CFTSStarshipCalibration(CFTSFileCalibration):
 
     def load_golay(self):
         index_col = ['n_bits', 'output_gain', 'frequency']
-        sens = pd.read_csv(self.filename / 'golay_sens.csv', index_col=index_col)
+        sens = read_sens_csv(self.filename / 'golay_sens.csv', index_col)
         n_bits = int(sens.index.unique('n_bits').max())
         output_gain = float(sens.index.unique('output_gain').max())
         s = sens.loc[n_bits, output_gain]
@@ -812,21 +1976,28 @@ class CFTSSpeakerCalibration(CFTSFileCalibration):
 
     @cached_property
     def max_frequency(self):
+        if 'max_frequency' in self.summary:
+            return self.summary['max_frequency']
         return self.sens.index.unique('frequency').max()
 
     @cached_property
     def n_bits(self):
+        if 'n_bits' in self.summary:
+            return self.summary['n_bits']
         return int(self.sens.index.unique('n_bits').max())
 
     @cached_property
     def output_gain(self):
+        if 'output_gain' in self.summary:
+            return self.summary['output_gain']
         return float(self.sens.index.unique('output_gain').max())
 
     @cached_property
     def sens(self):
         index_col = ['n_bits', 'output_gain', 'frequency']
-        return pd.read_csv(self.filename / 'golay_sens.csv', index_col=index_col)
+        return read_sens_csv(self.filename / 'golay_sens.csv', index_col)
 
+    @cached_load('golay_sens.csv')
     def load(self):
         s = self.sens.loc[self.n_bits, self.output_gain]
         attrs = {
@@ -872,6 +2043,8 @@ class CFTSInputAmplifierCalibration(CFTSFileCalibration):
 
     @cached_property
     def measured_gain(self):
+        if 'measured_gain' in self.summary:
+            return self.summary['measured_gain']
         sens_file = self.filename / 'amplifier_gain.json'
         gain = json.loads(sens_file.read_text())
         return gain['gain mean (linear)']
@@ -953,6 +2126,8 @@ class CFTSMeasurementMicrophoneCalibration(CFTSMicrophoneCalibration):
 
     @cached_property
     def sens(self):
+        if 'sens' in self.summary:
+            return self.summary['sens']
         try:
             sens_file = self.filename / 'microphone_sensitivity.json'
             cal = json.loads(sens_file.read_text())
@@ -964,6 +2139,7 @@ class CFTSMeasurementMicrophoneCalibration(CFTSMicrophoneCalibration):
     def sens_db(self):
         return util.db(self.sens)
 
+    @cached_load('microphone_sensitivity.json')
     def load(self):
         sens_file = self.filename / 'microphone_sensitivity.json'
         cal = json.loads(sens_file.read_text())
@@ -1025,21 +2201,28 @@ class CFTSGenericMicrophoneCalibration(CFTSMicrophoneCalibration):
 
     @cached_property
     def max_frequency(self):
+        if 'max_frequency' in self.summary:
+            return self.summary['max_frequency']
         return self.sens.index.unique('frequency').max()
 
     @cached_property
     def n_bits(self):
+        if 'n_bits' in self.summary:
+            return self.summary['n_bits']
         return int(self.sens.index.unique('n_bits').max())
 
     @cached_property
     def output_gain(self):
+        if 'output_gain' in self.summary:
+            return self.summary['output_gain']
         return float(self.sens.index.unique('output_gain').max())
 
     @cached_property
     def sens(self):
         index_col = ['n_bits', 'output_gain', 'frequency']
-        return pd.read_csv(self.filename / 'golay_sens.csv', index_col=index_col)
+        return read_sens_csv(self.filename / 'golay_sens.csv', index_col)
 
+    @cached_load('golay_sens.csv')
     def load(self):
         '''
         Load calibration that was run at the highest output gain and number of
@@ -1163,9 +2346,29 @@ class CFTSInEarCalibration(CFTSFileCalibration):
     def load_recording(self):
         return InearCalibration(self.filename)
 
+    def get_average_psd(self):
+        '''
+        Average PSD of the recording (level x frequency, as returned by
+        ``InearCalibration.get_average_psd``).
+
+        Saved next to the recording the first time it is computed (see
+        :mod:`cftscal.psd_cache`) and shared in memory through `psd_cache`,
+        so callers must treat the result as read-only.
+        '''
+        stamp = recording_stamp(self.filename)
+        return psd_cache.get_or_load(
+            (self.to_string(), stamp),
+            lambda: read_average_psd(
+                self.filename,
+                lambda: self.load_recording().get_average_psd(),
+                stamp,
+            ),
+        )
+
+    @cached_load('chirp_sens.csv')
     def load(self):
         index_col = ['hw_ao_chirp_level', 'frequency']
-        sens = pd.read_csv(self.filename / 'chirp_sens.csv', index_col=index_col)
+        sens = read_sens_csv(self.filename / 'chirp_sens.csv', index_col)
         level = int(sens.index.unique('hw_ao_chirp_level').max())
         s = sens.loc[level]
         attrs ={
@@ -1201,6 +2404,9 @@ class CFTSInEarLoader(CFTSBaseLoader):
 ################################################################################
 # Basic cal registration
 ################################################################################
+# Managers are thin views over the process-wide loaders handed out by
+# get_loader(): every manager registering the same loader class below shares a
+# single instance (and a single cached walk of its subfolder).
 # Only measurement microphones
 measurement_microphone_manager = CalibrationManager(MeasurementMicrophone)
 measurement_microphone_manager.register('cftscal.objects.CFTSMeasurementMicrophoneLoader')
@@ -0,0 +1,75 @@
+'''
+Background jobs where only the most recent request matters.
+
+Recomputing the region analysis on the Qt thread froze the view for as long
+as it took, and dragging the region again queued another full recompute
+behind it.  `LatestOnlyExecutor` runs such jobs in a worker thread and
+tags each one with a generation number: submitting a new job cancels any
+that hasn't started, tells a running one (through the ``cancelled``
+callable it is given) that it can stop, and results from anything but the
+latest generation are dropped instead of being posted back.
+'''
+import logging
+log = logging.getLogger(__name__)
+
+from concurrent.futures import ThreadPoolExecutor
+
+from enaml.application import deferred_call
+
+
+class LatestOnlyExecutor:
+    '''
+    Runs ``job(cancelled)`` in a worker thread and hands its result to
+    ``callback`` on the GUI thread, unless a newer job was submitted in
+    the meantime.
+
+    Attributes
+    ----------
+    generation : int
+        Incremented by every `submit` and `cancel`.  A job's result is only
+        delivered if no newer generation exists by the time it finishes.
+    '''
+
+    def __init__(self, post=deferred_call):
+        #: Schedules ``callable(*args)`` on the GUI thread.
+        self.post = post
+        self.generation = 0
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._future = None
+
+    def submit(self, job, callback):
+        '''
+        Run ``job`` in the background and pass its result to ``callback``.
+
+        ``job`` is called with a single argument, a callable returning True
+        once the job has been superseded, which long jobs should check
+        periodically so they can return early.
+        '''
+        self.cancel()
+        generation = self.generation
+        cancelled = lambda: generation != self.generation
+        future = self._pool.submit(job, cancelled)
+        future.add_done_callback(
+            lambda f: self.post(self._done, generation, f, callback)
+        )
+        self._future = future
+        return future
+
+    def cancel(self):
+        '''
+        Drop the current job: cancel it if it hasn't started and discard
+        its result otherwise.
+        '''
+        self.generation += 1
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    def _done(self, generation, future, callback):
+        if generation != self.generation or future.cancelled():
+            return
+        self._future = None
+        if future.exception() is not None:
+            log.error('Background job failed', exc_info=future.exception())
+            return
+        callback(future.result())
@@ -0,0 +1,80 @@
+'''
+History of in-ear PSDs for one starship, stored as a time x frequency array.
+
+The delta plot shows, for a selected frequency, how a starship's in-ear
+level changed across its calibrations.  Keeping the PSDs in one array
+sorted by time turns every redraw (in particular each step of dragging the
+frequency cursor) into a single column slice.
+'''
+import numpy as np
+
+
+class PSDHistory:
+    '''
+    PSDs keyed by calibration, ordered by timestamp.
+
+    The first PSD inserted fixes the frequency grid; PSDs on a different
+    grid are interpolated onto it.
+    '''
+
+    def __init__(self):
+        #: Frequency grid shared by all rows.
+        self.frequency = None
+        #: Timestamp of each row (seconds since the epoch), sorted.
+        self.times = np.empty(0)
+        #: Level at each timestamp (row) and frequency (column).
+        self.values = np.empty((0, 0))
+        #: Key of each row.
+        self.keys = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def insert(self, key, timestamp, frequency, levels):
+        '''
+        Add the PSD ``levels`` (sampled at ``frequency``) for ``key``,
+        replacing any PSD already stored under that key.
+        '''
+        frequency = np.asarray(frequency, dtype=float)
+        levels = np.asarray(levels, dtype=float)
+        if self.frequency is None:
+            self.frequency = frequency
+            self.values = np.empty((0, len(frequency)))
+        elif not np.array_equal(frequency, self.frequency):
+            levels = np.interp(self.frequency, frequency, levels,
+                               left=np.nan, right=np.nan)
+        self.remove(key)
+        i = int(np.searchsorted(self.times, timestamp, side='right'))
+        self.times = np.insert(self.times, i, timestamp)
+        self.values = np.insert(self.values, i, levels, axis=0)
+        self.keys.insert(i, key)
+
+    def remove(self, key):
+        '''
+        Remove the PSD stored under ``key``, if any.
+        '''
+        try:
+            i = self.keys.index(key)
+        except ValueError:
+            return
+        self.times = np.delete(self.times, i)
+        self.values = np.delete(self.values, i, axis=0)
+        del self.keys[i]
+
+    def nearest_index(self, frequency):
+        '''
+        Column closest to ``frequency``.
+        '''
+        return int(np.argmin(np.abs(self.frequency - frequency)))
+
+    def at_frequency(self, frequency):
+        '''
+        Return ``(times, levels)`` at the grid frequency closest to
+        ``frequency``.  ``levels`` is a view into the history.
+        '''
+        if self.frequency is None:
+            return self.times, np.empty(0)
+        return self.times, self.values[:, self.nearest_index(frequency)]
@@ -0,0 +1,183 @@
+'''
+Filtering for the input recording view, cached and run off the GUI thread.
+
+Filtering a long, multi-channel recording with ``sosfiltfilt`` takes long
+enough that doing it on the Qt thread for every change of the filter
+settings made the view unusable.  `FilterWorker` filters in a thread pool
+and keeps the filtered signals, with their `Overview` for the time plot, in
+a `CalibrationCache` keyed by recording, channel and filter settings, so
+returning to earlier settings is free.
+'''
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from scipy import signal
+
+from psiaudio import util
+
+from cftscal.objects import CalibrationCache
+from cftscal.plugins.overview import Overview
+
+
+#: Lowest corner frequency of the A-weighting curve, in Hz.
+A_WEIGHTING_F1 = 20.598997
+
+#: Padding read on either side of a region before filtering it (see
+#: `filter_region`), in periods of the filter's bandwidth per order of the
+#: filter.  The edge transients of a narrow bandpass ring for longer.
+PADDING_CYCLES = 5
+
+
+def a_weighting_sos(fs):
+    '''
+    Digital A-weighting filter, as second-order sections.
+
+    Implements the standard IEC 61672-1 A-weighting curve (the same
+    frequency weighting used by calibrated sound level meters) via the
+    analog pole/zero definition, converted to a digital filter with the
+    bilinear transform. Accuracy degrades somewhat above ~10 kHz at
+    lower sample rates (a known characteristic of the bilinear
+    transform near Nyquist); this is negligible at the low end, which
+    is what matters for filtering out sub-20 Hz rumble.
+
+    Parameters
+    ----------
+    fs : float
+        Sampling rate, in Hz.
+
+    Returns
+    -------
+    sos : np.ndarray
+        Second-order sections suitable for `scipy.signal.sosfiltfilt`.
+    '''
+    f1, f2, f3, f4 = A_WEIGHTING_F1, 107.65265, 737.86223, 12194.217
+    zeros = np.array([0, 0, 0, 0])
+    poles = -2 * np.pi * np.array([f1, f1, f4, f4, f2, f3])
+    # Normalize so the analog response is 0 dB (gain 1) at 1 kHz, per the
+    # standard.
+    b, a = signal.zpk2tf(zeros, poles, 1)
+    _, h = signal.freqs(b, a, [2 * np.pi * 1000])
+    k = 1 / abs(h[0])
+    z_d, p_d, k_d = signal.bilinear_zpk(zeros, poles, k, fs)
+    return signal.zpk2sos(z_d, p_d, k_d)
+
+
+@lru_cache(maxsize=64)
+def filter_sos(fs, mode, fc, order):
+    '''
+    Second-order sections for filter ``mode`` at sampling rate ``fs``
+    (``fc`` and ``order`` only apply to '1/3 Octave'), or None for
+    'Unfiltered'.  Cached, so treat the result as read-only.
+    '''
+    if mode == 'Unfiltered':
+        return None
+    if mode == 'dBA':
+        sos = a_weighting_sos(fs)
+    else:
+        fl, fh = util.octave_band_freqs(fc, 1 / 3)
+        sos = signal.iirfilter(order, (fl, fh), btype='bandpass', fs=fs,
+                               output='sos')
+    return sos
+
+
+def apply_filter(y, fs, mode, fc, order):
+    '''
+    Return ``y`` filtered (zero-phase) with the filter described by
+    ``mode``, ``fc`` and ``order`` (see `filter_sos`).
+    '''
+    sos = filter_sos(float(fs), mode, float(fc), int(order))
+    if sos is None:
+        return y
+    return signal.sosfiltfilt(sos, y)
+
+
+def filter_padding(fs, mode, fc, order):
+    '''
+    Samples of padding `filter_region` reads on either side of a region for
+    the filter described by ``mode``, ``fc`` and ``order`` (see
+    `filter_sos`).
+    '''
+    if mode == 'Unfiltered':
+        return 0
+    if mode == 'dBA':
+        # A highpass, whose slowest transient is set by its lowest corner.
+        bandwidth, order = A_WEIGHTING_F1, 4
+    else:
+        fl, fh = util.octave_band_freqs(fc, 1 / 3)
+        bandwidth = fh - fl
+    return int(np.ceil(PADDING_CYCLES * order * fs / bandwidth))
+
+
+def filter_region(read, fs, n_samples, i0, i1, mode, fc, order):
+    '''
+    Return samples ``i0:i1`` of a signal of ``n_samples`` samples, filtered
+    as by `apply_filter`.
+
+    ``read(j0, j1)`` returns samples ``j0:j1`` of the signal.  The region is
+    filtered together with `filter_padding` samples on either side (as far
+    as the signal extends), so the edge transients of ``sosfiltfilt`` stay
+    in the padding and the result matches the same samples of the filtered
+    signal as a whole.
+    '''
+    pad = filter_padding(fs, mode, fc, order)
+    j0, j1 = max(i0 - pad, 0), min(i1 + pad, n_samples)
+    y = apply_filter(read(j0, j1), fs, mode, fc, order)
+    return y[..., i0 - j0:i1 - j0]
+
+
+class FilterWorker:
+    '''
+    Filters full recordings in a thread pool, caching the results.
+
+    Attributes
+    ----------
+    cache : CalibrationCache
+        `Overview` of each filtered signal (with the filtered samples as
+        `Overview.samples`), keyed by ``(key, mode, fc, order)`` where ``key``
+        identifies the signal (e.g., ``(item, channel)``).
+    '''
+
+    def __init__(self, max_workers=4, max_bytes=1024 * 2**20):
+        self.cache = CalibrationCache(max_bytes=max_bytes)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = {}
+
+    def cached(self, key, settings):
+        '''
+        Return the overview of the filtered signal for ``key`` under the
+        filter ``settings`` (``(mode, fc, order)``) if it is already
+        available, otherwise None.
+        '''
+        if settings[0] == 'Unfiltered':
+            return None
+        return self.cache.get((key, *settings))
+
+    def submit(self, key, load, fs, settings):
+        '''
+        Filter the signal returned by ``load()`` in the pool (so it is only
+        read in, and held by, the worker while filtering).  Returns a future
+        for the `Overview` of the filtered signal; requests for a signal that
+        is already being filtered share one future.
+        '''
+        cache_key = (key, *settings)
+        future = self._pending.get(cache_key)
+        if future is None:
+            future = self._pool.submit(
+                self.cache.get_or_load, cache_key,
+                lambda: Overview.from_array(
+                    apply_filter(load(), fs, *settings), fs,
+                ),
+            )
+            self._pending[cache_key] = future
+            future.add_done_callback(
+                lambda f: self._pending.pop(cache_key, None)
+            )
+        return future
+
+    def discard(self, key):
+        '''
+        Drop every cached result for ``key`` (e.g., once its recording is
+        no longer shown).
+        '''
+        self.cache.evict(lambda cache_key: cache_key[0] == key)
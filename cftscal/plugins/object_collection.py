@@ -1,4 +1,26 @@
-from atom.api import Atom, Bool, Event, Value, List, observe
+import logging
+log = logging.getLogger(__name__)
+
+from concurrent.futures import ThreadPoolExecutor
+
+from atom.api import Atom, Bool, Dict, Event, Int, Value, List, observe
+
+from enaml.application import deferred_call
+
+
+#: Walks the loaders of every `ObjectCollection.load`.
+_scan_pool = ThreadPoolExecutor(max_workers=4)
+
+
+def _content_key(calibration):
+    '''
+    What `ObjectGroup.update_subitems` compares to tell whether a calibration
+    listed again changed: its metadata, if it has been read (see
+    ``prefetch_metadata``), otherwise the calibration itself.
+    '''
+    metadata = getattr(calibration, '__dict__', {}).get('metadata')
+    return calibration if metadata is None else metadata
+
 
 class ObjectNode(Atom):
     '''
@@ -41,6 +63,13 @@ class ObjectGroup(Atom):
     def notify(self, node, selected):
         self.parent.notify(node, selected)
 
+    def get_pinned_calibration(self):
+        '''
+        The pinned calibration of this group's object, resolved against the
+        calibrations already in `subitems` rather than listed from disk.
+        '''
+        return self.item.get_pinned_calibration([s.item for s in self.subitems])
+
     def update_subitems(self, calibrations):
         # Takes the object's calibrations pre-computed by the caller
         # (ObjectCollection.update_groups(), from one combined disk walk)
@@ -49,21 +78,39 @@ class ObjectGroup(Atom):
         # one object -- fine for a single group, but ruinous multiplied
         # across every group in a large tree (see
         # CalibrationManager.list_objects_and_calibrations).
+        #
+        # Returns ``(added, removed, changed)``: the ObjectNodes that are
+        # new, the ones that are gone and the ones whose calibration changed
+        # (see `CollectionChange`).
         objects = sorted(calibrations, reverse=True)
 
         existing_nodes = {node.item.filename: node for node in self.subitems}
         new_subitems = []
+        added = []
+        changed = []
 
         for obj in objects:
             key = obj.filename  # Use whatever attribute guarantees uniqueness
             if key in existing_nodes:
                 node = existing_nodes[key]
-                node.item = obj  # Update the underlying data just in case it changed
+                # Every listing creates new calibration objects, so only
+                # swap in the new one if what it describes has changed.
+                if _content_key(node.item) != _content_key(obj):
+                    node.item = obj
+                    changed.append(node)
                 new_subitems.append(node)
             else:
-                new_subitems.append(ObjectNode(item=obj, parent=self))
+                node = ObjectNode(item=obj, parent=self)
+                new_subitems.append(node)
+                added.append(node)
 
-        self.subitems = new_subitems
+        kept = set(id(node) for node in new_subitems)
+        removed = [node for node in self.subitems if id(node) not in kept]
+        # Same nodes (in the same, sorted, order) otherwise, and assigning
+        # would only churn the observers.
+        if added or removed:
+            self.subitems = new_subitems
+        return added, removed, changed
 
     def _observe_subitems(self, change):
         """Safely bind observers while cleaning up removed items to prevent memory leaks."""
@@ -105,6 +152,34 @@ class ObjectGroup(Atom):
                 i.selected = False
 
 
+class CollectionChange(Atom):
+    '''
+    What one `ObjectCollection.update_groups` call changed; the value of the
+    collection's ``updated`` event.
+    '''
+    #: Groups that are new, in collection order.
+    added = List(ObjectGroup)
+
+    #: Groups that no longer exist.
+    removed = List(ObjectGroup)
+
+    #: True if the groups that were kept are no longer in the same relative
+    #: order (views should then rebuild rather than apply the change).
+    reordered = Bool(False)
+
+    #: ``(group, added, removed)`` for each kept group whose calibrations
+    #: changed, with the added and removed ObjectNodes.
+    subitems = List()
+
+    #: Kept ObjectNodes whose calibration was replaced because its contents
+    #: (e.g., metadata) changed.
+    changed = List(ObjectNode)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.reordered
+                    or self.subitems or self.changed)
+
+
 class ObjectCollection(Atom):
     '''
     Manages the list of recording/calibration groups
@@ -119,42 +194,164 @@ class ObjectCollection(Atom):
     #: Managers that respond to group/node selections in the tree.
     view_managers = Value()
 
+    #: Maps the ``base_path`` of each loader that provides snapshots to the
+    #: `LoaderSnapshot` the groups were last built from, so views can take
+    #: the folders they show from the same walk.
+    snapshots = Dict()
+
+    #: Fired by `update_groups` (and as each loader reports during `load`)
+    #: with a `CollectionChange`.
     updated = Event()
 
-    def __init__(self, object_manager, view_managers):
+    #: If True, `refresh` rebuilds the groups in the background (`load`).
+    background = Bool(False)
+
+    #: True while `load` is still waiting for some of the loaders.
+    loading = Bool(False)
+
+    #: Schedules ``callable(*args)`` on the GUI thread (see `load`).
+    post = Value()
+
+    #: Incremented by every `load` and `update_groups`, so results of a load
+    #: that has since been superseded are dropped.
+    _generation = Int(0)
+
+    #: ``(snapshot, calibrations)`` reported by each loader during `load`
+    #: (None for the loaders still being walked).
+    _listings = List()
+
+    def __init__(self, object_manager, view_managers, background=False):
         self.object_manager = object_manager
         self.view_managers = view_managers
-        self.update_groups()
+        self.background = background
+        self.refresh()
+
+    def _default_post(self):
+        return deferred_call
+
+    def refresh(self):
+        '''
+        Rebuild the groups from disk: in the background (see `load`) if the
+        collection was created with ``background=True``, otherwise right
+        away (see `update_groups`).
+        '''
+        if self.background:
+            self.load()
+        else:
+            self.update_groups()
+
+    def load(self):
+        '''
+        Build the groups without blocking the GUI thread.
+
+        Each loader is walked in a worker thread of its own, and its groups
+        are merged in (firing ``updated``) as soon as it is done, so a slow
+        loader, e.g. on a network share, doesn't hold up the groups of the
+        others.  `loading` is True until every loader has reported.
+        '''
+        manager = self.object_manager
+        self._generation += 1
+        generation = self._generation
+        self._listings = [None] * len(manager.loaders)
+        self.loading = bool(manager.loaders)
+        for i, loader in enumerate(manager.loaders):
+            future = _scan_pool.submit(manager.list_loader_calibrations,
+                                       loader, True)
+            future.add_done_callback(
+                lambda f, i=i: self.post(self._loader_done, generation, i, f)
+            )
+
+    def _loader_done(self, generation, i, future):
+        if generation != self._generation:
+            return
+        manager = self.object_manager
+        try:
+            self._listings[i] = future.result()
+        except Exception:
+            log.exception('Could not list calibrations of %s',
+                          manager.loaders[i].label)
+            self._listings[i] = None, []
+        complete = None not in self._listings
+        if complete:
+            self.loading = False
+        listings = [(loader, *listing)
+                    for loader, listing in zip(manager.loaders, self._listings)
+                    if listing is not None]
+        self._merge(
+            manager.group_calibrations(listings),
+            [(loader, snapshot) for loader, snapshot, _ in listings],
+            complete,
+        )
 
     def update_groups(self):
         # list_objects_and_calibrations() computes every object's
         # calibrations from one combined disk walk per loader, instead of
         # the one-walk-per-object cost of list_objects() + a
-        # group.update_subitems() loop -- see its docstring.
-        objects_and_cals = sorted(
-            self.object_manager.list_objects_and_calibrations(),
-            key=lambda oc: oc[0],
+        # group.update_subitems() loop -- see its docstring.  Prefetching
+        # reads every calibration's metadata.json in bulk here, rather than
+        # one at a time on the Qt thread as the tree sorts calibrations and
+        # fills in metadata-backed columns.
+        #
+        # Supersedes a `load` that is still running.
+        self._generation += 1
+        self.loading = False
+        manager = self.object_manager
+        snapshots = manager.snapshots()
+        self._merge(
+            manager.list_objects_and_calibrations(prefetch=True,
+                                                  snapshots=snapshots),
+            zip(manager.loaders, snapshots),
         )
+
+    def _merge(self, objects_and_cals, snapshots, complete=True):
+        '''
+        Update the groups to ``objects_and_cals`` and fire ``updated``.
+        ``snapshots`` is ``(loader, snapshot)`` for the loaders they came
+        from.  Unless ``complete``, groups that aren't listed are kept
+        (their loaders haven't reported yet) rather than removed.
+        '''
         # Key by (folder, name) so that the same object name living in two
         # different organizational folders shows up as two distinct groups.
-        existing_groups = {
-            (group.item.folder or '', group.item.name): group
-            for group in self.groups
-        }
+        def key(obj):
+            return (obj.folder or '', obj.name)
+
+        existing_groups = {key(group.item): group for group in self.groups}
         new_groups = []
+        change = CollectionChange()
 
-        for obj, calibrations in objects_and_cals:
-            key = (obj.folder or '', obj.name)
-            if key in existing_groups:
-                group = existing_groups[key]
+        for obj, calibrations in sorted(objects_and_cals, key=lambda oc: oc[0]):
+            if key(obj) in existing_groups:
+                group = existing_groups.pop(key(obj))
                 group.item = obj
-                group.update_subitems(calibrations)
-                new_groups.append(group)
+                added, removed, changed = group.update_subitems(calibrations)
+                if added or removed:
+                    change.subitems.append((group, added, removed))
+                change.changed.extend(changed)
             else:
-                new_groups.append(ObjectGroup(obj, self, calibrations))
+                group = ObjectGroup(obj, self, calibrations)
+                change.added.append(group)
+            new_groups.append(group)
 
+        if complete:
+            change.removed = list(existing_groups.values())
+        else:
+            new_groups = sorted(new_groups + list(existing_groups.values()),
+                                key=lambda group: key(group.item))
+        new_ids = set(id(g) for g in change.added)
+        removed_ids = set(id(g) for g in change.removed)
+        kept = [id(g) for g in new_groups if id(g) not in new_ids]
+        change.reordered = kept != [id(g) for g in self.groups
+                                    if id(g) not in removed_ids]
+        # Likewise keep the snapshots of the loaders that haven't reported.
+        new_snapshots = {} if complete else dict(self.snapshots)
+        new_snapshots.update({
+            loader.base_path: snapshot
+            for loader, snapshot in snapshots
+            if snapshot is not None and snapshot.folders is not None
+        })
+        self.snapshots = new_snapshots
         self.groups = new_groups
-        self.updated = True
+        self.updated = change
 
     def notify(self, node, selected):
         for manager in self.view_managers:
@@ -0,0 +1,371 @@
+'''
+Min/max overviews of long recordings for the time plots.
+
+Handing pyqtgraph every sample of a recording means keeping all of them in
+memory (per selected recording and channel) just to draw a few thousand
+pixels.  An `Overview` is a pyramid of per-bin minimum and maximum values:
+level 0 has one (min, max) pair per `BIN_SIZE` samples and each level above
+it covers `LEVEL_FACTOR` times as many.  The time plots draw the level
+matching the visible range and only read full-resolution samples, through
+slicing, once zoomed in far enough that the view holds fewer than
+`BIN_SIZE` samples per pixel.
+
+Overviews of a recording's signals are built once (reading the signal in
+chunks) and saved next to it by `load_overview`; the views build them in an
+`OverviewWorker` so a recording opened for the first time isn't read on the
+Qt thread, and `OverviewCurves` shows a placeholder meanwhile.
+`region_indices` maps a time range to the sample range to read for it.
+'''
+import logging
+log = logging.getLogger(__name__)
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyqtgraph as pg
+
+from enaml.application import deferred_call
+
+from cftscal.psd_cache import recording_stamp
+
+
+#: Samples per bin at level 0 of the pyramid.
+BIN_SIZE = 256
+
+#: Ratio of the bin size of each level to the one below it.
+LEVEL_FACTOR = 4
+
+#: No level coarser than this many bins is built.
+MIN_BINS = 1024
+
+#: Samples read at once while building an overview (a multiple of
+#: `BIN_SIZE`, so chunks never split a bin).
+CHUNK_SAMPLES = BIN_SIZE * 4096
+
+#: Width, in pixels, assumed for views that aren't laid out yet.
+DEFAULT_WIDTH = 2000
+
+#: Shown in the time plot while overviews are being built.
+PLACEHOLDER = 'Building overview…'
+
+VERSION = 1
+
+
+def _reduce(values, step):
+    '''
+    Per-bin min and max of ``values`` (a ``(2, n)`` min/max array, or a 1D
+    array of samples) in bins of ``step``.
+    '''
+    if values.ndim == 1:
+        values = np.vstack((values, values))
+    bins = np.arange(0, values.shape[-1], step)
+    return np.vstack((
+        np.minimum.reduceat(values[0], bins),
+        np.maximum.reduceat(values[1], bins),
+    ))
+
+
+class Overview:
+    '''
+    Min/max pyramid of a single channel.
+
+    Attributes
+    ----------
+    fs : float
+        Sampling rate of the channel.
+    n_samples : int
+        Length of the channel.
+    levels : list of array
+        ``(2, n_bins)`` array of per-bin minimum and maximum for each
+        level, finest first.
+    samples : array or None
+        Full-resolution samples, for overviews of signals that only exist
+        in memory (see `from_array`).
+    '''
+
+    def __init__(self, fs, n_samples, levels, samples=None):
+        self.fs = fs
+        self.n_samples = n_samples
+        self.levels = levels
+        self.samples = samples
+
+    @classmethod
+    def from_reader(cls, read, n_samples, fs):
+        '''
+        Build the overview of a channel, calling ``read(i0, i1)`` for
+        consecutive chunks of its samples.
+        '''
+        chunks = []
+        for i in range(0, n_samples, CHUNK_SAMPLES):
+            chunk = np.asarray(read(i, min(i + CHUNK_SAMPLES, n_samples)))
+            chunks.append(_reduce(chunk, BIN_SIZE).astype(np.float32))
+        level = np.hstack(chunks) if chunks else np.empty((2, 0), np.float32)
+        levels = [level]
+        while level.shape[-1] > MIN_BINS * LEVEL_FACTOR:
+            level = _reduce(level, LEVEL_FACTOR)
+            levels.append(level)
+        return cls(fs, n_samples, levels)
+
+    @classmethod
+    def from_array(cls, y, fs):
+        '''
+        Build the overview of the in-memory samples ``y`` (kept as
+        `samples`).
+        '''
+        overview = cls.from_reader(lambda i0, i1: y[i0:i1], len(y), fs)
+        overview.samples = y
+        return overview
+
+    @property
+    def nbytes(self):
+        nbytes = sum(level.nbytes for level in self.levels)
+        if self.samples is not None:
+            nbytes += self.samples.nbytes
+        return nbytes
+
+    @property
+    def duration(self):
+        return self.n_samples / self.fs
+
+    def bin_size(self, level):
+        return BIN_SIZE * LEVEL_FACTOR ** level
+
+    def select_level(self, t0, t1, width):
+        '''
+        Coarsest level that still has at least one bin per pixel when
+        ``t0`` to ``t1`` (in seconds) spans ``width`` pixels, or None if
+        full-resolution samples are needed.
+        '''
+        samples_per_pixel = (t1 - t0) * self.fs / max(width, 1)
+        if samples_per_pixel < BIN_SIZE:
+            return None
+        level = int(np.log(samples_per_pixel / BIN_SIZE) // np.log(LEVEL_FACTOR))
+        return min(level, len(self.levels) - 1)
+
+    def envelope(self, level, t0, t1):
+        '''
+        Return ``(x, y)`` tracing the minimum and maximum of each bin of
+        ``level`` between ``t0`` and ``t1`` (plus one bin either side).
+        '''
+        bin_size = self.bin_size(level)
+        minmax = self.levels[level]
+        lb = max(int(t0 * self.fs // bin_size) - 1, 0)
+        ub = min(int(np.ceil(t1 * self.fs / bin_size)) + 1, minmax.shape[-1])
+        t = np.arange(lb, ub) * bin_size / self.fs
+        return np.repeat(t, 2), minmax[:, lb:ub].T.ravel()
+
+    def save(self, filename, stamp):
+        tmp_file = filename.with_name(f'.tmp-{filename.name}')
+        with tmp_file.open('wb') as fh:
+            np.savez(
+                fh, version=VERSION, stamp=stamp, fs=self.fs,
+                n_samples=self.n_samples,
+                **{f'level_{i}': level for i, level in enumerate(self.levels)},
+            )
+        tmp_file.replace(filename)
+
+    @classmethod
+    def load(cls, filename, stamp):
+        '''
+        Return the overview saved in ``filename``, or None if it is missing,
+        unreadable or was saved for a different ``stamp``.
+        '''
+        try:
+            with np.load(filename, allow_pickle=False) as data:
+                if int(data['version']) != VERSION \
+                        or int(data['stamp']) != stamp:
+                    return None
+                n_levels = sum(1 for k in data.files if k.startswith('level_'))
+                levels = [data[f'level_{i}'] for i in range(n_levels)]
+                return cls(float(data['fs']), int(data['n_samples']), levels)
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def _cache_file(path, name):
+    return path / f'{name}.overview.cache.npz'
+
+
+def saved_overview(path, name):
+    '''
+    Return the overview of the signal ``name`` that `load_overview` saved in
+    the recording at ``path``, or None if there is none or the recording
+    has changed since.
+    '''
+    stamp = recording_stamp(path)
+    if stamp is None:
+        return None
+    return Overview.load(_cache_file(path, name), stamp)
+
+
+def load_overview(path, name, signal):
+    '''
+    Return the overview of the first channel of ``signal``, the psidata
+    signal ``name`` in the recording at ``path``.
+
+    Saved as ``<name>.overview.cache.npz`` in ``path`` the first time it is
+    built and rebuilt whenever the recording changes.  Building it reads the
+    whole signal, so the views do that in an `OverviewWorker`.
+    '''
+    cache_file = _cache_file(path, name)
+    stamp = recording_stamp(path)
+    if stamp is not None:
+        overview = Overview.load(cache_file, stamp)
+        if overview is not None:
+            return overview
+    overview = Overview.from_reader(lambda i0, i1: signal[0, i0:i1],
+                                    signal.shape[-1], signal.fs)
+    if stamp is not None:
+        try:
+            overview.save(cache_file, stamp)
+        except OSError:
+            log.warning('Could not save overview of %s in %s', name, path)
+    return overview
+
+
+class OverviewWorker:
+    '''
+    Builds overviews with `load_overview` in a thread pool.
+    '''
+
+    def __init__(self, max_workers=2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = {}
+
+    def cached(self, path, name):
+        '''
+        Return the saved overview of the signal ``name`` in the recording
+        at ``path`` if it is up to date (see `saved_overview`), otherwise
+        None.
+        '''
+        return saved_overview(path, name)
+
+    def submit(self, path, name, signal):
+        '''
+        Load or build the overview of ``signal`` in the pool.  Returns a
+        future for the `Overview`; requests for an overview that is already
+        being built share one future.
+        '''
+        key = (path, name)
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pool.submit(load_overview, path, name, signal)
+            self._pending[key] = future
+            future.add_done_callback(lambda f: self._pending.pop(key, None))
+        return future
+
+
+class OverviewCurves:
+    '''
+    Curves drawn from overviews at the resolution of the current view.
+
+    Each curve pairs a plot with the `Overview` of its signal and a
+    ``read(i0, i1)`` callable returning full-resolution samples.  Call
+    `redraw` whenever the view changes (see `watch`).  Curves whose overview
+    is still being built (see `set_pending`) are left empty, and the view
+    shows `PLACEHOLDER` until there are none.
+    '''
+
+    def __init__(self):
+        self.curves = {}
+        self._redraw_pending = False
+        self._placeholder = None
+
+    def set(self, key, plot, overview, read, transform=None):
+        '''
+        Draw ``plot`` from ``overview``.  ``transform``, if provided, is
+        applied to the samples before plotting (e.g., a calibration's
+        ``get_level``).
+        '''
+        self.curves[key] = plot, overview, read, transform
+
+    def set_pending(self, key, plot):
+        '''
+        Clear ``plot`` until its overview is ready (and `set`).
+        '''
+        self.curves[key] = plot, None, None, None
+
+    def is_pending(self, key):
+        return key in self.curves and self.curves[key][1] is None
+
+    def remove(self, key):
+        self.curves.pop(key, None)
+
+    def _show_placeholder(self, vb, show):
+        if self._placeholder is None:
+            if not show:
+                return
+            self._placeholder = pg.TextItem(PLACEHOLDER, color='k',
+                                            anchor=(0.5, 0.5))
+            vb.addItem(self._placeholder, ignoreBounds=True)
+        self._placeholder.setVisible(show)
+        if show:
+            (t0, t1), (y0, y1) = vb.viewRange()
+            self._placeholder.setPos((t0 + t1) / 2, (y0 + y1) / 2)
+
+    def redraw(self, vb):
+        '''
+        Redraw every curve for the visible range of the ViewBox ``vb``, or
+        the full duration while it's autoranging.
+        '''
+        self._redraw_pending = False
+        self._show_placeholder(
+            vb, any(o is None for _, o, _, _ in self.curves.values())
+        )
+        ready = [c for c in self.curves.values() if c[1] is not None]
+        for plot, overview, _, _ in self.curves.values():
+            if overview is None:
+                plot.setData([], [])
+        if not ready:
+            return
+        (t0, t1), _ = vb.viewRange()
+        if vb.autoRangeEnabled()[0]:
+            t0 = 0
+            t1 = max(o.duration for _, o, _, _ in ready)
+        width = vb.width() or DEFAULT_WIDTH
+        for plot, overview, read, transform in ready:
+            x, y = view_data(overview, read, t0, t1, width)
+            if transform is not None:
+                y = transform(y)
+            plot.setData(x, y)
+
+    def watch(self, vb):
+        '''
+        Redraw whenever the x-range of ``vb`` changes.  Redraws are
+        deferred so a burst of range changes costs one redraw.
+        '''
+        def schedule(*args):
+            if not self._redraw_pending:
+                self._redraw_pending = True
+                deferred_call(self.redraw, vb)
+        vb.sigXRangeChanged.connect(schedule)
+        vb.sigResized.connect(schedule)
+
+
+def region_indices(t0, t1, fs, n_samples):
+    '''
+    Return ``(i0, i1)`` such that samples ``i0:i1`` of a signal sampled at
+    ``fs`` are those with ``t0 <= t < t1`` (clipped to the ``n_samples``
+    available).
+    '''
+    i0 = min(max(int(np.ceil(t0 * fs)), 0), n_samples)
+    i1 = min(max(int(np.ceil(t1 * fs)), i0), n_samples)
+    return i0, i1
+
+
+def view_data(overview, read, t0, t1, width):
+    '''
+    Return ``(x, y)`` to plot the signal between ``t0`` and ``t1`` (in
+    seconds) across ``width`` pixels: the matching overview level, or
+    full-resolution samples from ``read(i0, i1)`` when zoomed in.
+    '''
+    level = overview.select_level(t0, t1, width)
+    if level is not None:
+        return overview.envelope(level, t0, t1)
+    # Read half a view either side so small pans don't need a new read.
+    span = t1 - t0
+    i0 = max(int((t0 - span / 2) * overview.fs), 0)
+    i1 = min(int(np.ceil((t1 + span / 2) * overview.fs)), overview.n_samples)
+    if i1 <= i0:
+        return np.empty(0), np.empty(0)
+    return np.arange(i0, i1) / overview.fs, np.asarray(read(i0, i1))
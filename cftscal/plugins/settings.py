@@ -4,6 +4,7 @@ import os
 from pathlib import Path
 import shutil
 import subprocess
+import tempfile
 
 from atom.api import set_default, Atom, Enum, Float, List, Str, Typed
 
@@ -15,9 +16,15 @@ from cftscal.objects import (
     generic_microphone_manager, input_amplifier_manager, input_manager,
     inear_manager, measurement_microphone_manager, output_manager,
     speaker_manager, starship_manager, unity_manager, CalibrationManager,
-    NominalInputCalibration, UnityInputCalibration,
+    NominalInputCalibration, UnityInputCalibration, invalidate_loaders,
 )
 
+from cftscal.calibration_artifact import (
+    ARTIFACT_ENV, ARTIFACT_FILENAME, compile_calibrations,
+    write_calibration_artifact,
+)
+from cftscal.calibration_summary import compute_summary
+from cftscal.object_manifest import update_object_manifest
 from cftscal.plugins.workspace import WorkspaceSettings
 
 
@@ -183,6 +190,23 @@ class CalibrationSettings(Atom):
         settings = WorkspaceSettings()
         if env is None:
             env = {}
+
+        # Load every calibration the experiment will need here, once, and
+        # hand the curves over in a file rather than having psi-main
+        # rebuild each one from its data files (see
+        # cftscal.calibration_artifact).
+        artifact = None
+        calibrations = compile_calibrations(env)
+        if calibrations:
+            fd, artifact = tempfile.mkstemp(suffix='.npz')
+            os.close(fd)
+            artifact = Path(artifact)
+            try:
+                write_calibration_artifact(artifact, calibrations)
+            except BaseException:
+                artifact.unlink(missing_ok=True)
+                raise
+            env = {**env, ARTIFACT_ENV: str(artifact)}
         env = {**os.environ, **env}
 
         # Substitute {date_time} ourselves so the directory name is known
@@ -263,9 +287,39 @@ class CalibrationSettings(Atom):
                         'datetime': now.isoformat(),
                         **metadata,
                     }
+                    # Precompute the values the tree shows from the data
+                    # files just written, so rendering the tree doesn't
+                    # have to read them (see cftscal.calibration_summary).
+                    summary = compute_summary(filename)
+                    if summary:
+                        meta['summary'] = summary
                     meta_file.write_text(
                         json.dumps(meta, indent=2, sort_keys=True)
                     )
+                if filename.exists() and artifact is not None:
+                    # Keep a record of exactly which curves the run used.
+                    try:
+                        shutil.move(artifact, filename / ARTIFACT_FILENAME)
+                        artifact = None
+                    except OSError:
+                        pass
+                if filename.exists():
+                    # Record the kept calibration in its object's manifest.
+                    # The manifest is only a cache (readers fall back to
+                    # the sidecar), so failing to update it mustn't mask
+                    # the run's own outcome.
+                    try:
+                        update_object_manifest(
+                            filename.parent, add=[filename.name],
+                        )
+                    except OSError:
+                        pass
+            if artifact is not None:
+                artifact.unlink(missing_ok=True)
+            # Whether the run was kept or pruned, the object directory just
+            # changed -- make sure the new (or removed) calibration shows up
+            # on the loaders' next walk.
+            invalidate_loaders(filename)
 
 
 class GeneratorSettings(PersistentSettings):
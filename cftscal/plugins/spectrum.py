@@ -0,0 +1,91 @@
+'''
+PSD estimators for the region analysis of the TimePSD views.
+
+'FFT' is a single FFT over the whole region (`psiaudio.util.psd_df`): full
+resolution, but slow and noisy for long regions.  'Welch' averages the power
+of overlapping, windowed segments, processed a block of segments at a time
+so memory stays proportional to the block rather than to the region.  Both
+return the level of each frequency bin in the same (RMS) units, so a tone
+reads the same either way.
+'''
+import numpy as np
+import pandas as pd
+from scipy import signal
+
+from psiaudio import util
+
+
+PSD_METHODS = ('FFT', 'Welch')
+
+WELCH_WINDOWS = ('hann', 'hamming', 'blackman', 'boxcar')
+
+#: Segments transformed at once by `welch_psd`.
+SEGMENT_BLOCK = 64
+
+#: Largest overlap the views offer for 'Welch'.  `welch_psd` accepts up to
+#: (but not including) 1, but near 1 the segments advance by only a few
+#: samples and a long region becomes a huge number of them.
+MAX_WELCH_OVERLAP = 0.95
+
+
+def welch_psd(y, fs, nperseg, overlap=0.5, window='hann'):
+    '''
+    Welch estimate of the spectrum of ``y``, in the units of
+    `psiaudio.util.psd`.
+
+    Parameters
+    ----------
+    y : array
+        Signal, with time along the last axis.  A 2D array is processed as
+        one row per channel, all in one pass.
+    fs : float
+        Sampling rate, in Hz.
+    nperseg : int
+        Segment length, in samples.  Regions shorter than one segment are
+        treated as a single segment.
+    overlap : float
+        Fraction of each segment shared with the next one (0 to <1).
+        Raises ValueError otherwise.
+    window : str
+        Window applied to each segment (see `scipy.signal.get_window`).
+
+    Returns
+    -------
+    psd : {pd.Series, pd.DataFrame}
+        As returned by `psiaudio.util.psd_df`: indexed by frequency for a
+        1D ``y``, or one row per channel with frequency columns.
+    '''
+    if not 0 <= overlap < 1:
+        raise ValueError(f'Welch overlap must be in [0, 1), not {overlap}')
+    y = np.asarray(y)
+    nperseg = int(min(max(nperseg, 1), y.shape[-1]))
+    step = max(int(round(nperseg * (1 - overlap))), 1)
+    segments = np.lib.stride_tricks.sliding_window_view(y, nperseg, axis=-1)
+    segments = segments[..., ::step, :]
+    n_segments = segments.shape[-2]
+
+    w = signal.get_window(window, nperseg)
+    w = w / w.mean()
+    scale = 2 / nperseg / np.sqrt(2)
+    power = 0
+    for i in range(0, n_segments, SEGMENT_BLOCK):
+        block = signal.detrend(segments[..., i:i + SEGMENT_BLOCK, :],
+                               type='linear', axis=-1)
+        spectrum = np.fft.rfft(block * w, axis=-1) * scale
+        power = power + (np.abs(spectrum) ** 2).sum(axis=-2)
+    psd = np.sqrt(power / n_segments)
+
+    freqs = pd.Index(np.fft.rfftfreq(nperseg, 1 / fs), name='frequency')
+    if psd.ndim == 1:
+        return pd.Series(psd, index=freqs, name='psd')
+    return pd.DataFrame(psd, columns=freqs)
+
+
+def region_psd(y, fs, method='FFT', nperseg=4096, overlap=0.5, window='hann'):
+    '''
+    Spectrum of ``y`` with the estimator ``method`` (one of `PSD_METHODS`;
+    the remaining arguments only apply to 'Welch', see `welch_psd`).
+    '''
+    if method == 'Welch':
+        return welch_psd(y, fs, nperseg, overlap, window)
+    return util.psd_df(np.asarray(y), fs=fs)
@@ -0,0 +1,429 @@
+'''
+Item model behind the calibration trees.
+
+Building one ``QTreeWidgetItem`` per calibration (with every column filled
+in) on each refresh stalled the UI for seconds on trees with thousands of
+calibrations.  `CalibrationTreeModel` only creates nodes for folders and
+object groups up front.  A group's calibrations are added when the view
+first asks for them (``canFetchMore``/``fetchMore``, i.e., when the group
+is expanded), and column text is computed in ``data()``, so only for rows
+that are actually drawn.
+
+Refreshes go through `CalibrationTreeModel.apply`, which inserts and
+removes only the rows named by the collection's `CollectionChange`, so
+expansion state, scroll position and the selection survive them.
+'''
+from qtpy.QtCore import QAbstractItemModel, QModelIndex, Qt
+from qtpy.QtGui import QBrush
+
+from psi.core.enaml.api import make_color
+
+
+FOLDER = 'folder'
+GROUP = 'group'
+LEAF = 'leaf'
+
+
+def _check_state(selected):
+    return Qt.Checked if selected else Qt.Unchecked
+
+
+def _is_checked(value):
+    # PyQt6 hands setData a plain int rather than the enum.
+    return getattr(value, 'value', value) == getattr(Qt.Checked, 'value', Qt.Checked)
+
+
+class TreeNode:
+    '''
+    A row of the tree.
+
+    ``data`` is the ObjectGroup (`GROUP`) or ObjectNode (`LEAF`) the row
+    shows, or None for an organizational folder (`FOLDER`), whose posix
+    path relative to the calibration root is ``path``.
+    '''
+    __slots__ = ('kind', 'parent', 'text', 'data', 'path', 'children',
+                 'fetched', 'columns', '_row')
+
+    def __init__(self, kind, parent, text, data=None, path=''):
+        self.kind = kind
+        self.parent = parent
+        self._row = 0
+        self.text = text
+        self.data = data
+        self.path = path
+        self.children = []
+        # Folders are built with their children; groups fetch theirs lazily.
+        self.fetched = kind != GROUP
+        # Column text, computed on first display.
+        self.columns = None
+
+    def row(self):
+        return self._row
+
+    def append(self, child):
+        child._row = len(self.children)
+        self.children.append(child)
+        return child
+
+
+class CalibrationTreeModel(QAbstractItemModel):
+    '''
+    Folders, object groups and calibrations of an ObjectCollection.
+
+    Parameters
+    ----------
+    mapping : dict
+        Column definitions (see ``CalibratedObjects.mapping``).
+    enable_current : bool
+        Mark the pinned calibration of each object with a star.
+    '''
+
+    def __init__(self, mapping, enable_current=False, parent=None):
+        super().__init__(parent)
+        self.mapping = mapping
+        self.enable_current = enable_current
+        self.group_attrs = [k for k, v in mapping.items() if v.get('groupby', False)]
+        self.id_attrs = [k for k, v in mapping.items() if v.get('id', False)]
+        self.attrs = [k for k in mapping.keys() if k not in self.id_attrs]
+        self.root = TreeNode(FOLDER, None, '')
+        #: Maps id() of each ObjectGroup/ObjectNode shown to its TreeNode.
+        self._nodes = {}
+
+    ############################################################################
+    # Population
+    ############################################################################
+    def group_text(self, group):
+        return ' '.join(self.mapping[a]['to_str'](group.item)
+                        for a in self.group_attrs)
+
+    @staticmethod
+    def _folder_paths(groups, folders):
+        '''
+        Every folder needed to show ``groups`` and ``folders``, sorted so
+        parents come before their children.
+        '''
+        paths = set(folders)
+        for group in groups:
+            path = getattr(group.item, 'folder', None) or ''
+            while path:
+                paths.add(path)
+                path = path.rpartition('/')[0]
+        return sorted(paths)
+
+    def _group_node(self, parent, group):
+        node = TreeNode(GROUP, parent, self.group_text(group), group)
+        node.fetched = not group.subitems
+        return node
+
+    def _leaf_text(self, sub, pinned):
+        text = sub.item.filename.name
+        if pinned is not None and sub.item.filename == pinned.filename:
+            text = f'{text} ★'
+        return text
+
+    def _pinned(self, group):
+        if not self.enable_current:
+            return None
+        return group.get_pinned_calibration()
+
+    def populate(self, groups, folders=()):
+        '''
+        Replace the contents of the tree with ``groups`` (ObjectGroups),
+        filed under their folders, plus the (possibly empty) organizational
+        ``folders`` (posix paths).  Calibrations are not added until needed.
+        '''
+        self.beginResetModel()
+        self._unobserve_all()
+        self.root = TreeNode(FOLDER, None, '')
+        folder_nodes = {'': self.root}
+        # Folders come first within each parent, as in the file browser.
+        for path in self._folder_paths(groups, folders):
+            parent_path, _, name = path.rpartition('/')
+            parent = folder_nodes[parent_path]
+            folder_nodes[path] = parent.append(
+                TreeNode(FOLDER, parent, name, path=path)
+            )
+        for group in groups:
+            parent = folder_nodes[getattr(group.item, 'folder', None) or '']
+            self._observe(parent.append(self._group_node(parent, group)))
+        self.endResetModel()
+
+    def _fetch(self, node):
+        pinned = self._pinned(node.data)
+        for sub in node.data.subitems:
+            text = self._leaf_text(sub, pinned)
+            self._observe(node.append(TreeNode(LEAF, node, text, sub)))
+        node.fetched = True
+
+    ############################################################################
+    # Incremental updates
+    ############################################################################
+    def apply(self, change, groups, folders=()):
+        '''
+        Bring the tree in line with ``groups`` and ``folders`` (as for
+        `populate`) after the collection reported ``change`` (a
+        `CollectionChange` that isn't ``reordered``), touching only the rows
+        that changed.
+
+        Returns
+        -------
+        list of TreeNode
+            The folder nodes that were added.
+        '''
+        for group in change.removed:
+            node = self._nodes.get(id(group))
+            if node is not None:
+                self._remove(node)
+        for group, added, removed in change.subitems:
+            node = self._nodes.get(id(group))
+            if node is not None and node.fetched:
+                self._update_leaves(node, added, removed)
+        # Calibrations whose metadata changed (see update_subitems).
+        for sub in change.changed:
+            node = self._nodes.get(id(sub))
+            if node is not None and node.columns is not None:
+                self._clear_columns(node)
+
+        # Folders that are gone from disk (and now empty in the tree),
+        # deepest first, then the new ones.
+        paths = self._folder_paths(groups, folders)
+        wanted = set(paths)
+        for node in reversed(list(self._iter_folders())):
+            if node.path not in wanted and not node.children:
+                self._remove(node)
+        folder_nodes = {node.path: node for node in self._iter_folders()}
+        folder_nodes[''] = self.root
+        new_folders = []
+        for path in paths:
+            if path in folder_nodes:
+                continue
+            parent_path, _, name = path.rpartition('/')
+            parent = folder_nodes[parent_path]
+            node = TreeNode(FOLDER, parent, name, path=path)
+            position = next((i for i, c in enumerate(parent.children)
+                             if c.kind != FOLDER or c.text > name),
+                            len(parent.children))
+            self._insert(parent, node, position)
+            folder_nodes[path] = node
+            new_folders.append(node)
+
+        rank = {id(group): i for i, group in enumerate(groups)}
+        for group in change.added:
+            parent = folder_nodes[getattr(group.item, 'folder', None) or '']
+            position = next((i for i, c in enumerate(parent.children)
+                             if c.kind == GROUP
+                             and rank[id(c.data)] > rank[id(group)]),
+                            len(parent.children))
+            node = self._group_node(parent, group)
+            self._insert(parent, node, position)
+            self._observe(node)
+
+        # The pinned calibration may have changed for any group, but only
+        # groups whose calibrations are shown need checking.
+        for node in list(self._nodes.values()):
+            if node.kind == GROUP and node.children:
+                self._update_pins(node)
+        return new_folders
+
+    def _update_leaves(self, node, added, removed):
+        removed = set(id(sub) for sub in removed)
+        for leaf in [c for c in node.children if id(c.data) in removed]:
+            self._remove(leaf)
+        added = set(id(sub) for sub in added)
+        for i, sub in enumerate(node.data.subitems):
+            if id(sub) in added:
+                leaf = TreeNode(LEAF, node, self._leaf_text(sub, None), sub)
+                self._insert(node, leaf, i)
+                self._observe(leaf)
+
+    def _update_pins(self, node):
+        pinned = self._pinned(node.data)
+        for leaf in node.children:
+            text = self._leaf_text(leaf.data, pinned)
+            if text != leaf.text:
+                leaf.text = text
+                index = self.index_for(leaf)
+                self.dataChanged.emit(index, index)
+
+    def _clear_columns(self, node):
+        node.columns = None
+        row = node.row()
+        self.dataChanged.emit(
+            self.createIndex(row, 0, node),
+            self.createIndex(row, self.columnCount() - 1, node),
+        )
+
+    def _insert(self, parent, node, position):
+        self.beginInsertRows(self.index_for(parent), position, position)
+        parent.children.insert(position, node)
+        self._renumber(parent, position)
+        self.endInsertRows()
+
+    def _remove(self, node):
+        parent = node.parent
+        row = node.row()
+        self.beginRemoveRows(self.index_for(parent), row, row)
+        del parent.children[row]
+        self._renumber(parent, row)
+        self.endRemoveRows()
+        for n in (node, *self.iter_nodes(node)):
+            if n.data is not None:
+                self._unobserve(n)
+
+    @staticmethod
+    def _renumber(parent, start):
+        for i in range(start, len(parent.children)):
+            parent.children[i]._row = i
+
+    ############################################################################
+    # Model -> view updates
+    ############################################################################
+    def _observe(self, node):
+        self._nodes[id(node.data)] = node
+        node.data.observe('selected', self._on_changed)
+        node.data.observe('color', self._on_changed)
+
+    def _unobserve(self, node):
+        del self._nodes[id(node.data)]
+        node.data.unobserve('selected', self._on_changed)
+        node.data.unobserve('color', self._on_changed)
+
+    def _unobserve_all(self):
+        for node in list(self._nodes.values()):
+            self._unobserve(node)
+
+    def _on_changed(self, change):
+        node = self._nodes.get(id(change['object']))
+        if node is None:
+            return
+        row = node.row()
+        self.dataChanged.emit(
+            self.createIndex(row, 0, node),
+            self.createIndex(row, self.columnCount() - 1, node),
+        )
+
+    ############################################################################
+    # Lookups
+    ############################################################################
+    def node(self, index):
+        if not index.isValid():
+            return self.root
+        return index.internalPointer()
+
+    def index_for(self, node, column=0):
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row(), column, node)
+
+    def iter_nodes(self, node=None):
+        '''
+        Every node that has been created so far, depth first.
+        '''
+        node = self.root if node is None else node
+        for child in node.children:
+            yield child
+            yield from self.iter_nodes(child)
+
+    def _iter_folders(self, node=None):
+        node = self.root if node is None else node
+        for child in node.children:
+            if child.kind == FOLDER:
+                yield child
+                yield from self._iter_folders(child)
+
+    ############################################################################
+    # QAbstractItemModel interface
+    ############################################################################
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node(parent)
+        if 0 <= row < len(node.children) and 0 <= column < self.columnCount():
+            return self.createIndex(row, column, node.children[row])
+        return QModelIndex()
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        return self.index_for(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return len(self.node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.attrs) + 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self.node(parent)
+        if node.kind == GROUP and not node.fetched:
+            return True
+        return bool(node.children)
+
+    def canFetchMore(self, parent):
+        node = self.node(parent)
+        return node.kind == GROUP and not node.fetched
+
+    def fetchMore(self, parent):
+        node = self.node(parent)
+        if node.kind != GROUP or node.fetched:
+            return
+        n = len(node.data.subitems)
+        self.beginInsertRows(parent, 0, n - 1)
+        self._fetch(node)
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return ([''] + self.attrs)[section]
+        return None
+
+    def _column_text(self, node, column):
+        if column == 0:
+            return node.text
+        if node.kind != LEAF:
+            return ''
+        if node.columns is None:
+            texts = []
+            for attr in self.attrs:
+                try:
+                    texts.append(self.mapping[attr]['to_str'](node.data.item))
+                except Exception:
+                    texts.append('⚠')
+            node.columns = texts
+        return node.columns[column - 1]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return self._column_text(node, index.column())
+        if node.kind == FOLDER:
+            return None
+        if role == Qt.CheckStateRole and index.column() == 0:
+            return _check_state(node.data.selected)
+        if role == Qt.BackgroundRole and node.data.color:
+            return QBrush(make_color(node.data.color))
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        node = self.node(index)
+        if role != Qt.CheckStateRole or node.kind == FOLDER:
+            return False
+        node.data.selected = _is_checked(value)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            # Dropping on empty space files a calibration at the root.
+            return Qt.ItemIsDropEnabled
+        node = index.internalPointer()
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        # Folders and groups accept drops (a calibration dropped there is
+        # moved into them); only calibrations can be dragged.
+        if node.kind == FOLDER:
+            return flags | Qt.ItemIsDropEnabled
+        flags |= Qt.ItemIsUserCheckable
+        if node.kind == GROUP:
+            return flags | Qt.ItemIsDropEnabled
+        return flags | Qt.ItemIsDragEnabled
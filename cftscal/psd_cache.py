@@ -0,0 +1,101 @@
+'''
+Sidecar cache for the average PSD of an in-ear calibration recording.
+
+Averaging the raw epochs of an in-ear recording into its PSD (level x
+frequency) means reading the whole recording, and the in-ear views need it
+for every calibration they show -- the delta view for every calibration in
+an object's history.  `read_average_psd` saves the result in an ``.npz``
+next to the recording the first time it is computed and reuses it as long
+as the recording is unchanged (see `recording_stamp`).  A failure to write
+the sidecar (e.g. on a read-only share) only means recomputing next time.
+'''
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+PSD_CACHE_FILENAME = 'average_psd.cache.npz'
+
+VERSION = 1
+
+#: Files in a calibration directory that aren't part of the recording, so
+#: rewriting them must not invalidate the cache.
+_NOT_RECORDING = ('metadata.json',)
+
+
+def recording_stamp(cal_dir):
+    '''
+    Return the newest mtime (in ns) among the recording's files in
+    ``cal_dir``, or None if the directory can't be listed.
+    '''
+    try:
+        with os.scandir(cal_dir) as it:
+            return max((
+                entry.stat().st_mtime_ns for entry in it
+                if entry.name not in _NOT_RECORDING
+                and not entry.name.endswith('.cache.npz')
+            ), default=0)
+    except OSError:
+        return None
+
+
+def _load(cache_file, stamp):
+    try:
+        with np.load(cache_file, allow_pickle=False) as data:
+            if int(data['version']) != VERSION or int(data['stamp']) != stamp:
+                return None
+            names = [n or None for n in data['index_names']]
+            levels = [data[f'index_{i}'] for i in range(len(names))]
+            if len(levels) == 1:
+                index = pd.Index(levels[0], name=names[0])
+            else:
+                index = pd.MultiIndex.from_arrays(levels, names=names)
+            columns = pd.Index(data['columns'],
+                               name=str(data['columns_name']) or None)
+            return pd.DataFrame(data['values'], index=index, columns=columns)
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _save(cache_file, stamp, psd):
+    index = psd.index.to_frame(index=False)
+    # Keeps the .cache.npz suffix so recording_stamp ignores it too.
+    tmp_file = cache_file.with_name(f'.tmp-{cache_file.name}')
+    with tmp_file.open('wb') as fh:
+        np.savez(
+            fh,
+            version=VERSION,
+            stamp=stamp,
+            values=psd.to_numpy(),
+            columns=psd.columns.to_numpy(),
+            columns_name=np.array(psd.columns.name or ''),
+            index_names=np.array([n or '' for n in psd.index.names]),
+            **{f'index_{i}': index.iloc[:, i].to_numpy()
+               for i in range(index.shape[1])},
+        )
+    os.replace(tmp_file, cache_file)
+
+
+def read_average_psd(cal_dir, compute, stamp=None):
+    '''
+    Return the average PSD of the recording in ``cal_dir`` from its sidecar,
+    or by calling ``compute()`` (and saving the result) if the sidecar is
+    missing or out of date.  ``stamp`` is `recording_stamp(cal_dir)`, if
+    the caller already has it.
+    '''
+    if stamp is None:
+        stamp = recording_stamp(cal_dir)
+    cache_file = Path(cal_dir) / PSD_CACHE_FILENAME
+    if stamp is not None:
+        psd = _load(cache_file, stamp)
+        if psd is not None:
+            return psd
+    psd = compute()
+    if stamp is not None:
+        try:
+            _save(cache_file, stamp, psd)
+        except OSError:
+            pass
+    return psd
@@ -0,0 +1,95 @@
+'''
+Binary cache for the sensitivity tables (``golay_sens.csv``,
+``chirp_sens.csv``) saved with each calibration.
+
+Those CSVs are long-format tables with many columns, but loading a
+calibration only ever needs the index columns (stimulus level, frequency)
+and one value column.  Parsing the whole text file each time dominates the
+cost of loading or plotting a calibration, so `read_sens_csv` keeps just
+those columns in an ``.npz`` file next to the CSV and reads that instead
+whenever it is still in step with the CSV (same mtime and size).
+
+The CSV remains the source of truth; the cache is rewritten whenever it is
+missing, stale or unreadable, and failing to write it (e.g. on a read-only
+share) simply means the CSV is parsed every time, as it used to be.
+'''
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+#: Value columns kept in the cache, whichever of them the CSV has.
+SENS_COLUMNS = ('sens', 'norm_spl')
+
+VERSION = 1
+
+
+def _cache_file(csv_file):
+    return csv_file.with_name(f'{csv_file.stem}.cache.npz')
+
+
+def _load(cache_file, stat, index_col):
+    try:
+        with np.load(cache_file, allow_pickle=False) as data:
+            if int(data['version']) != VERSION \
+                    or int(data['csv_mtime_ns']) != stat.st_mtime_ns \
+                    or int(data['csv_size']) != stat.st_size \
+                    or list(data['index_col']) != index_col:
+                return None
+            columns = {c: data[c] for c in data['columns']}
+    except (OSError, KeyError, ValueError):
+        return None
+    return pd.DataFrame(columns).set_index(index_col)
+
+
+def _save(cache_file, stat, index_col, df):
+    flat = df.reset_index()
+    columns = list(flat.columns)
+    tmp_file = cache_file.with_name(f'{cache_file.name}.tmp')
+    with tmp_file.open('wb') as fh:
+        np.savez(
+            fh,
+            version=VERSION,
+            csv_mtime_ns=stat.st_mtime_ns,
+            csv_size=stat.st_size,
+            index_col=np.array(index_col),
+            columns=np.array(columns),
+            **{c: flat[c].to_numpy() for c in columns},
+        )
+    os.replace(tmp_file, cache_file)
+
+
+def read_sens_csv(csv_file, index_col):
+    '''
+    Read a sensitivity table the way ``pd.read_csv(csv_file,
+    index_col=index_col)`` would, keeping only the `SENS_COLUMNS` it has.
+
+    Parameters
+    ----------
+    csv_file : Path
+        The ``*_sens.csv`` file.
+    index_col : list of str
+        Columns to index the result by, ending with ``'frequency'``.
+
+    Returns
+    -------
+    DataFrame
+    '''
+    csv_file = Path(csv_file)
+    index_col = list(index_col)
+    stat = csv_file.stat()
+    cache_file = _cache_file(csv_file)
+    df = _load(cache_file, stat, index_col)
+    if df is not None:
+        return df
+    df = pd.read_csv(
+        csv_file, index_col=index_col,
+        usecols=lambda c: c in index_col or c in SENS_COLUMNS,
+    )
+    try:
+        _save(cache_file, stat, index_col, df)
+    except OSError:
+        pass
+    return df
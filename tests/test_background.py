@@ -0,0 +1,87 @@
+'''
+Tests for :mod:`cftscal.plugins.background` -- background jobs where only
+the latest request counts.
+'''
+import threading
+
+from cftscal.plugins.background import LatestOnlyExecutor
+
+
+class _Posted:
+    '''Collects what the executor posts to the GUI thread.'''
+
+    def __init__(self):
+        self.calls = []
+        self.event = threading.Event()
+
+    def __call__(self, fn, *args):
+        self.calls.append((fn, args))
+        self.event.set()
+
+    def run(self):
+        calls, self.calls = self.calls, []
+        self.event.clear()
+        for fn, args in calls:
+            fn(*args)
+
+    def run_until(self, condition, timeout=1):
+        # Done-callbacks may post just after future.result() returns.
+        while not condition():
+            assert self.event.wait(timeout)
+            self.run()
+
+
+class TestLatestOnlyExecutor:
+
+    def test_delivers_result(self):
+        posted = _Posted()
+        executor = LatestOnlyExecutor(post=posted)
+        results = []
+        executor.submit(lambda cancelled: 42, results.append)
+        posted.run_until(lambda: results)
+        assert results == [42]
+
+    def test_superseded_job_is_stopped_and_dropped(self):
+        posted = _Posted()
+        executor = LatestOnlyExecutor(post=posted)
+        started, release = threading.Event(), threading.Event()
+        seen = []
+
+        def slow(cancelled):
+            started.set()
+            release.wait(1)
+            seen.append(cancelled())
+            return 'stale'
+
+        results = []
+        first = executor.submit(slow, results.append)
+        started.wait(1)
+        queued = executor.submit(lambda cancelled: 'queued', results.append)
+        last = executor.submit(lambda cancelled: 'latest', results.append)
+        release.set()
+        first.result()
+        posted.run_until(lambda: results)
+        assert queued.cancelled()
+        assert seen == [True]
+        assert results == ['latest']
+
+    def test_cancel_drops_result(self):
+        posted = _Posted()
+        executor = LatestOnlyExecutor(post=posted)
+        results = []
+        future = executor.submit(lambda cancelled: 1, results.append)
+        executor.cancel()
+        if not future.cancelled():
+            future.result()
+        posted.run()
+        assert results == []
+
+    def test_failed_job_is_logged(self, caplog):
+        posted = _Posted()
+        executor = LatestOnlyExecutor(post=posted)
+        results = []
+        future = executor.submit(lambda cancelled: 1 / 0, results.append)
+        posted.run_until(lambda: future.done() and not posted.calls
+                         and executor._future is None)
+        assert results == []
+        assert 'Background job failed' in caplog.text
@@ -0,0 +1,147 @@
+'''
+Tests for :mod:`cftscal.calibration_artifact` -- calibrations resolved by
+the launcher and handed to the ``psi-main`` child in one file.
+'''
+import numpy as np
+import pytest
+from psiaudio.calibration import FlatCalibration, InterpCalibration
+
+from cftscal import calibration_artifact
+from cftscal.calibration_artifact import (
+    ARTIFACT_ENV, compile_calibrations, load_calibration,
+    read_calibration_artifact, write_calibration_artifact,
+)
+from cftscal.objects import (
+    CFTSSpeakerCalibration, NominalInputCalibration, UnityInputCalibration,
+    speaker_manager,
+)
+
+
+def _make_speaker_cal(tmp_path):
+    cal_dir = tmp_path / 'SPK0' / '20260701-123456'
+    cal_dir.mkdir(parents=True)
+    (cal_dir / 'golay_sens.csv').write_text(
+        'n_bits,output_gain,frequency,sens\n'
+        '14,0.0,1000.0,1.0\n'
+        '14,0.0,2000.0,2.0\n'
+    )
+    return CFTSSpeakerCalibration('SPK0', cal_dir)
+
+
+class TestCompileCalibrations:
+
+    def test_picks_calibration_strings_out_of_env(self, tmp_path):
+        speaker = _make_speaker_cal(tmp_path)
+        env = {
+            'CFTS_OUTPUT': 'ao0',
+            'CFTS_OUTPUT_AO0': speaker.to_string(),
+            'CFTS_INPUT_AI0_GAIN': '40.0',
+            'CFTS_INPUT_AI1': NominalInputCalibration(2.0).to_string(),
+            'CFTS_INPUT_AI2': UnityInputCalibration().to_string(),
+        }
+        compiled = compile_calibrations(env)
+        assert set(compiled) == {
+            speaker.to_string(),
+            NominalInputCalibration(2.0).to_string(),
+            UnityInputCalibration().to_string(),
+        }
+        assert isinstance(compiled[speaker.to_string()], InterpCalibration)
+
+    def test_unloadable_calibration_is_left_out(self, tmp_path):
+        missing = CFTSSpeakerCalibration('SPK0', tmp_path / 'missing')
+        assert compile_calibrations({'X': missing.to_string()}) == {}
+
+    def test_leaves_out_what_the_artifact_cannot_store(self, tmp_path,
+                                                       monkeypatch):
+        speaker = _make_speaker_cal(tmp_path)
+        loaded = speaker.load()
+        loaded.attrs['n_bits'] = np.int64(14)
+        monkeypatch.setattr(CFTSSpeakerCalibration, 'load',
+                            lambda self: loaded)
+        assert compile_calibrations({'X': speaker.to_string()}) == {}
+
+    def test_ignores_foreign_qualnames(self):
+        assert compile_calibrations({'X': 'os.path::join'}) == {}
+
+
+class TestCalibrationArtifact:
+
+    def test_round_trip(self, tmp_path):
+        interp = InterpCalibration(
+            [1000, 2000], [1.0, 2.0], phase=[0.1, 0.2],
+            attrs={'name': 'SPK0', 'n_bits': 14},
+        )
+        flat = FlatCalibration.from_mv_pa(2.0, attrs={'name': 'MMM0'})
+        artifact = tmp_path / 'calibrations.npz'
+        write_calibration_artifact(artifact, {'a': interp, 'b': flat})
+        loaded = read_calibration_artifact(artifact)
+
+        np.testing.assert_array_equal(loaded['a'].frequency, interp.frequency)
+        np.testing.assert_array_equal(loaded['a'].phase, interp.phase)
+        assert loaded['a'].attrs == interp.attrs
+        assert loaded['a'].get_sens(1500) == interp.get_sens(1500)
+        assert loaded['b'].reference == 'SPL'
+        assert loaded['b'].get_spl(1000, 1) == flat.get_spl(1000, 1)
+
+    def test_load_calibration_prefers_artifact(self, tmp_path, monkeypatch):
+        speaker = _make_speaker_cal(tmp_path)
+        artifact = tmp_path / 'calibrations.npz'
+        write_calibration_artifact(
+            artifact, compile_calibrations({'X': speaker.to_string()}),
+        )
+        # Removing the data shows the artifact is what gets used.
+        (speaker.filename / 'golay_sens.csv').unlink()
+        monkeypatch.setenv(ARTIFACT_ENV, str(artifact))
+        monkeypatch.setattr(calibration_artifact, '_ARTIFACTS', {})
+        cal = load_calibration(speaker_manager, speaker.to_string())
+        np.testing.assert_array_equal(cal.sensitivity, [1.0, 2.0])
+
+    def test_load_calibration_falls_back_with_corrupt_artifact(
+            self, tmp_path, monkeypatch):
+        artifact = tmp_path / 'calibrations.npz'
+        write_calibration_artifact(artifact, {
+            'speaker': _make_speaker_cal(tmp_path).load(),
+        })
+        data = artifact.read_bytes()
+        artifact.write_bytes(data[:len(data) // 2])
+        monkeypatch.setenv(ARTIFACT_ENV, str(artifact))
+        monkeypatch.setattr(calibration_artifact, '_ARTIFACTS', {})
+        string = UnityInputCalibration().to_string()
+        cal = load_calibration(speaker_manager, string)
+        assert isinstance(cal, FlatCalibration)
+
+    def test_load_calibration_falls_back_without_artifact(self, monkeypatch):
+        monkeypatch.delenv(ARTIFACT_ENV, raising=False)
+        string = UnityInputCalibration().to_string()
+        cal = load_calibration(speaker_manager, string)
+        assert isinstance(cal, FlatCalibration)
+
+    def test_round_trip_matches_get_sens(self, tmp_path):
+        # Frequencies that InterpCalibration rounds, out of order.
+        frequency = [2000.0049, 1000.006, 4000.5, 500.004]
+        interp = InterpCalibration(frequency, [2.0, 1.0, 4.0, 0.5],
+                                   phase=[0.2, 0.1, 0.4, 0.05])
+        artifact = tmp_path / 'calibrations.npz'
+        write_calibration_artifact(artifact, {'a': interp})
+        loaded = read_calibration_artifact(artifact)['a']
+
+        np.testing.assert_array_equal(loaded.frequency, interp.frequency)
+        np.testing.assert_array_equal(loaded.sensitivity, interp.sensitivity)
+        check = [500, 500.004, 750, 1000.01, 3000, 4000.5]
+        np.testing.assert_array_equal(loaded.get_sens(check),
+                                      interp.get_sens(check))
+        np.testing.assert_array_equal(loaded.get_phase(check),
+                                      interp.get_phase(check))
+
+    def test_rejects_what_it_cannot_store(self, tmp_path):
+        class Subclass(FlatCalibration):
+            pass
+
+        artifact = tmp_path / 'calibrations.npz'
+        for cal in (
+            Subclass(1.0),
+            FlatCalibration(1.0, attrs={'n_bits': np.int64(14)}),
+            FlatCalibration(1.0, attrs={'levels': (1, 2)}),
+        ):
+            with pytest.raises(ValueError):
+                write_calibration_artifact(artifact, {'a': cal})
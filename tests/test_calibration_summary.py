@@ -0,0 +1,70 @@
+'''
+Tests for :mod:`cftscal.calibration_summary` -- tree values precomputed
+from a calibration's data files into its ``metadata.json``.
+'''
+import json
+
+from cftscal.calibration_summary import compute_summary
+from cftscal.objects import (
+    CFTSInputAmplifierCalibration, CFTSMeasurementMicrophoneCalibration,
+    CFTSSpeakerCalibration,
+)
+
+
+class TestComputeSummary:
+
+    def test_golay(self, tmp_path):
+        (tmp_path / 'golay_sens.csv').write_text(
+            'n_bits,output_gain,frequency,sens,phase\n'
+            '12,-6.0,500.0,1.0,0\n'
+            '14,0.0,8000.0,2.0,0\n'
+        )
+        assert compute_summary(tmp_path) == {
+            'n_bits': 14, 'output_gain': 0.0, 'max_frequency': 8000.0,
+        }
+
+    def test_microphone_and_amplifier(self, tmp_path):
+        (tmp_path / 'microphone_sensitivity.json').write_text(
+            json.dumps({'mic sens overall (mV/Pa)': 3.5}))
+        (tmp_path / 'amplifier_gain.json').write_text(
+            json.dumps({'gain mean (linear)': 50373.45}))
+        assert compute_summary(tmp_path) == {
+            'sens': 3.5, 'measured_gain': 50373.45,
+        }
+
+    def test_unreadable_files_are_left_out(self, tmp_path):
+        (tmp_path / 'golay_sens.csv').write_text('frequency,sens\n1,2\n')
+        (tmp_path / 'microphone_sensitivity.json').write_text('not json')
+        assert compute_summary(tmp_path) == {}
+
+
+class TestSummaryBackedProperties:
+    '''With a summary in metadata.json, no data file needs to exist.'''
+
+    def _cal_dir(self, tmp_path, summary):
+        (tmp_path / 'metadata.json').write_text(json.dumps({
+            'datetime': '2026-07-01T12:34:56', 'summary': summary,
+        }))
+        return tmp_path
+
+    def test_speaker(self, tmp_path):
+        cal_dir = self._cal_dir(tmp_path, {
+            'n_bits': 14, 'output_gain': 0.0, 'max_frequency': 8000.0,
+        })
+        cal = CFTSSpeakerCalibration('SPK0', cal_dir)
+        assert (cal.n_bits, cal.output_gain, cal.max_frequency) == \
+            (14, 0.0, 8000.0)
+
+    def test_measurement_microphone(self, tmp_path):
+        cal_dir = self._cal_dir(tmp_path, {'sens': 3.5})
+        assert CFTSMeasurementMicrophoneCalibration('MMM0', cal_dir).sens == 3.5
+
+    def test_input_amplifier(self, tmp_path):
+        cal_dir = self._cal_dir(tmp_path, {'measured_gain': 500.0})
+        cal = CFTSInputAmplifierCalibration('AMP0', cal_dir)
+        assert cal.measured_gain == 500.0
+
+    def test_falls_back_to_data_file_without_summary(self, tmp_path):
+        (tmp_path / 'microphone_sensitivity.json').write_text(
+            json.dumps({'mic sens overall (mV/Pa)': 2.0}))
+        assert CFTSMeasurementMicrophoneCalibration('MMM0', tmp_path).sens == 2.0
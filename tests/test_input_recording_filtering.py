@@ -0,0 +1,98 @@
+'''
+Tests for :mod:`cftscal.plugins.input_recording.filtering` -- background,
+cached filtering for the input recording view.
+'''
+import numpy as np
+from scipy import signal
+
+from cftscal.plugins.input_recording.filtering import (
+    FilterWorker, apply_filter, filter_padding, filter_region, filter_sos,
+)
+
+
+FS = 10e3
+
+
+def _noise(n=5000):
+    return np.random.default_rng(0).normal(size=n)
+
+
+class TestFilterSOS:
+
+    def test_cached_per_sampling_rate(self):
+        sos = filter_sos(FS, '1/3 Octave', 1000.0, 4)
+        assert filter_sos(FS, '1/3 Octave', 1000.0, 4) is sos
+        assert filter_sos(2 * FS, '1/3 Octave', 1000.0, 4) is not sos
+
+    def test_unfiltered_is_passthrough(self):
+        y = _noise()
+        assert filter_sos(FS, 'Unfiltered', 1000.0, 4) is None
+        assert apply_filter(y, FS, 'Unfiltered', 1000.0, 4) is y
+
+    def test_matches_sosfiltfilt(self):
+        y = _noise()
+        sos = filter_sos(FS, 'dBA', 1000.0, 4)
+        np.testing.assert_array_equal(
+            apply_filter(y, FS, 'dBA', 1000, 4), signal.sosfiltfilt(sos, y),
+        )
+
+
+class TestFilterRegion:
+
+    def test_matches_slice_of_filtered_signal(self):
+        y = _noise(50000)
+        for settings in (('dBA', 1000.0, 4), ('1/3 Octave', 1000.0, 4),
+                         ('1/3 Octave', 1000.0, 8)):
+            full = apply_filter(y, FS, *settings)
+            region = filter_region(lambda j0, j1: y[j0:j1], FS, len(y),
+                                   20000, 25000, *settings)
+            np.testing.assert_allclose(region, full[20000:25000], atol=1e-8)
+
+    def test_padding_limited_to_signal(self):
+        y = _noise()
+        read = []
+
+        def read_samples(j0, j1):
+            read.append((j0, j1))
+            return y[j0:j1]
+
+        settings = ('1/3 Octave', 1000.0, 4)
+        region = filter_region(read_samples, FS, len(y), 100, 4900, *settings)
+        assert read == [(0, len(y))]
+        np.testing.assert_array_equal(
+            region, apply_filter(y, FS, *settings)[100:4900],
+        )
+
+    def test_unfiltered_reads_only_region(self):
+        y = _noise()
+        assert filter_padding(FS, 'Unfiltered', 1000.0, 4) == 0
+        region = filter_region(lambda j0, j1: y[j0:j1], FS, len(y),
+                               100, 200, 'Unfiltered', 1000.0, 4)
+        np.testing.assert_array_equal(region, y[100:200])
+
+
+class TestFilterWorker:
+
+    def test_result_is_cached(self):
+        worker = FilterWorker(max_workers=2)
+        y = _noise()
+        settings = ('1/3 Octave', 1000.0, 4)
+        assert worker.cached('a', settings) is None
+        filtered = worker.submit('a', lambda: y, FS, settings).result()
+        np.testing.assert_array_equal(
+            filtered.samples, apply_filter(y, FS, *settings),
+        )
+        assert filtered.n_samples == len(y)
+        assert worker.cached('a', settings) is filtered
+        assert worker.cached('a', ('1/3 Octave', 2000.0, 4)) is None
+        assert worker.cached('a', ('Unfiltered', 1000.0, 4)) is None
+
+    def test_discard(self):
+        worker = FilterWorker(max_workers=1)
+        y = _noise()
+        for fc in (500.0, 1000.0):
+            worker.submit('a', lambda: y, FS, ('1/3 Octave', fc, 4)).result()
+        worker.submit('b', lambda: y, FS, ('dBA', 1000.0, 4)).result()
+        worker.discard('a')
+        assert worker.cached('a', ('1/3 Octave', 500.0, 4)) is None
+        assert worker.cached('b', ('dBA', 1000.0, 4)) is not None
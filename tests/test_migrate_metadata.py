@@ -12,6 +12,7 @@ import pytest
 import yaml
 
 from cftscal import migrate_metadata as mm
+from cftscal.object_manifest import OBJECT_MANIFEST, read_object_manifest
 
 
 def _folder(name):
@@ -472,6 +473,26 @@ class TestMigrate:
         # the user to resolve by hand.
         assert cal_dir_1.exists() != cal_dir_2.exists()
 
+    def test_object_manifests_rebuilt_after_migration(self, tmp_path):
+        # The manifest must describe the migrated (renamed, reparented)
+        # layout, and the vacated coupler folder must not be kept alive
+        # by a leftover manifest.
+        _make_cal_dir(
+            tmp_path, 'inear', 'C1', '20260701-123456_C1_MMM5',
+        )
+        mm.migrate(tmp_path)
+        assert not (tmp_path / 'inear' / 'C1').exists()
+        manifest = read_object_manifest(tmp_path / 'inear' / 'MMM5')
+        assert list(manifest) == ['20260701-123456']
+        assert manifest['20260701-123456']['starship'] == 'MMM5'
+
+    def test_dry_run_writes_no_manifest(self, tmp_path):
+        _make_cal_dir(
+            tmp_path, 'microphone', 'MMM0', '20260701-123456_MMM0_PP1',
+        )
+        mm.migrate(tmp_path, dry_run=True)
+        assert not (tmp_path / 'microphone' / 'MMM0' / OBJECT_MANIFEST).exists()
+
 
 class TestIsMigratedAlternatives:
     '''MARKER_KEYS['microphone_generic'] uses a list of alternatives so a
@@ -1130,3 +1151,37 @@ class TestMigrateEnrichment:
         assert counts == _counts(skipped_exists=1, enriched=1)
         metadata = json.loads((cal_dir / 'metadata.json').read_text())
         assert metadata['input_channel'] == 'Microphone Calibration'
+
+
+class TestEnrichSummary:
+
+    def _write_golay(self, cal_dir):
+        (cal_dir / 'golay_sens.csv').write_text(
+            'n_bits,output_gain,frequency,sens\n'
+            '12,-6.0,500.0,1.0\n'
+            '14,0.0,8000.0,2.0\n'
+        )
+
+    def test_backfills_speaker_summary(self, tmp_path):
+        cal_dir = _make_cal_dir(
+            tmp_path, 'speaker', 'SPK1', '20260701-123456',
+            metadata={'datetime': '2026-07-01T12:34:56', 'microphone': 'MMM0',
+                      'speaker': 'SPK1'},
+        )
+        self._write_golay(cal_dir)
+        counts = mm.migrate(tmp_path)
+        assert counts == _counts(skipped_exists=1, enriched=1)
+        metadata = json.loads((cal_dir / 'metadata.json').read_text())
+        assert metadata['summary'] == {
+            'n_bits': 14, 'output_gain': 0.0, 'max_frequency': 8000.0,
+        }
+
+    def test_existing_summary_kept_without_overwrite(self, tmp_path):
+        self._write_golay(tmp_path)
+        metadata = {'summary': {'n_bits': 16}}
+        assert mm._enrich_summary(tmp_path, metadata) == {}
+        result = mm._enrich_summary(tmp_path, metadata, overwrite=True)
+        assert result['summary']['n_bits'] == 14
+
+    def test_no_data_files_adds_nothing(self, tmp_path):
+        assert mm._enrich_summary(tmp_path, {}) == {}
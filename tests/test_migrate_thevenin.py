@@ -6,6 +6,7 @@ reorganizes Thevenin-equivalent inear calibrations (coupler starting with
 import json
 
 from cftscal import migrate_thevenin as mt
+from cftscal.object_manifest import read_object_manifest, rebuild_object_manifest
 
 
 def _make_inear_cal(root, starship, cal_name, coupler, extra=None):
@@ -51,6 +52,23 @@ class TestMoveTheveninCalibrations:
         mt.move_thevenin_calibrations(tmp_path)
         assert (tmp_path / 'inear' / 'MMM0' / '20260701-654321').exists()
 
+    def test_object_manifests_follow_the_move(self, tmp_path):
+        _make_inear_cal(tmp_path, 'MMM0', '20260701-123456', 'TH-32')
+        _make_inear_cal(tmp_path, 'MMM0', '20260701-654321', 'C1')
+        rebuild_object_manifest(tmp_path / 'inear' / 'MMM0')
+        mt.move_thevenin_calibrations(tmp_path)
+        assert list(read_object_manifest(tmp_path / 'inear' / 'MMM0')) == [
+            '20260701-654321',
+        ]
+        thevenin_dir = tmp_path / 'inear' / 'Thevenin' / 'MMM0'
+        assert list(read_object_manifest(thevenin_dir)) == ['20260701-123456']
+
+    def test_manifest_does_not_block_cleanup_of_old_folder(self, tmp_path):
+        _make_inear_cal(tmp_path, 'MMM0', '20260701-123456', 'TH-32')
+        rebuild_object_manifest(tmp_path / 'inear' / 'MMM0')
+        mt.move_thevenin_calibrations(tmp_path)
+        assert not (tmp_path / 'inear' / 'MMM0').exists()
+
     def test_non_thevenin_coupler_left_in_place(self, tmp_path):
         cal_dir = _make_inear_cal(tmp_path, 'MMM0', '20260701-123456', 'C1')
         counts = mt.move_thevenin_calibrations(tmp_path)
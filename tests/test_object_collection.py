@@ -0,0 +1,217 @@
+'''
+Tests for :mod:`cftscal.plugins.object_collection` -- loading the groups
+of a calibration tree in the background.
+'''
+from dataclasses import dataclass
+from pathlib import Path
+import threading
+
+from cftscal.objects import CalibratedObject, CalibrationLoader, CalibrationManager
+from cftscal.plugins.object_collection import ObjectCollection, ObjectGroup
+
+
+class _Posted:
+    '''Collects what the collection posts to the GUI thread.'''
+
+    def __init__(self):
+        self.calls = []
+        self.event = threading.Event()
+
+    def __call__(self, fn, *args):
+        self.calls.append((fn, args))
+        self.event.set()
+
+    def run(self):
+        calls, self.calls = self.calls, []
+        self.event.clear()
+        for fn, args in calls:
+            fn(*args)
+
+    def run_until(self, condition, timeout=1):
+        while not condition():
+            assert self.event.wait(timeout)
+            self.run()
+
+
+@dataclass(order=True)
+class _Calibration:
+    filename: Path
+
+
+class _Loader(CalibrationLoader):
+    '''
+    Knows the objects in ``objects`` (``(folder, name)`` to calibration
+    names) and, if ``release`` is given, waits for it before listing them.
+    '''
+
+    def __init__(self, objects, release=None):
+        self.objects = objects
+        self.release = release
+
+    def list_objects(self):
+        if self.release is not None:
+            assert self.release.wait(1)
+        return list(self.objects)
+
+    def list_calibrations(self, name, folder=None):
+        return [_Calibration(Path(f'/{folder}/{name}/{c}'))
+                for c in self.objects[folder, name]]
+
+
+class _FailingLoader(CalibrationLoader):
+
+    def list_objects(self):
+        raise OSError('share unavailable')
+
+
+def _make_collection(*loaders):
+    manager = CalibrationManager(object_class=CalibratedObject)
+    collection = ObjectCollection(manager, [])
+    manager.loaders = list(loaders)
+    posted = _Posted()
+    collection.post = posted
+    changes = []
+    collection.observe('updated', lambda c: changes.append(c['value']))
+    return collection, posted, changes
+
+
+def _names(collection):
+    return [group.item.name for group in collection.groups]
+
+
+class TestUpdateSubitems:
+
+    def test_unchanged_calibrations_keep_their_objects(self):
+        loader = _Loader({('', 'A'): ['a0', 'a1']})
+        collection, posted, changes = _make_collection(loader)
+        collection.update_groups()
+        items = [node.item for node in collection.groups[0].subitems]
+
+        loader.objects[('', 'A')].append('a2')
+        collection.update_groups()
+        kept = [node.item for node in collection.groups[0].subitems][1:]
+        assert all(a is b for a, b in zip(kept, items))
+        assert changes[-1].changed == []
+
+    def test_changed_metadata_replaces_calibration(self):
+        old = _Calibration(Path('/a'))
+        old.metadata = {'level': 1}
+        group = ObjectGroup(object(), None, [old])
+        node, = group.subitems
+
+        same = _Calibration(Path('/a'))
+        same.metadata = {'level': 1}
+        assert group.update_subitems([same]) == ([], [], [])
+        assert node.item is old
+
+        new = _Calibration(Path('/a'))
+        new.metadata = {'level': 2}
+        assert group.update_subitems([new]) == ([], [], [node])
+        assert node.item is new
+
+
+class TestLoad:
+
+    def test_loaders_report_independently(self):
+        release = threading.Event()
+        collection, posted, changes = _make_collection(
+            _Loader({('', 'B'): ['b0']}, release),
+            _Loader({('', 'A'): ['a0'], ('', 'C'): ['c0']}),
+        )
+        collection.load()
+        assert collection.loading
+
+        # The slow loader doesn't hold up the other one.
+        posted.run_until(lambda: collection.groups)
+        assert _names(collection) == ['A', 'C']
+        assert collection.loading
+
+        release.set()
+        posted.run_until(lambda: not collection.loading)
+        assert _names(collection) == ['A', 'B', 'C']
+        assert [[g.item.name for g in c.added] for c in changes] \
+            == [['A', 'C'], ['B']]
+        assert not any(c.removed for c in changes)
+
+    def test_groups_kept_until_their_loader_reports(self):
+        release = threading.Event()
+        slow = _Loader({('', 'B'): ['b0']})
+        collection, posted, changes = _make_collection(
+            slow, _Loader({('', 'A'): ['a0']}),
+        )
+        collection.update_groups()
+        group = collection.groups[1]
+
+        slow.release = release
+        collection.load()
+        posted.run_until(lambda: len(changes) == 2)
+        assert _names(collection) == ['A', 'B']
+        assert not changes[-1].removed
+
+        release.set()
+        posted.run_until(lambda: not collection.loading)
+        assert collection.groups[1] is group
+
+    def test_update_groups_supersedes_load(self):
+        release = threading.Event()
+        loader = _Loader({('', 'A'): ['a0']}, release)
+        collection, posted, changes = _make_collection(loader)
+        collection.load()
+        loader.objects = {('', 'B'): ['b0']}
+        release.set()
+        collection.update_groups()
+        assert not collection.loading
+        assert _names(collection) == ['B']
+
+        # The load's result, whenever it lands, is dropped.
+        posted.event.wait(1)
+        posted.run()
+        assert _names(collection) == ['B']
+        assert len(changes) == 1
+
+    def test_refresh_loads_in_background(self):
+        release = threading.Event()
+        loader = _Loader({('', 'A'): ['a0']})
+        collection, posted, changes = _make_collection(loader)
+        collection.update_groups()
+        collection.background = True
+
+        loader.objects = {('', 'A'): ['a0'], ('', 'B'): ['b0']}
+        loader.release = release
+        collection.refresh()
+        assert collection.loading
+        assert _names(collection) == ['A']
+
+        release.set()
+        posted.run_until(lambda: not collection.loading)
+        assert _names(collection) == ['A', 'B']
+        assert [g.item.name for g in changes[-1].added] == ['B']
+
+    def test_unreported_snapshots_kept(self):
+        release = threading.Event()
+        slow = _Loader({('', 'B'): ['b0']})
+        collection, posted, changes = _make_collection(
+            slow, _Loader({('', 'A'): ['a0']}),
+        )
+        collection.snapshots = {Path('/slow'): object()}
+        slow.release = release
+        collection.load()
+        posted.run_until(lambda: len(changes) == 1)
+        assert Path('/slow') in collection.snapshots
+
+        release.set()
+        posted.run_until(lambda: not collection.loading)
+        assert collection.snapshots == {}
+
+    def test_failing_loader(self):
+        collection, posted, changes = _make_collection(
+            _FailingLoader(), _Loader({('', 'A'): ['a0']}),
+        )
+        collection.load()
+        posted.run_until(lambda: not collection.loading)
+        assert _names(collection) == ['A']
+
+    def test_no_loaders(self):
+        collection, posted, changes = _make_collection()
+        collection.load()
+        assert not collection.loading
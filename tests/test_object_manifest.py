@@ -0,0 +1,109 @@
+'''
+Tests for :mod:`cftscal.object_manifest` -- the per-object
+``_calibrations.json`` aggregate of every calibration's ``metadata.json``.
+'''
+import json
+import os
+
+from cftscal.object_manifest import (
+    OBJECT_MANIFEST, read_object_manifest, rebuild_object_manifest,
+    update_object_manifest,
+)
+
+
+def _make_calibration(dir_path, metadata=None):
+    dir_path.mkdir(parents=True, exist_ok=True)
+    (dir_path / 'metadata.json').write_text(json.dumps(metadata or {}))
+
+
+class TestObjectManifest:
+
+    def test_missing_manifest_reads_empty(self, tmp_path):
+        assert read_object_manifest(tmp_path) == {}
+
+    def test_rebuild_collects_every_sidecar(self, tmp_path):
+        _make_calibration(tmp_path / '20260701-abc', {'speaker': 'A'})
+        _make_calibration(tmp_path / '20260702-def', {'speaker': 'B'})
+        (tmp_path / 'not-a-calibration').mkdir()
+        rebuild_object_manifest(tmp_path)
+        assert read_object_manifest(tmp_path) == {
+            '20260701-abc': {'speaker': 'A'},
+            '20260702-def': {'speaker': 'B'},
+        }
+
+    def test_rebuild_with_no_calibrations_leaves_no_file(self, tmp_path):
+        rebuild_object_manifest(tmp_path)
+        assert not (tmp_path / OBJECT_MANIFEST).exists()
+
+    def test_update_builds_missing_manifest_from_scratch(self, tmp_path):
+        # Calibrations recorded before manifests existed are picked up the
+        # first time anything is added to the object.
+        _make_calibration(tmp_path / '20260701-abc', {'speaker': 'A'})
+        _make_calibration(tmp_path / '20260702-def', {'speaker': 'B'})
+        update_object_manifest(tmp_path, add=['20260702-def'])
+        assert set(read_object_manifest(tmp_path)) == {
+            '20260701-abc', '20260702-def',
+        }
+
+    def test_update_adds_and_removes(self, tmp_path):
+        _make_calibration(tmp_path / '20260701-abc', {'speaker': 'A'})
+        rebuild_object_manifest(tmp_path)
+        (tmp_path / '20260701-abc').rename(tmp_path / '20260701-xyz')
+        update_object_manifest(
+            tmp_path, add=['20260701-xyz'], remove=['20260701-abc'],
+        )
+        assert read_object_manifest(tmp_path) == {
+            '20260701-xyz': {'speaker': 'A'},
+        }
+
+    def test_removing_last_entry_removes_manifest(self, tmp_path):
+        # So an object directory whose calibrations were all moved out is
+        # really empty and can be deleted.
+        _make_calibration(tmp_path / '20260701-abc')
+        rebuild_object_manifest(tmp_path)
+        update_object_manifest(tmp_path, remove=['20260701-abc'])
+        assert not (tmp_path / OBJECT_MANIFEST).exists()
+
+    def test_remove_without_manifest_does_not_create_one(self, tmp_path):
+        _make_calibration(tmp_path / '20260701-abc')
+        update_object_manifest(tmp_path, remove=['20260702-def'])
+        assert not (tmp_path / OBJECT_MANIFEST).exists()
+
+    def test_corrupt_manifest_is_ignored_and_rebuilt(self, tmp_path):
+        _make_calibration(tmp_path / '20260701-abc', {'speaker': 'A'})
+        (tmp_path / OBJECT_MANIFEST).write_text('{not json')
+        assert read_object_manifest(tmp_path) == {}
+        update_object_manifest(tmp_path, add=['20260701-abc'])
+        assert read_object_manifest(tmp_path) == {
+            '20260701-abc': {'speaker': 'A'},
+        }
+
+    def test_changed_sidecar_not_read_from_manifest(self, tmp_path):
+        _make_calibration(tmp_path / '20260701-abc', {'speaker': 'A'})
+        _make_calibration(tmp_path / '20260702-def', {'speaker': 'B'})
+        rebuild_object_manifest(tmp_path)
+        sidecar = tmp_path / '20260701-abc' / 'metadata.json'
+        stat = sidecar.stat()
+        sidecar.write_text(json.dumps({'speaker': 'C'}))
+        os.utime(sidecar, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert read_object_manifest(tmp_path) == {
+            '20260702-def': {'speaker': 'B'},
+        }
+
+    def test_old_manifest_version_is_ignored(self, tmp_path):
+        _make_calibration(tmp_path / '20260701-abc', {'speaker': 'A'})
+        (tmp_path / OBJECT_MANIFEST).write_text(json.dumps({
+            'version': 1, 'calibrations': {'20260701-abc': {'speaker': 'A'}},
+        }))
+        assert read_object_manifest(tmp_path) == {}
+
+    def test_save_leaves_no_temporary_files(self, tmp_path):
+        _make_calibration(tmp_path / '20260701-abc')
+        rebuild_object_manifest(tmp_path)
+        update_object_manifest(tmp_path, add=['20260701-abc'])
+        assert sorted(p.name for p in tmp_path.iterdir()) \
+            == ['20260701-abc', OBJECT_MANIFEST]
+
+    def test_missing_object_dir_is_a_noop(self, tmp_path):
+        update_object_manifest(tmp_path / 'gone', add=['20260701-abc'])
+        assert not (tmp_path / 'gone').exists()
@@ -6,12 +6,19 @@ touched them: path parsing, folder/name matching in ``get_object``, and
 the on-disk walk that discovers organizational nesting.
 '''
 import json
+import os
 from pathlib import Path
+import threading
+import time
 
+import numpy as np
 import pytest
 
+from cftscal.object_manifest import rebuild_object_manifest
 from cftscal.objects import (
     CalibratedObject,
+    CalibrationCache,
+    CalibrationIndex,
     CalibrationLoader,
     CalibrationManager,
     CFTSBaseLoader,
@@ -23,8 +30,19 @@ from cftscal.objects import (
     CFTSMeasurementMicrophoneCalibration,
     CFTSSpeakerCalibration,
     CFTSStarshipCalibration,
+    EPLStarshipLoader,
+    NominalInputCalibration,
+    UnityInputCalibration,
+    UnityInputCalibrationLoader,
     _CURRENT_MARKER,
+    classify_calibration_tree,
+    get_loader,
+    load_cache,
+    read_epl_header,
+    stack_calibrations,
+    walk_calibration_tree,
 )
+import cftscal.objects as objects_module
 
 
 class _FakeLoader(CalibrationLoader):
@@ -207,6 +225,726 @@ class TestWalkObjects:
         loader = _WalkOnlyLoader(tmp_path)
         assert loader._walk_objects() == {}
 
+    def test_calibration_payload_is_not_descended_into(self, tmp_path):
+        # A calibration dir's own data (e.g. a psi subfolder that happens
+        # to carry its own metadata.json) must not surface as an object.
+        cal_dir = tmp_path / 'MMM0' / '20260701-abc'
+        _make_calibration(cal_dir)
+        _make_calibration(cal_dir / 'zarr' / 'chunk')
+        loader = _WalkOnlyLoader(tmp_path)
+        assert set(loader._walk_objects()) == {('', 'MMM0')}
+
+
+class TestWalkCalibrationTree:
+
+    def test_yields_non_calibration_dirs_top_down(self, tmp_path):
+        _make_calibration(tmp_path / 'Lab1' / 'MMM0' / '20260701-abc')
+        _make_calibration(tmp_path / 'MMM1' / '20260702-def')
+        (tmp_path / 'MMM1' / '20260702-def' / 'payload').mkdir()
+        result = list(walk_calibration_tree(tmp_path))
+        assert result == [
+            ('', ['Lab1', 'MMM1'], []),
+            ('Lab1', ['MMM0'], []),
+            ('Lab1/MMM0', [], ['20260701-abc']),
+            ('MMM1', [], ['20260702-def']),
+        ]
+
+    def test_pruning_dirs_in_place_skips_subtree(self, tmp_path):
+        _make_calibration(tmp_path / 'Lab1' / 'MMM0' / '20260701-abc')
+        _make_calibration(tmp_path / 'Lab2' / 'MMM0' / '20260702-def')
+        seen = []
+        for rel, dirs, cals in walk_calibration_tree(tmp_path):
+            seen.append(rel)
+            if rel == 'Lab1':
+                dirs[:] = []
+        assert 'Lab1/MMM0' not in seen
+        assert 'Lab2/MMM0' in seen
+
+    def test_missing_base_path(self, tmp_path):
+        assert list(walk_calibration_tree(tmp_path / 'does_not_exist')) == []
+
+
+def _age_tree(path, seconds=3600):
+    '''
+    Backdate the mtime of ``path`` and every directory beneath it.
+
+    Freshly-created directories fall inside ``CalibrationIndex.MTIME_SLOP``
+    and are therefore always re-listed; backdating them is what lets a test
+    observe the index actually skipping unchanged directories.
+    '''
+    stamp = time.time() - seconds
+    for dir_path in [path, *(p for p in path.rglob('*') if p.is_dir())]:
+        os.utime(dir_path, (stamp, stamp))
+
+
+def _count_listings(monkeypatch):
+    '''Record every directory ``CalibrationIndex`` actually lists.'''
+    listed = []
+    list_dir = CalibrationIndex._list_dir
+
+    def _spy(path):
+        listed.append(path)
+        return list_dir(path)
+
+    monkeypatch.setattr(CalibrationIndex, '_list_dir', staticmethod(_spy))
+    return listed
+
+
+class TestCalibrationIndex:
+
+    def _make_tree(self, tmp_path):
+        base_path = tmp_path / 'speaker'
+        _make_calibration(base_path / 'MMM0' / '20260701-abc')
+        _make_calibration(base_path / 'Lab1' / 'MMM1' / '20260702-def')
+        _age_tree(base_path)
+        return base_path
+
+    def test_index_file_written_under_cal_root(self, tmp_path):
+        base_path = self._make_tree(tmp_path)
+        loader = _WalkOnlyLoader(base_path)
+        loader._walk_objects()
+        assert loader.index_file == tmp_path / '.index' / 'speaker.json'
+        data = json.loads(loader.index_file.read_text())
+        assert data['dirs']['Lab1/MMM1']['cals'] == ['20260702-def']
+
+    def test_unchanged_tree_is_not_relisted(self, tmp_path, monkeypatch):
+        base_path = self._make_tree(tmp_path)
+        _WalkOnlyLoader(base_path)._walk_objects()
+
+        # A new loader (e.g. a new process) starts from the saved index.
+        listed = _count_listings(monkeypatch)
+        result = _WalkOnlyLoader(base_path)._walk_objects()
+        assert listed == []
+        assert set(result) == {('', 'MMM0'), ('Lab1', 'MMM1')}
+
+    def test_only_changed_directory_is_relisted(self, tmp_path, monkeypatch):
+        base_path = self._make_tree(tmp_path)
+        loader = _WalkOnlyLoader(base_path)
+        loader._walk_objects()
+
+        listed = _count_listings(monkeypatch)
+        _make_calibration(base_path / 'Lab1' / 'MMM1' / '20260703-ghi')
+        result = loader._walk_objects()
+        assert listed == [base_path / 'Lab1' / 'MMM1']
+        assert len(result[('Lab1', 'MMM1')]) == 2
+
+    def test_removed_calibration_is_dropped(self, tmp_path):
+        import shutil
+
+        base_path = self._make_tree(tmp_path)
+        loader = _WalkOnlyLoader(base_path)
+        loader._walk_objects()
+        shutil.rmtree(base_path / 'Lab1')
+        assert set(loader._walk_objects()) == {('', 'MMM0')}
+        data = json.loads(loader.index_file.read_text())
+        assert 'Lab1' not in data['dirs']
+        assert 'Lab1/MMM1' not in data['dirs']
+
+    def test_run_directory_promoted_once_metadata_written(self, tmp_path):
+        base_path = self._make_tree(tmp_path)
+        run_dir = base_path / 'Lab1' / 'MMM1' / '20260703-ghi'
+        run_dir.mkdir()
+        _age_tree(base_path)
+        loader = _WalkOnlyLoader(base_path)
+        assert len(loader._walk_objects()[('Lab1', 'MMM1')]) == 1
+
+        # Writing metadata.json only changes the run directory's mtime.
+        (run_dir / 'metadata.json').write_text('{}')
+        assert run_dir in loader._walk_objects()[('Lab1', 'MMM1')]
+        data = json.loads(loader.index_file.read_text())
+        assert data['dirs']['Lab1/MMM1']['cals'] \
+            == ['20260702-def', '20260703-ghi']
+        assert 'Lab1/MMM1/20260703-ghi' not in data['dirs']
+
+        # A new loader starts from the corrected index.
+        result = _WalkOnlyLoader(base_path)._walk_objects()
+        assert len(result[('Lab1', 'MMM1')]) == 2
+
+    def test_recently_modified_directories_are_always_relisted(
+            self, tmp_path, monkeypatch):
+        base_path = tmp_path / 'speaker'
+        _make_calibration(base_path / 'MMM0' / '20260701-abc')
+        loader = _WalkOnlyLoader(base_path)
+        loader._walk_objects()
+
+        listed = _count_listings(monkeypatch)
+        loader._walk_objects()
+        assert base_path / 'MMM0' in listed
+
+    def test_corrupt_index_is_rebuilt(self, tmp_path):
+        base_path = self._make_tree(tmp_path)
+        loader = _WalkOnlyLoader(base_path)
+        loader.index_file.parent.mkdir()
+        loader.index_file.write_text('{not json')
+        result = loader._walk_objects()
+        assert set(result) == {('', 'MMM0'), ('Lab1', 'MMM1')}
+        assert json.loads(loader.index_file.read_text())['version'] == \
+            CalibrationIndex.VERSION
+
+
+class TestLoaderSnapshot:
+
+    def _make_tree(self, tmp_path):
+        base_path = tmp_path / 'speaker'
+        _make_calibration(base_path / 'Lab1' / 'MMM0' / '20260701-abc')
+        _age_tree(base_path)
+        return base_path
+
+    def test_unchanged_tree_reuses_snapshot(self, tmp_path):
+        loader = _WalkOnlyLoader(self._make_tree(tmp_path))
+        assert loader.snapshot() is loader.snapshot()
+
+    def test_snapshot_is_read_only(self, tmp_path):
+        loader = _WalkOnlyLoader(self._make_tree(tmp_path))
+        objects = loader.snapshot().objects
+        with pytest.raises(TypeError):
+            objects[('', 'MMM1')] = ()
+        assert isinstance(objects[('Lab1', 'MMM0')], tuple)
+
+    def test_change_on_disk_produces_new_snapshot(self, tmp_path):
+        base_path = self._make_tree(tmp_path)
+        loader = _WalkOnlyLoader(base_path)
+        first = loader.snapshot()
+        _make_calibration(base_path / 'Lab1' / 'MMM0' / '20260702-def')
+        second = loader.snapshot()
+        assert second is not first
+        assert len(second.objects[('Lab1', 'MMM0')]) == 2
+
+    def test_expired_ttl_relists_everything(self, tmp_path, monkeypatch):
+        base_path = self._make_tree(tmp_path)
+        loader = _WalkOnlyLoader(base_path)
+        first = loader.snapshot()
+        loader.snapshot_ttl = -1
+        listed = _count_listings(monkeypatch)
+        assert loader.snapshot() is first
+        assert set(listed) == {
+            base_path, base_path / 'Lab1', base_path / 'Lab1' / 'MMM0',
+        }
+
+    def test_invalidate_path_sees_change_hidden_from_mtime(self, tmp_path):
+        base_path = self._make_tree(tmp_path)
+        object_dir = base_path / 'Lab1' / 'MMM0'
+        loader = _WalkOnlyLoader(base_path)
+        loader.snapshot()
+
+        # Simulate a change landing within the mtime resolution: the object
+        # directory gains a calibration but its mtime doesn't move.
+        stamp = object_dir.stat().st_mtime
+        _make_calibration(object_dir / '20260702-def')
+        os.utime(object_dir, (stamp, stamp))
+        assert len(loader.snapshot().objects[('Lab1', 'MMM0')]) == 1
+
+        loader.invalidate(object_dir / '20260702-def')
+        assert len(loader.snapshot().objects[('Lab1', 'MMM0')]) == 2
+
+    def test_invalidate_does_not_wait_for_walk(self, tmp_path):
+        base_path = self._make_tree(tmp_path)
+        object_dir = base_path / 'Lab1' / 'MMM0'
+        loader = _WalkOnlyLoader(base_path)
+        loader._lock = threading.RLock()
+        loader.snapshot()
+        stamp = object_dir.stat().st_mtime
+        _make_calibration(object_dir / '20260702-def')
+        os.utime(object_dir, (stamp, stamp))
+
+        # A walk in another thread holds the lock while invalidate is called.
+        held, release = threading.Event(), threading.Event()
+
+        def walk():
+            with loader._lock:
+                held.set()
+                release.wait(1)
+
+        thread = threading.Thread(target=walk)
+        thread.start()
+        assert held.wait(1)
+        loader.invalidate(object_dir)
+        assert thread.is_alive()
+        release.set()
+        thread.join()
+        assert len(loader.snapshot().objects[('Lab1', 'MMM0')]) == 2
+
+    def test_invalidate_without_path_forces_full_scan(self, tmp_path, monkeypatch):
+        base_path = self._make_tree(tmp_path)
+        loader = _WalkOnlyLoader(base_path)
+        loader.snapshot()
+        loader.invalidate()
+        listed = _count_listings(monkeypatch)
+        loader.snapshot()
+        assert len(listed) == 3
+
+    def test_invalidate_ignores_paths_outside_base_path(self, tmp_path):
+        loader = _WalkOnlyLoader(self._make_tree(tmp_path))
+        first = loader.snapshot()
+        loader.invalidate(tmp_path / 'microphone' / 'MMM0')
+        assert loader.snapshot() is first
+
+    def test_folders_match_a_walk(self, tmp_path):
+        base_path = self._make_tree(tmp_path)
+        (base_path / 'Empty').mkdir()
+        (base_path / 'Lab1' / 'study_1').mkdir()
+        # Not a folder of the tree: it's inside an object directory.
+        (base_path / 'Lab1' / 'MMM0' / 'extra').mkdir()
+        snapshot = _WalkOnlyLoader(base_path).snapshot()
+        folders, targets = classify_calibration_tree(
+            walk_calibration_tree(base_path)
+        )
+        assert snapshot.folders == tuple(folders) == ('Empty', 'Lab1', 'Lab1/study_1')
+        assert snapshot.targets == tuple(targets) \
+            == ('', 'Empty', 'Lab1/MMM0', 'Lab1/study_1')
+        assert set(snapshot.mtimes) == {
+            '', 'Empty', 'Lab1', 'Lab1/MMM0', 'Lab1/MMM0/extra',
+            'Lab1/study_1',
+        }
+
+    def test_concurrent_snapshots(self, tmp_path):
+        from concurrent.futures import ThreadPoolExecutor
+
+        base_path = self._make_tree(tmp_path)
+        for i in range(20):
+            _make_calibration(base_path / f'Lab{i}' / 'MMM0' / '20260701-abc')
+        loader = _WalkOnlyLoader(base_path)
+        loader._lock = threading.RLock()
+        with ThreadPoolExecutor(8) as pool:
+            snapshots = list(pool.map(lambda _: loader.snapshot(), range(16)))
+        assert len(snapshots[0].objects) == 20
+        assert all(s is snapshots[0] for s in snapshots)
+
+    def test_manager_reuses_snapshots(self, tmp_path, monkeypatch):
+        loader = _PinTestLoader(self._make_tree(tmp_path))
+        manager = CalibrationManager(object_class=CalibratedObject)
+        manager.loaders = [loader]
+        snapshots = manager.snapshots()
+
+        def fail():
+            raise AssertionError('should not be called')
+        monkeypatch.setattr(loader, 'snapshot', fail)
+        (obj, cals), = manager.list_objects_and_calibrations(snapshots=snapshots)
+        assert (obj.folder, obj.name) == ('Lab1', 'MMM0')
+        assert len(cals) == 1
+
+
+class TestObjectMap:
+
+    def _make_manager(self, tmp_path):
+        base_path = tmp_path / 'speaker'
+        _make_calibration(base_path / 'Lab1' / 'MMM0' / '20260701-abc')
+        _age_tree(base_path)
+        manager = CalibrationManager(object_class=CalibratedObject)
+        manager.loaders = [_WalkOnlyLoader(base_path)]
+        return manager, base_path
+
+    def test_map_reused_while_snapshots_unchanged(self, tmp_path):
+        manager, _ = self._make_manager(tmp_path)
+        obj = manager.get_object('Lab1/MMM0')
+        assert obj.loaders == manager.loaders
+        object_map = manager._object_map
+        manager.get_object('Lab1/MMM0')
+        assert manager._object_map is object_map
+
+    def test_new_object_found_after_change_on_disk(self, tmp_path):
+        manager, base_path = self._make_manager(tmp_path)
+        with pytest.raises(LookupError):
+            manager.get_object('Lab1/MMM1')
+        _make_calibration(base_path / 'Lab1' / 'MMM1' / '20260702-def')
+        assert manager.get_object('Lab1/MMM1').folder == 'Lab1'
+
+    def test_replacing_loaders_rebuilds_map(self, tmp_path):
+        manager, _ = self._make_manager(tmp_path)
+        manager.get_object('Lab1/MMM0')
+        manager.loaders = [_FakeLoader([('', 'MMM9')])]
+        assert manager.get_object('MMM9').name == 'MMM9'
+        with pytest.raises(LookupError):
+            manager.get_object('Lab1/MMM0')
+
+    def test_shared_object_lists_loaders_in_registration_order(self):
+        first = _FakeLoader([('', 'MMM0')])
+        second = _FakeLoader([('', 'MMM0'), ('', 'MMM1')])
+        manager = CalibrationManager(object_class=CalibratedObject)
+        manager.loaders = [first, second]
+        assert manager.get_object('MMM0').loaders == [first, second]
+        assert manager.get_object('MMM1').loaders == [second]
+
+
+EPL_CALIB = (
+    '[Info]\r\n'
+    'Date: 07/01/2026 01:02:03 PM\r\n'
+    '{smoothing}'
+    'Freq(Hz)\tdB SPL\tPhase\r\n'
+    '1000\t90.0\t0\r\n'
+    '2000\t95.0\t0\r\n'
+)
+
+
+def _make_epl_calib(path, smoothed=False):
+    smoothing = '[Smoothing]\r\nWidth: 3\r\n' if smoothed else ''
+    path.write_bytes(EPL_CALIB.format(smoothing=smoothing).encode())
+    return path
+
+
+def _count_epl_parses(monkeypatch):
+    parsed = []
+    parse = objects_module._parse_epl_header
+
+    def _spy(filename):
+        parsed.append(filename)
+        return parse(filename)
+
+    monkeypatch.setattr(objects_module, '_parse_epl_header', _spy)
+    return parsed
+
+
+class TestEPLStarship:
+
+    def _loader(self, base_path):
+        loader = EPLStarshipLoader()
+        loader.base_path = base_path
+        return loader
+
+    def test_header_read_in_one_pass(self, tmp_path):
+        filename = _make_epl_calib(tmp_path / 'SS1_ProbeTube1.calib', True)
+        header = read_epl_header(filename)
+        assert header.datetime.isoformat() == '2026-07-01T13:02:03'
+        assert header.smoothed is True
+        with filename.open('rb') as fh:
+            fh.seek(header.data_offset)
+            assert fh.readline() == b'1000\t90.0\t0\r\n'
+
+    def test_unsmoothed(self, tmp_path):
+        filename = _make_epl_calib(tmp_path / 'SS1_ProbeTube1.calib')
+        assert read_epl_header(filename).smoothed is False
+
+    def test_header_cached_until_mtime_changes(self, tmp_path, monkeypatch):
+        parsed = _count_epl_parses(monkeypatch)
+        filename = _make_epl_calib(tmp_path / 'SS1_ProbeTube1.calib')
+        read_epl_header(filename)
+        read_epl_header(filename)
+        assert len(parsed) == 1
+        _make_epl_calib(filename, smoothed=True)
+        stamp = time.time() + 10
+        os.utime(filename, (stamp, stamp))
+        assert read_epl_header(filename).smoothed is True
+        assert len(parsed) == 2
+
+    def test_rewrite_within_mtime_resolution_is_reparsed(self, tmp_path):
+        filename = _make_epl_calib(tmp_path / 'SS1_ProbeTube1.calib')
+        stat = filename.stat()
+        assert read_epl_header(filename).smoothed is False
+        # Same mtime, but the file's size gives the rewrite away.
+        _make_epl_calib(filename, smoothed=True)
+        os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert read_epl_header(filename).smoothed is True
+
+    def test_header_cache_is_bounded(self):
+        info = objects_module._cached_epl_header.cache_info()
+        assert info.maxsize == objects_module.EPL_HEADER_CACHE_SIZE
+
+    def test_calibration_properties_share_one_parse(self, tmp_path,
+                                                     monkeypatch):
+        parsed = _count_epl_parses(monkeypatch)
+        _make_epl_calib(tmp_path / 'SS2_ProbeTube1.calib')
+        cal, = self._loader(tmp_path).list_calibrations('SS2 (EPL)')
+        assert (cal.datetime.year, cal.smoothed) == (2026, False)
+        assert len(parsed) == 1
+
+    def test_load_reads_data_after_header(self, tmp_path):
+        _make_epl_calib(tmp_path / 'SS1_ProbeTube1.calib', True)
+        cal, = self._loader(tmp_path).list_calibrations('SS1 (EPL)')
+        spl = cal.load().get_spl([1000, 2000], 1)
+        assert spl.shape == (2,)
+
+    def test_names_and_calibrations_from_one_listing(self, tmp_path):
+        _make_epl_calib(tmp_path / 'SS1_ProbeTube1.calib')
+        _make_epl_calib(tmp_path / 'SS1_ProbeTube2.calib')
+        _make_epl_calib(tmp_path / 'SS12_ProbeTube1.calib')
+        (tmp_path / 'SS1_other.calib').write_text('')
+        loader = self._loader(tmp_path)
+        assert loader.list_names() == {'SS1 (EPL)', 'SS12 (EPL)'}
+        cals = loader.list_calibrations('SS1 (EPL)')
+        assert [c.filename.name for c in cals] == [
+            'SS1_ProbeTube1.calib', 'SS1_ProbeTube2.calib',
+        ]
+
+    def test_snapshot_reused_until_directory_changes(self, tmp_path):
+        _make_epl_calib(tmp_path / 'SS1_ProbeTube1.calib')
+        _age_tree(tmp_path)
+        loader = self._loader(tmp_path)
+        snapshot = loader.snapshot()
+        assert loader.snapshot() is snapshot
+        _make_epl_calib(tmp_path / 'SS2_ProbeTube1.calib')
+        new_snapshot = loader.snapshot()
+        assert new_snapshot is not snapshot
+        assert ('', 'SS2 (EPL)') in new_snapshot.objects
+
+    def test_invalidate_forces_rescan(self, tmp_path):
+        # A change the directory mtime doesn't reveal.
+        stamp = time.time() - 3600
+        _make_epl_calib(tmp_path / 'SS1_ProbeTube1.calib')
+        os.utime(tmp_path, (stamp, stamp))
+        loader = self._loader(tmp_path)
+        loader.snapshot()
+        _make_epl_calib(tmp_path / 'SS2_ProbeTube1.calib')
+        os.utime(tmp_path, (stamp, stamp))
+        assert ('', 'SS2 (EPL)') not in loader.snapshot().objects
+        loader.invalidate()
+        assert ('', 'SS2 (EPL)') in loader.snapshot().objects
+
+    def test_missing_base_path(self, tmp_path):
+        loader = self._loader(tmp_path / 'missing')
+        assert loader.list_names() == set()
+        assert loader.list_calibrations('SS1') == []
+
+
+class TestCalibrationCache:
+
+    def test_hits_and_misses(self):
+        cache = CalibrationCache()
+        calls = []
+        load = lambda: calls.append(1) or object()
+        first = cache.get_or_load('a', load)
+        assert cache.get_or_load('a', load) is first
+        assert (cache.hits, cache.misses, len(calls)) == (1, 1, 1)
+
+    def test_evicts_least_recently_used_past_ceiling(self):
+        class _Cal:
+            def __init__(self):
+                self.frequency = np.zeros(1000)
+
+        size = CalibrationCache._estimate_nbytes(_Cal())
+        cache = CalibrationCache(max_bytes=2 * size)
+        cache.get_or_load('a', _Cal)
+        cache.get_or_load('b', _Cal)
+        cache.get_or_load('a', _Cal)
+        cache.get_or_load('c', _Cal)
+        assert len(cache) == 2
+        assert cache.nbytes == 2 * size
+        cache.get_or_load('a', _Cal)
+        cache.get_or_load('b', _Cal)
+        assert (cache.hits, cache.misses) == (2, 4)
+
+    def test_zero_ceiling_disables_caching(self):
+        cache = CalibrationCache(max_bytes=0)
+        assert cache.get_or_load('a', object) is not \
+            cache.get_or_load('a', object)
+        assert len(cache) == 0
+
+    def test_get_and_evict(self):
+        cache = CalibrationCache()
+        array = cache.get_or_load(('a', 1), lambda: np.zeros(1000))
+        cache.get_or_load(('b', 1), lambda: np.zeros(10))
+        assert cache.nbytes == 2 * 1024 + array.nbytes + 80
+        assert cache.get(('a', 1)) is array
+        assert cache.get(('c', 1)) is None
+        cache.evict(lambda key: key[0] == 'a')
+        assert cache.get(('a', 1)) is None
+        assert (len(cache), cache.nbytes) == (1, 1024 + 80)
+
+    def test_calibration_load_is_cached_until_data_changes(self, tmp_path):
+        cal_dir = tmp_path / 'SPK0' / '20260701-abc'
+        cal_dir.mkdir(parents=True)
+        sens_file = cal_dir / 'golay_sens.csv'
+        sens_file.write_text(
+            'n_bits,output_gain,frequency,sens\n'
+            '14,0.0,1000.0,1.0\n'
+            '14,0.0,2000.0,2.0\n'
+        )
+        load_cache.clear()
+        first = CFTSSpeakerCalibration('SPK0', cal_dir).load()
+        # A fresh instance for the same calibration still hits the cache.
+        assert CFTSSpeakerCalibration('SPK0', cal_dir).load() is first
+        assert (load_cache.hits, load_cache.misses) == (1, 1)
+        stamp = os.stat(sens_file).st_mtime + 10
+        os.utime(sens_file, (stamp, stamp))
+        assert CFTSSpeakerCalibration('SPK0', cal_dir).load() is not first
+
+
+def _make_speaker_history(base_path, curves):
+    '''One speaker calibration per ``(datetime, frequency, sens)`` entry.'''
+    for i, (datetime, frequency, sens) in enumerate(curves):
+        cal_dir = base_path / 'SPK0' / f'2026070{i + 1}-120000'
+        _make_calibration(cal_dir, {'datetime': datetime})
+        rows = ''.join(f'14,0.0,{f},{s}\n' for f, s in zip(frequency, sens))
+        (cal_dir / 'golay_sens.csv').write_text(
+            'n_bits,output_gain,frequency,sens\n' + rows
+        )
+
+
+class TestStackCalibrations:
+
+    class _Loader(_WalkOnlyLoader):
+        cal_class = CFTSSpeakerCalibration
+
+    def test_matches_get_sens_within_range(self, tmp_path):
+        _make_speaker_history(tmp_path, [
+            ('2026-07-02T00:00:00', [500, 1000, 4000], [1.0, 2.0, 4.0]),
+            ('2026-07-01T00:00:00', [500, 1000, 4000], [3.0, 1.0, 0.0]),
+            ('2026-07-03T00:00:00', [250, 2000], [5.0, 6.0]),
+        ])
+        cals = self._Loader(tmp_path).list_calibrations('SPK0')
+        frequencies = [600, 1000, 3000]
+        sens = stack_calibrations(cals, frequencies)
+        assert sens.shape == (3, 3)
+        for row, cal in zip(sens, cals):
+            covered = [f for f in frequencies if f <= cal.max_frequency]
+            np.testing.assert_allclose(
+                row[:len(covered)], cal.load().get_sens(covered))
+
+    def test_nan_outside_calibrated_range(self, tmp_path):
+        _make_speaker_history(tmp_path, [
+            ('2026-07-01T00:00:00', [500, 1000], [1.0, 2.0]),
+        ])
+        cals = self._Loader(tmp_path).list_calibrations('SPK0')
+        sens = stack_calibrations(cals, [250, 750, 2000])
+        assert np.isnan(sens[0, [0, 2]]).all()
+        assert sens[0, 1] == pytest.approx(1.5)
+
+    def test_matches_get_sens_on_unrounded_grid(self, tmp_path):
+        # get_sens interpolates the recorded frequencies, and extrapolates
+        # out to their 0.01 Hz rounded range.
+        _make_speaker_history(tmp_path, [
+            ('2026-07-01T00:00:00', [500.004, 1000.006, 4000.0049],
+             [1.0, 2.0, 4.0]),
+        ])
+        cal, = self._Loader(tmp_path).list_calibrations('SPK0')
+        frequencies = [500, 500.004, 750, 1000.006, 4000]
+        np.testing.assert_allclose(
+            stack_calibrations([cal], frequencies)[0],
+            cal.load().get_sens(frequencies),
+        )
+
+    def test_repeated_frequencies(self, tmp_path):
+        _make_speaker_history(tmp_path, [
+            ('2026-07-01T00:00:00', [500, 500, 1000, 1000, 2000],
+             [1.0, 3.0, 2.0, 4.0, 0.0]),
+        ])
+        cal, = self._Loader(tmp_path).list_calibrations('SPK0')
+        with np.errstate(all='raise'):
+            sens = stack_calibrations([cal], [500, 750, 1000, 1500])[0]
+        assert np.isfinite(sens).all()
+        np.testing.assert_allclose(
+            sens[1:], cal.load().get_sens([750, 1000, 1500]),
+        )
+
+    def test_single_point(self):
+        x = np.array([1000.0])
+        y = np.array([[1.0], [2.0]])
+        sens = objects_module._interpolate_rows(
+            x, y, np.array([500.0, 1000.0, 2000.0]), 1000.0, 1000.0,
+        )
+        np.testing.assert_array_equal(
+            sens, [[np.nan, 1.0, np.nan], [np.nan, 2.0, np.nan]],
+        )
+
+    def test_flat_calibrations(self):
+        sens = stack_calibrations(
+            [UnityInputCalibration(), NominalInputCalibration(1000)],
+            [100, 1000],
+        )
+        np.testing.assert_allclose(sens[1], sens[1, 0])
+        assert sens[0, 0] != sens[1, 0]
+
+    def test_load_all_is_oldest_first(self, tmp_path):
+        _make_speaker_history(tmp_path, [
+            ('2026-07-02T00:00:00', [500, 1000], [1.0, 2.0]),
+            ('2026-07-01T00:00:00', [500, 1000], [3.0, 4.0]),
+        ])
+        obj = CalibratedObject('SPK0', [self._Loader(tmp_path)], folder='')
+        cals, sens = obj.load_all([500])
+        assert [c.datetime.day for c in cals] == [1, 2]
+        np.testing.assert_allclose(sens[:, 0], [3.0, 1.0])
+
+    def test_manager_load_many(self, tmp_path):
+        _make_speaker_history(tmp_path, [
+            ('2026-07-01T00:00:00', [500, 1000], [1.0, 2.0]),
+        ])
+        cals = self._Loader(tmp_path).list_calibrations('SPK0')
+        manager = CalibrationManager(object_class=CalibratedObject)
+        np.testing.assert_allclose(manager.load_many(cals, [750]), [[1.5]])
+
+
+class TestLoaderRegistry:
+
+    def test_managers_share_loader_instances(self):
+        from cftscal.objects import (
+            input_manager, measurement_microphone_manager, microphone_manager,
+            output_manager, speaker_manager, unity_manager,
+        )
+        assert output_manager.loaders[0] is speaker_manager.loaders[0]
+        assert input_manager.loaders[0] is microphone_manager.loaders[0]
+        assert input_manager.loaders[1] is microphone_manager.loaders[1]
+        assert microphone_manager.loaders[1] is \
+            measurement_microphone_manager.loaders[0]
+        assert input_manager.loaders[2] is unity_manager.loaders[0]
+
+    def test_register_uses_registry(self):
+        manager = CalibrationManager(object_class=CalibratedObject)
+        manager.register('cftscal.objects.UnityInputCalibrationLoader')
+        assert manager.loaders[0] is get_loader(UnityInputCalibrationLoader)
+
+
+class TestPrefetchMetadata:
+
+    class _Loader(_WalkOnlyLoader):
+        cal_class = CFTSSpeakerCalibration
+
+    def test_prefetch_populates_metadata(self, tmp_path):
+        _make_calibration(tmp_path / 'SPK0' / '20260701-abc', {'speaker': 'A'})
+        _make_calibration(tmp_path / 'SPK0' / '20260702-def', {'speaker': 'B'})
+        loader = self._Loader(tmp_path)
+        cals = [cal for _, _, cal in loader.list_all_calibrations(prefetch=True)]
+        assert all('metadata' in vars(cal) for cal in cals)
+        assert {cal.metadata['speaker'] for cal in cals} == {'A', 'B'}
+
+    def test_no_prefetch_leaves_metadata_lazy(self, tmp_path):
+        _make_calibration(tmp_path / 'SPK0' / '20260701-abc')
+        loader = self._Loader(tmp_path)
+        cals = [cal for _, _, cal in loader.list_all_calibrations()]
+        assert 'metadata' not in vars(cals[0])
+
+    def test_unreadable_sidecar_left_for_lazy_property(self, tmp_path):
+        cal_dir = tmp_path / 'SPK0' / '20260701-abc'
+        _make_calibration(cal_dir)
+        (cal_dir / 'metadata.json').write_text('{not json')
+        loader = self._Loader(tmp_path)
+        cal, = [cal for _, _, cal in loader.list_all_calibrations(prefetch=True)]
+        assert 'metadata' not in vars(cal)
+        with pytest.raises(json.JSONDecodeError):
+            cal.metadata
+
+    def test_prefetch_reads_object_manifest(self, tmp_path):
+        _make_calibration(tmp_path / 'SPK0' / '20260701-abc', {'speaker': 'A'})
+        _make_calibration(tmp_path / 'SPK0' / '20260702-def', {'speaker': 'B'})
+        rebuild_object_manifest(tmp_path / 'SPK0')
+        # Sidecars are only consulted for calibrations missing from the
+        # manifest (or changed since), so clobbering one without changing
+        # its mtime or size shows which source was used.
+        sidecar = tmp_path / 'SPK0' / '20260701-abc' / 'metadata.json'
+        stat = sidecar.stat()
+        sidecar.write_text(json.dumps({'speaker': 'X'}))
+        os.utime(sidecar, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        _make_calibration(tmp_path / 'SPK0' / '20260703-ghi', {'speaker': 'C'})
+        loader = self._Loader(tmp_path)
+        cals = [cal for _, _, cal in loader.list_all_calibrations(prefetch=True)]
+        assert [vars(cal)['metadata'] for cal in cals] == [
+            {'speaker': 'A'}, {'speaker': 'B'}, {'speaker': 'C'},
+        ]
+
+    def test_prefetch_falls_back_for_stale_entry(self, tmp_path):
+        _make_calibration(tmp_path / 'SPK0' / '20260701-abc', {'speaker': 'A'})
+        rebuild_object_manifest(tmp_path / 'SPK0')
+        sidecar = tmp_path / 'SPK0' / '20260701-abc' / 'metadata.json'
+        sidecar.write_text(json.dumps({'speaker': 'A', 'pinned': True}))
+        loader = self._Loader(tmp_path)
+        cal, = [cal for _, _, cal in loader.list_all_calibrations(prefetch=True)]
+        assert vars(cal)['metadata'] == {'speaker': 'A', 'pinned': True}
+
+    def test_manager_passes_prefetch_through(self, tmp_path):
+        _make_calibration(tmp_path / 'SPK0' / '20260701-abc', {'speaker': 'A'})
+        manager = CalibrationManager(object_class=CalibratedObject)
+        manager.loaders = [self._Loader(tmp_path)]
+        (obj, cals), = manager.list_objects_and_calibrations(prefetch=True)
+        assert vars(cals[0])['metadata'] == {'speaker': 'A'}
+
 
 class TestListCalibrationsFolderFilter:
 
@@ -356,6 +1094,37 @@ class TestCurrentCalibration:
         with pytest.raises(ValueError):
             obj.set_current_calibration(object())
 
+    def test_walk_records_pin(self, tmp_path, monkeypatch):
+        obj = self._make_object(tmp_path, ['20260701-abc', '20260702-def'])
+        obj.set_current_calibration(obj.list_calibrations()[0])
+        manager = CalibrationManager(object_class=CalibratedObject)
+        manager.loaders = obj.loaders
+        (obj, cals), = manager.list_objects_and_calibrations()
+
+        # Resolved from the walk and the calibrations in hand, without
+        # touching the marker or listing the calibrations again.
+        def fail(*args, **kwargs):
+            raise AssertionError('should not be called')
+        monkeypatch.setattr(objects_module, 'read_pinned_name', fail)
+        monkeypatch.setattr(obj, 'list_calibrations', fail)
+        assert obj.get_pinned_calibration(cals).filename.name == '20260701-abc'
+
+    def test_pin_change_produces_new_snapshot(self, tmp_path):
+        obj = self._make_object(tmp_path, ['20260701-abc', '20260702-def'])
+        _age_tree(tmp_path)
+        loader, = obj.loaders
+        first = loader.snapshot()
+        assert dict(first.pins) == {}
+
+        cal = obj.list_calibrations()[1]
+        obj.set_current_calibration(cal)
+        second = loader.snapshot()
+        assert second is not first
+        assert dict(second.pins) == {('', 'MMM0'): cal.filename.name}
+
+        obj.clear_current_calibration()
+        assert dict(loader.snapshot().pins) == {}
+
 
 # ---------------------------------------------------------------------------
 # CFTSInEarLoader — groups by folder, same as every other CFTS loader
@@ -0,0 +1,182 @@
+'''
+Tests for :mod:`cftscal.plugins.overview` -- min/max pyramids behind the
+time plots of long recordings.
+'''
+import os
+import threading
+
+import numpy as np
+
+from cftscal.plugins import overview as overview_module
+from cftscal.plugins.overview import (
+    BIN_SIZE, LEVEL_FACTOR, Overview, OverviewWorker, load_overview,
+    region_indices, saved_overview, view_data,
+)
+
+
+FS = 1000.0
+
+
+class _Signal:
+    '''Minimal stand-in for a psidata signal: ``[channel, slice]`` reads.'''
+
+    def __init__(self, y, fs=FS):
+        self.array = y[np.newaxis]
+        self.fs = fs
+        self.reads = []
+
+    @property
+    def shape(self):
+        return self.array.shape
+
+    def __getitem__(self, key):
+        self.reads.append(key)
+        return self.array[key]
+
+
+def _ramp(n):
+    return np.sin(np.arange(n) / 50.0) * np.arange(n)
+
+
+class TestOverview:
+
+    def test_levels_match_brute_force(self, monkeypatch):
+        monkeypatch.setattr(overview_module, 'MIN_BINS', 4)
+        y = _ramp(BIN_SIZE * 100 + 17)
+        overview = Overview.from_array(y, FS)
+        assert len(overview.levels) > 1
+        for level, minmax in enumerate(overview.levels):
+            bin_size = overview.bin_size(level)
+            n_bins = int(np.ceil(len(y) / bin_size))
+            assert minmax.shape == (2, n_bins)
+            for i in (0, n_bins // 2, n_bins - 1):
+                chunk = y[i * bin_size:(i + 1) * bin_size]
+                np.testing.assert_allclose(
+                    minmax[:, i], [chunk.min(), chunk.max()], rtol=1e-6,
+                )
+
+    def test_chunked_build_matches(self, monkeypatch):
+        y = _ramp(BIN_SIZE * 50 + 3)
+        expected = Overview.from_array(y, FS)
+        monkeypatch.setattr(overview_module, 'CHUNK_SAMPLES', BIN_SIZE * 4)
+        chunked = Overview.from_reader(lambda i0, i1: y[i0:i1], len(y), FS)
+        np.testing.assert_array_equal(chunked.levels[0], expected.levels[0])
+
+    def test_select_level(self):
+        overview = Overview.from_array(np.zeros(BIN_SIZE * 10000), FS)
+        duration = overview.duration
+        assert overview.select_level(0, duration, 1e9) is None
+        width = overview.n_samples / BIN_SIZE
+        assert overview.select_level(0, duration, width) == 0
+        assert overview.select_level(0, duration, width / LEVEL_FACTOR) == 1
+        assert overview.select_level(0, duration, 1) == \
+            len(overview.levels) - 1
+
+    def test_envelope_interleaves_min_and_max(self):
+        y = _ramp(BIN_SIZE * 8)
+        overview = Overview.from_array(y, FS)
+        x, env = overview.envelope(0, 0, overview.duration)
+        assert len(x) == len(env) == 16
+        np.testing.assert_allclose(env[:2], [y[:BIN_SIZE].min(),
+                                             y[:BIN_SIZE].max()], rtol=1e-6)
+        assert x[2] == BIN_SIZE / FS
+
+
+class TestViewData:
+
+    def test_zoomed_in_reads_window(self):
+        signal = _Signal(_ramp(BIN_SIZE * 1000))
+        overview = Overview.from_array(signal.array[0], FS)
+        read = lambda i0, i1: signal[0, i0:i1]
+        x, y = view_data(overview, read, 10.0, 11.0, 1000)
+        assert signal.reads == [(0, slice(9500, 11500))]
+        np.testing.assert_array_equal(y, signal.array[0, 9500:11500])
+        assert x[0] == 9.5
+
+    def test_zoomed_out_uses_overview(self):
+        signal = _Signal(_ramp(BIN_SIZE * 1000))
+        overview = Overview.from_array(signal.array[0], FS)
+        x, y = view_data(overview, lambda i0, i1: signal[0, i0:i1],
+                         0, overview.duration, 500)
+        assert signal.reads == []
+        assert len(y) <= 2 * 1000 + 4
+
+
+class TestRegionIndices:
+
+    def test_matches_time_mask(self):
+        x = np.arange(1000) / FS
+        for t0, t1 in [(0.1, 0.2), (0.1005, 0.2505), (-1, 0.05), (0.9, 5)]:
+            i0, i1 = region_indices(t0, t1, FS, len(x))
+            np.testing.assert_array_equal(
+                np.flatnonzero((x >= t0) & (x < t1)), np.arange(i0, i1),
+            )
+
+    def test_empty_region(self):
+        assert region_indices(2, 3, FS, 1000) == (1000, 1000)
+        i0, i1 = region_indices(0.5, 0.5, FS, 1000)
+        assert i0 == i1
+
+
+class TestLoadOverview:
+
+    def test_saved_and_reused(self, tmp_path):
+        (tmp_path / 'ai0.zarr').write_bytes(b'data')
+        signal = _Signal(_ramp(BIN_SIZE * 20))
+        first = load_overview(tmp_path, 'ai0', signal)
+        assert (tmp_path / 'ai0.overview.cache.npz').exists()
+        n_reads = len(signal.reads)
+        second = load_overview(tmp_path, 'ai0', signal)
+        assert len(signal.reads) == n_reads
+        assert (second.fs, second.n_samples) == (FS, BIN_SIZE * 20)
+        np.testing.assert_array_equal(second.levels[0], first.levels[0])
+
+    def test_rebuilt_when_recording_changes(self, tmp_path):
+        data_file = tmp_path / 'ai0.zarr'
+        data_file.write_bytes(b'data')
+        load_overview(tmp_path, 'ai0', _Signal(np.zeros(BIN_SIZE)))
+        stamp = os.stat(data_file).st_mtime + 10
+        os.utime(data_file, (stamp, stamp))
+        overview = load_overview(tmp_path, 'ai0', _Signal(np.ones(BIN_SIZE)))
+        np.testing.assert_array_equal(overview.levels[0], [[1], [1]])
+
+
+class _BlockingSignal(_Signal):
+    '''Signal whose reads wait until ``release`` is set.'''
+
+    def __init__(self, y, fs=FS):
+        super().__init__(y, fs)
+        self.release = threading.Event()
+
+    def __getitem__(self, key):
+        self.release.wait(5)
+        return super().__getitem__(key)
+
+
+class TestOverviewWorker:
+
+    def test_nothing_saved_until_built(self, tmp_path):
+        (tmp_path / 'ai0.zarr').write_bytes(b'data')
+        worker = OverviewWorker()
+        assert worker.cached(tmp_path, 'ai0') is None
+        y = _ramp(BIN_SIZE * 20)
+        overview = worker.submit(tmp_path, 'ai0', _Signal(y)).result(5)
+        np.testing.assert_array_equal(
+            overview.levels[0], Overview.from_array(y, FS).levels[0],
+        )
+        cached = worker.cached(tmp_path, 'ai0')
+        np.testing.assert_array_equal(cached.levels[0], overview.levels[0])
+
+    def test_requests_share_a_build(self, tmp_path):
+        (tmp_path / 'ai0.zarr').write_bytes(b'data')
+        worker = OverviewWorker()
+        signal = _BlockingSignal(_ramp(BIN_SIZE * 20))
+        first = worker.submit(tmp_path, 'ai0', signal)
+        second = worker.submit(tmp_path, 'ai0', signal)
+        assert second is first
+        signal.release.set()
+        first.result(5)
+        assert saved_overview(tmp_path, 'ai0') is not None
+
+    def test_saved_overview_without_recording(self, tmp_path):
+        assert saved_overview(tmp_path, 'ai0') is None
@@ -0,0 +1,97 @@
+'''
+Tests for :mod:`cftscal.psd_cache` -- the average-PSD sidecar kept in each
+in-ear calibration directory.
+'''
+import os
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from cftscal.psd_cache import (
+    PSD_CACHE_FILENAME, read_average_psd, recording_stamp,
+)
+
+
+def _make_psd(offset=0.0):
+    index = pd.MultiIndex.from_product(
+        [[-20.0, -10.0], [1, 2]], names=['hw_ao_chirp_level', 'rep'],
+    )
+    columns = pd.Index([0.0, 500.0, 1000.0], name='frequency')
+    values = offset + np.arange(12, dtype=float).reshape(4, 3)
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def _make_recording(cal_dir):
+    cal_dir.mkdir(parents=True, exist_ok=True)
+    (cal_dir / 'hw_ai.zarr').write_bytes(b'data')
+    (cal_dir / 'metadata.json').write_text('{}')
+    return cal_dir
+
+
+class _Compute:
+
+    def __init__(self, psd):
+        self.psd = psd
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.psd
+
+
+class TestReadAveragePSD:
+
+    def test_round_trip(self, tmp_path):
+        cal_dir = _make_recording(tmp_path / 'cal')
+        compute = _Compute(_make_psd())
+        first = read_average_psd(cal_dir, compute)
+        assert (cal_dir / PSD_CACHE_FILENAME).exists()
+        second = read_average_psd(cal_dir, compute)
+        assert compute.calls == 1
+        pdt.assert_frame_equal(first, _make_psd())
+        pdt.assert_frame_equal(second, _make_psd())
+
+    def test_single_index(self, tmp_path):
+        cal_dir = _make_recording(tmp_path / 'cal')
+        psd = _make_psd().xs(1, level='rep')
+        read_average_psd(cal_dir, _Compute(psd))
+        compute = _Compute(None)
+        pdt.assert_frame_equal(read_average_psd(cal_dir, compute), psd)
+        assert compute.calls == 0
+
+    def test_changed_recording_recomputes(self, tmp_path):
+        cal_dir = _make_recording(tmp_path / 'cal')
+        read_average_psd(cal_dir, _Compute(_make_psd()))
+        data_file = cal_dir / 'hw_ai.zarr'
+        stamp = os.stat(data_file).st_mtime + 10
+        os.utime(data_file, (stamp, stamp))
+        compute = _Compute(_make_psd(offset=100))
+        psd = read_average_psd(cal_dir, compute)
+        assert compute.calls == 1
+        assert psd.iloc[0, 0] == 100
+
+    def test_metadata_rewrite_keeps_cache(self, tmp_path):
+        cal_dir = _make_recording(tmp_path / 'cal')
+        stamp = recording_stamp(cal_dir)
+        read_average_psd(cal_dir, _Compute(_make_psd()))
+        metadata = cal_dir / 'metadata.json'
+        t = os.stat(metadata).st_mtime + 10
+        os.utime(metadata, (t, t))
+        assert recording_stamp(cal_dir) == stamp
+        compute = _Compute(None)
+        read_average_psd(cal_dir, compute)
+        assert compute.calls == 0
+
+    def test_corrupt_cache_is_ignored(self, tmp_path):
+        cal_dir = _make_recording(tmp_path / 'cal')
+        (cal_dir / PSD_CACHE_FILENAME).write_bytes(b'not a zip file')
+        compute = _Compute(_make_psd())
+        pdt.assert_frame_equal(read_average_psd(cal_dir, compute), _make_psd())
+        assert compute.calls == 1
+
+    def test_missing_directory_computes(self, tmp_path):
+        compute = _Compute(_make_psd())
+        read_average_psd(tmp_path / 'missing', compute)
+        assert compute.calls == 1
+        assert not (tmp_path / 'missing').exists()
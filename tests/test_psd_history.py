@@ -0,0 +1,52 @@
+'''
+Tests for :mod:`cftscal.plugins.inear.psd_history` -- the time x frequency
+store behind the in-ear delta plot.
+'''
+import numpy as np
+
+from cftscal.plugins.inear.psd_history import PSDHistory
+
+
+FREQUENCY = np.array([500.0, 1000.0, 2000.0])
+
+
+class TestPSDHistory:
+
+    def test_rows_sorted_by_time(self):
+        history = PSDHistory()
+        history.insert('b', 20.0, FREQUENCY, [4, 5, 6])
+        history.insert('c', 30.0, FREQUENCY, [7, 8, 9])
+        history.insert('a', 10.0, FREQUENCY, [1, 2, 3])
+        assert history.keys == ['a', 'b', 'c']
+        times, levels = history.at_frequency(1100)
+        np.testing.assert_array_equal(times, [10, 20, 30])
+        np.testing.assert_array_equal(levels, [2, 5, 8])
+
+    def test_insert_replaces_existing_key(self):
+        history = PSDHistory()
+        history.insert('a', 10.0, FREQUENCY, [1, 2, 3])
+        history.insert('a', 40.0, FREQUENCY, [7, 8, 9])
+        assert len(history) == 1
+        np.testing.assert_array_equal(history.at_frequency(0)[1], [7])
+
+    def test_remove(self):
+        history = PSDHistory()
+        history.insert('a', 10.0, FREQUENCY, [1, 2, 3])
+        history.insert('b', 20.0, FREQUENCY, [4, 5, 6])
+        history.remove('a')
+        history.remove('missing')
+        assert 'a' not in history
+        times, levels = history.at_frequency(2000)
+        np.testing.assert_array_equal(times, [20])
+        np.testing.assert_array_equal(levels, [6])
+
+    def test_other_grid_is_interpolated(self):
+        history = PSDHistory()
+        history.insert('a', 10.0, FREQUENCY, [1, 2, 3])
+        history.insert('b', 20.0, [750.0, 1250.0], [10, 20])
+        np.testing.assert_array_equal(history.values[1, 1], 15)
+        assert np.isnan(history.values[1, 0])
+
+    def test_empty(self):
+        times, levels = PSDHistory().at_frequency(1000)
+        assert len(times) == len(levels) == 0
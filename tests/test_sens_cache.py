@@ -0,0 +1,98 @@
+'''
+Tests for :mod:`cftscal.sens_cache` -- the ``.npz`` cache kept next to each
+calibration's ``golay_sens.csv``/``chirp_sens.csv``.
+'''
+import os
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from cftscal import sens_cache
+from cftscal.sens_cache import read_sens_csv
+
+
+INDEX_COL = ['n_bits', 'output_gain', 'frequency']
+
+
+def _make_golay_csv(path, offset=0):
+    rows = [
+        {'n_bits': n_bits, 'output_gain': gain, 'frequency': f,
+         'sens': offset + n_bits + gain + f / 1000, 'phase': 0.5,
+         'notes': 'x'}
+        for n_bits in (12, 14)
+        for gain in (-6.0, 0.0)
+        for f in (500.0, 1000.0, 2000.0)
+    ]
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+def _count_csv_parses(monkeypatch):
+    parsed = []
+    read_csv = pd.read_csv
+
+    def _spy(*args, **kwargs):
+        parsed.append(args[0])
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(sens_cache.pd, 'read_csv', _spy)
+    return parsed
+
+
+class TestReadSensCsv:
+
+    def test_matches_read_csv(self, tmp_path):
+        csv_file = _make_golay_csv(tmp_path / 'golay_sens.csv')
+        expected = pd.read_csv(csv_file, index_col=INDEX_COL)[['sens']]
+        pdt.assert_frame_equal(read_sens_csv(csv_file, INDEX_COL), expected)
+        # Second read comes from the cache and must be identical.
+        pdt.assert_frame_equal(read_sens_csv(csv_file, INDEX_COL), expected)
+
+    def test_cache_written_and_reused(self, tmp_path, monkeypatch):
+        parsed = _count_csv_parses(monkeypatch)
+        csv_file = _make_golay_csv(tmp_path / 'golay_sens.csv')
+        read_sens_csv(csv_file, INDEX_COL)
+        assert (tmp_path / 'golay_sens.cache.npz').exists()
+        read_sens_csv(csv_file, INDEX_COL)
+        assert len(parsed) == 1
+
+    def test_stale_cache_is_rebuilt(self, tmp_path, monkeypatch):
+        parsed = _count_csv_parses(monkeypatch)
+        csv_file = _make_golay_csv(tmp_path / 'golay_sens.csv')
+        read_sens_csv(csv_file, INDEX_COL)
+        _make_golay_csv(csv_file, offset=100)
+        stamp = os.stat(csv_file).st_mtime + 10
+        os.utime(csv_file, (stamp, stamp))
+        df = read_sens_csv(csv_file, INDEX_COL)
+        assert len(parsed) == 2
+        assert df.loc[(12, 0.0, 500.0), 'sens'] == 112.5
+
+    def test_corrupt_cache_is_ignored(self, tmp_path):
+        csv_file = _make_golay_csv(tmp_path / 'golay_sens.csv')
+        (tmp_path / 'golay_sens.cache.npz').write_bytes(b'not a zip file')
+        df = read_sens_csv(csv_file, INDEX_COL)
+        assert df.loc[(14, -6.0, 1000.0), 'sens'] == 9.0
+
+    def test_different_index_reparses(self, tmp_path):
+        csv_file = tmp_path / 'chirp_sens.csv'
+        pd.DataFrame({
+            'hw_ao_chirp_level': [-20, -20, -10, -10],
+            'frequency': [500.0, 1000.0] * 2,
+            'sens': [1.0, 2.0, 3.0, 4.0],
+            'norm_spl': [10.0, 20.0, 30.0, 40.0],
+        }).to_csv(csv_file, index=False)
+        df = read_sens_csv(csv_file, ['hw_ao_chirp_level', 'frequency'])
+        assert list(df.columns) == ['sens', 'norm_spl']
+        np.testing.assert_array_equal(df.loc[-10, 'norm_spl'], [30.0, 40.0])
+        df = read_sens_csv(csv_file, ['frequency'])
+        assert df.index.names == ['frequency']
+
+    def test_speaker_calibration_loads_through_cache(self, tmp_path):
+        from cftscal.objects import CFTSSpeakerCalibration
+        _make_golay_csv(tmp_path / 'golay_sens.csv')
+        cal = CFTSSpeakerCalibration('SPK0', tmp_path)
+        assert (cal.n_bits, cal.output_gain, cal.max_frequency) == \
+            (14, 0.0, 2000.0)
+        assert cal.load().attrs['n_bits'] == 14
+        assert (tmp_path / 'golay_sens.cache.npz').exists()
@@ -0,0 +1,369 @@
+'''
+Tests for :mod:`cftscal.plugins.tree_model`.
+'''
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from qtpy.QtCore import QModelIndex, Qt
+from qtpy.QtWidgets import QApplication
+
+from cftscal.plugins.object_collection import ObjectCollection, ObjectGroup
+from cftscal.plugins.tree_model import (
+    CalibrationTreeModel, FOLDER, GROUP, LEAF
+)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@dataclass(order=True)
+class FakeCalibration:
+    filename: Path
+    level: float = 0
+
+
+@dataclass(order=True)
+class FakeObject:
+    name: str
+    folder: str = ''
+    pinned: object = field(default=None, compare=False)
+
+    def get_pinned_calibration(self, calibrations=None):
+        if self.pinned in (calibrations or []):
+            return self.pinned
+        return None
+
+
+class FakeCollection:
+
+    def notify(self, node, selected):
+        pass
+
+
+class FakeManager:
+    '''
+    Stands in for a CalibrationManager; ``objects`` maps ``(folder,
+    name)`` to the names of the object's calibrations.
+    '''
+
+    loaders = []
+
+    def __init__(self, objects):
+        self.objects = objects
+
+    def snapshots(self):
+        return []
+
+    def list_objects_and_calibrations(self, prefetch=False, snapshots=None):
+        return [
+            (FakeObject(name, folder),
+             [FakeCalibration(Path(f'/cal/{folder}/{name}/{c}')) for c in cals])
+            for (folder, name), cals in self.objects.items()
+        ]
+
+
+def make_mapping(calls=None):
+    def level(cal):
+        if calls is not None:
+            calls.append(cal.filename.name)
+        return f'{cal.level:.1f}'
+
+    return {
+        'name': {'groupby': True, 'id': True, 'to_str': lambda o: o.name},
+        'level': {'to_str': level},
+    }
+
+
+def make_group(name, n, folder=''):
+    item = FakeObject(name, folder)
+    cals = [FakeCalibration(Path(f'/cal/{name}/cal_{i}'), i) for i in range(n)]
+    return ObjectGroup(item, FakeCollection(), cals)
+
+
+class TestCalibrationTreeModel:
+
+    def test_groups_fetch_calibrations_lazily(self):
+        model = CalibrationTreeModel(make_mapping())
+        model.populate([make_group('A', 3)])
+        group = model.index(0, 0)
+        assert model.data(group) == 'A'
+        assert model.rowCount(group) == 0
+        assert model.hasChildren(group)
+        assert model.canFetchMore(group)
+
+        model.fetchMore(group)
+        assert model.rowCount(group) == 3
+        assert not model.canFetchMore(group)
+        # Newest (sorted in reverse) first.
+        assert model.data(model.index(0, 0, group)) == 'cal_2'
+
+    def test_empty_group_has_nothing_to_fetch(self):
+        model = CalibrationTreeModel(make_mapping())
+        model.populate([make_group('A', 0)])
+        group = model.index(0, 0)
+        assert not model.canFetchMore(group)
+        assert not model.hasChildren(group)
+
+    def test_column_text_computed_on_demand(self):
+        calls = []
+        model = CalibrationTreeModel(make_mapping(calls))
+        model.populate([make_group('A', 3)])
+        group = model.index(0, 0)
+        model.fetchMore(group)
+        assert calls == []
+
+        assert model.data(model.index(1, 1, group)) == '1.0'
+        assert model.data(model.index(1, 1, group)) == '1.0'
+        assert calls == ['cal_1']
+
+    def test_column_error(self):
+        mapping = make_mapping()
+        mapping['level']['to_str'] = lambda cal: 1 / 0
+        model = CalibrationTreeModel(mapping)
+        model.populate([make_group('A', 1)])
+        group = model.index(0, 0)
+        model.fetchMore(group)
+        assert model.data(model.index(0, 1, group)) == '⚠'
+
+    def test_folders(self):
+        model = CalibrationTreeModel(make_mapping())
+        model.populate(
+            [make_group('A', 1, 'lab/study'), make_group('B', 1)],
+            folders=['empty'],
+        )
+        kinds = [(n.kind, n.text, n.path) for n in model.iter_nodes()]
+        assert kinds == [
+            (FOLDER, 'empty', 'empty'),
+            (FOLDER, 'lab', 'lab'),
+            (FOLDER, 'study', 'lab/study'),
+            (GROUP, 'A', ''),
+            (GROUP, 'B', ''),
+        ]
+        study = model.index(0, 0, model.index(1, 0))
+        assert model.node(study).path == 'lab/study'
+        assert model.parent(model.index(0, 0, study)) == study
+        assert model.parent(model.index(1, 0)) == QModelIndex()
+
+    def test_flags(self):
+        model = CalibrationTreeModel(make_mapping())
+        model.populate([make_group('A', 1, 'lab')])
+        folder = model.index(0, 0)
+        group = model.index(0, 0, folder)
+        model.fetchMore(group)
+        leaf = model.index(0, 0, group)
+        assert model.node(leaf).kind == LEAF
+
+        assert not model.flags(folder) & Qt.ItemIsUserCheckable
+        assert model.flags(folder) & Qt.ItemIsDropEnabled
+        assert model.flags(group) & Qt.ItemIsUserCheckable
+        assert not model.flags(group) & Qt.ItemIsDragEnabled
+        assert model.flags(leaf) & Qt.ItemIsDragEnabled
+        assert not model.flags(leaf) & Qt.ItemIsDropEnabled
+
+    def test_check_state_round_trip(self):
+        model = CalibrationTreeModel(make_mapping())
+        group = make_group('A', 2)
+        model.populate([group])
+        index = model.index(0, 0)
+        model.fetchMore(index)
+        leaf = model.index(1, 0, index)
+
+        assert model.setData(leaf, Qt.Checked, Qt.CheckStateRole)
+        assert group.subitems[1].selected
+        assert model.data(leaf, Qt.CheckStateRole) == Qt.Checked
+        # The group follows its calibrations.
+        assert model.data(index, Qt.CheckStateRole) == Qt.Checked
+
+    def test_changes_emit_data_changed(self):
+        model = CalibrationTreeModel(make_mapping())
+        group = make_group('A', 2)
+        model.populate([group])
+        index = model.index(0, 0)
+        model.fetchMore(index)
+
+        changed = []
+        model.dataChanged.connect(
+            lambda tl, br, *args: changed.append((model.node(tl), tl.row()))
+        )
+        group.subitems[1].color = 'red'
+        assert (model.node(model.index(1, 0, index)), 1) in changed
+        assert model.data(model.index(1, 1, index), Qt.BackgroundRole) is not None
+
+        changed.clear()
+        model.populate([])
+        group.subitems[1].color = 'blue'
+        assert changed == []
+
+    def test_pinned_calibration_marked(self):
+        group = make_group('A', 2)
+        group.item.pinned = group.subitems[1].item
+        model = CalibrationTreeModel(make_mapping(), enable_current=True)
+        model.populate([group])
+        index = model.index(0, 0)
+        model.fetchMore(index)
+        assert model.data(model.index(0, 0, index)) == 'cal_1'
+        assert model.data(model.index(1, 0, index)) == 'cal_0 ★'
+
+
+class TestIncrementalUpdates:
+
+    def setup_collection(self, objects, folders=()):
+        manager = FakeManager(objects)
+        collection = ObjectCollection(manager, [])
+        model = CalibrationTreeModel(make_mapping())
+        model.populate(collection.groups, folders)
+        self.changes = []
+        collection.observe('updated', lambda c: self.changes.append(c['value']))
+        self.signals = []
+        model.modelReset.connect(lambda: self.signals.append('reset'))
+        model.rowsInserted.connect(
+            lambda parent, first, last: self.signals.append(
+                ('inserted', model.node(parent).text, first)
+            )
+        )
+        model.rowsRemoved.connect(
+            lambda parent, first, last: self.signals.append(
+                ('removed', model.node(parent).text, first)
+            )
+        )
+        return manager, collection, model
+
+    def refresh(self, collection, model, folders=()):
+        collection.update_groups()
+        change = self.changes[-1]
+        return change, model.apply(change, collection.groups, folders)
+
+    def test_no_change(self):
+        manager, collection, model = self.setup_collection({('', 'A'): ['c0']})
+        change, _ = self.refresh(collection, model)
+        assert not change
+        assert self.signals == []
+
+    def test_new_calibration_touches_one_row(self):
+        manager, collection, model = self.setup_collection({
+            ('', 'A'): ['c0', 'c1'],
+            ('', 'B'): ['c0'],
+        })
+        group = collection.groups[0]
+        index = model.index(0, 0)
+        model.fetchMore(index)
+        first = model.index(0, 0, index)
+        # Rendered rows have their column text cached.
+        for row in range(2):
+            model.data(model.index(row, 1, index))
+        self.signals.clear()
+        model.dataChanged.connect(
+            lambda tl, br, *args: self.signals.append(
+                ('changed', model.node(tl).text)
+            )
+        )
+
+        manager.objects[('', 'A')].append('c2')
+        change, _ = self.refresh(collection, model)
+        assert change.subitems == [(group, [group.subitems[0]], [])]
+        assert change.changed == []
+        assert self.signals == [('inserted', 'A', 0)]
+        assert [model.data(model.index(i, 0, index)) for i in range(3)] \
+            == ['c2', 'c1', 'c0']
+        # Existing rows (and their indexes) are kept.
+        assert first.isValid()
+        assert model.data(first) == 'c1'
+
+    def test_calibration_removed(self):
+        manager, collection, model = self.setup_collection({
+            ('', 'A'): ['c0', 'c1'],
+        })
+        index = model.index(0, 0)
+        model.fetchMore(index)
+        self.signals.clear()
+        manager.objects[('', 'A')].remove('c1')
+        self.refresh(collection, model)
+        assert self.signals == [('removed', 'A', 0)]
+        assert model.rowCount(index) == 1
+        assert model.data(model.index(0, 0, index)) == 'c0'
+
+    def test_unfetched_group_not_filled(self):
+        manager, collection, model = self.setup_collection({
+            ('', 'A'): ['c0'],
+        })
+        manager.objects[('', 'A')].append('c1')
+        self.refresh(collection, model)
+        assert self.signals == []
+        index = model.index(0, 0)
+        model.fetchMore(index)
+        assert model.rowCount(index) == 2
+
+    def test_groups_added_and_removed(self):
+        manager, collection, model = self.setup_collection({
+            ('', 'A'): ['c0'],
+            ('', 'C'): ['c0'],
+        })
+        del manager.objects[('', 'A')]
+        manager.objects[('', 'B')] = ['c0']
+        manager.objects[('lab', 'D')] = ['c0']
+        change, new_folders = self.refresh(collection, model)
+        assert [g.item.name for g in change.removed] == ['A']
+        assert [g.item.name for g in change.added] == ['B', 'D']
+        assert not change.reordered
+        assert 'reset' not in self.signals
+
+        assert [(n.kind, n.text) for n in model.iter_nodes()] == [
+            (FOLDER, 'lab'),
+            (GROUP, 'D'),
+            (GROUP, 'B'),
+            (GROUP, 'C'),
+        ]
+        assert [n.path for n in new_folders] == ['lab']
+        assert [n.row() for n in model.root.children] == [0, 1, 2]
+
+    def test_removed_folder(self):
+        manager, collection, model = self.setup_collection(
+            {('lab', 'A'): ['c0']}, folders=['empty'],
+        )
+        del manager.objects[('lab', 'A')]
+        self.refresh(collection, model, folders=['empty', 'new'])
+        assert [(n.kind, n.path) for n in model.iter_nodes()] == [
+            (FOLDER, 'empty'),
+            (FOLDER, 'new'),
+        ]
+
+    def test_replaced_calibration_recomputes_columns(self):
+        manager, collection, model = self.setup_collection({
+            ('', 'A'): ['c0'],
+        })
+        index = model.index(0, 0)
+        model.fetchMore(index)
+        leaf = model.index(0, 1, index)
+        assert model.data(leaf) == '0.0'
+
+        changed = []
+        model.dataChanged.connect(
+            lambda tl, br, *args: changed.append((tl.row(), br.column()))
+        )
+        # Same calibration, listed again from disk with new metadata.
+        manager.list_objects_and_calibrations = lambda **kw: [
+            (FakeObject('A'), [FakeCalibration(Path('/cal//A/c0'), 5)])
+        ]
+        self.refresh(collection, model)
+        assert changed == [(0, 1)]
+        assert model.data(leaf) == '5.0'
+
+    def test_removed_rows_unobserved(self):
+        manager, collection, model = self.setup_collection({
+            ('', 'A'): ['c0'],
+        })
+        group = collection.groups[0]
+        model.fetchMore(model.index(0, 0))
+        del manager.objects[('', 'A')]
+        self.refresh(collection, model)
+        changed = []
+        model.dataChanged.connect(lambda *args: changed.append(args))
+        group.subitems[0].color = 'red'
+        assert changed == []